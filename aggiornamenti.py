@@ -0,0 +1,73 @@
+import json
+import os
+import re
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# --- CONFIGURAZIONE CONTROLLO AGGIORNAMENTI ---
+CACHE_TTL = 6 * 3600          # secondi tra due interrogazioni reali dell'API
+TIMEOUT_RETE = 4              # secondi massimi di attesa (solo nel thread di lavoro)
+
+# --- CONFRONTO VERSIONI SEMANTICO ---
+def parse_versione(v):
+    # "v1.10.0" -> (1, 10, 0); suffissi tipo "-beta" vengono ignorati
+    parti = []
+    for p in str(v).strip().lstrip("vV").split("."):
+        m = re.match(r"\d+", p)
+        parti.append(int(m.group()) if m else 0)
+    while len(parti) < 3: parti.append(0)
+    return tuple(parti)
+
+def versione_piu_recente(candidata, attuale):
+    return parse_versione(candidata) > parse_versione(attuale)
+
+# --- CACHE SU DISCO ---
+def leggi_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f: return json.load(f)
+    except: return {}
+
+def scrivi_cache(cache_path, dati):
+    try:
+        tmp = cache_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump(dati, f)
+        os.replace(tmp, cache_path)
+    except: pass
+
+def check_for_updates(repo, versione_attuale, cache_path, ttl=CACHE_TTL, forza=False):
+    cache = leggi_cache(cache_path)
+    ora = time.time()
+    # Entro il TTL nessuna chiamata di rete: vale anche per i tentativi falliti (macchine offline)
+    if not forza and ora - cache.get("controllato", 0) < ttl:
+        tag = cache.get("tag_name")
+        return tag if tag and versione_piu_recente(tag, versione_attuale) else None
+
+    import requests
+    headers = {"Accept": "application/vnd.github+json"}
+    if cache.get("etag"): headers["If-None-Match"] = cache["etag"]
+    if cache.get("last_modified"): headers["If-Modified-Since"] = cache["last_modified"]
+    cache["controllato"] = ora
+    try:
+        url = f"https://api.github.com/repos/{repo}/releases/latest"
+        response = requests.get(url, headers=headers, timeout=TIMEOUT_RETE)
+        if response.status_code == 200:
+            cache["tag_name"] = response.json().get("tag_name", "1.0.0").replace("v", "")
+            cache["etag"] = response.headers.get("ETag")
+            cache["last_modified"] = response.headers.get("Last-Modified")
+        # 304 Not Modified: il tag in cache è ancora valido
+    except: pass
+    scrivi_cache(cache_path, cache)
+    tag = cache.get("tag_name")
+    return tag if tag and versione_piu_recente(tag, versione_attuale) else None
+
+# --- WORKER IN BACKGROUND ---
+class UpdateChecker(QThread):
+    nuova_versione = pyqtSignal(str)
+
+    def __init__(self, repo, versione_attuale, cache_path, parent=None):
+        super().__init__(parent)
+        self.repo = repo; self.versione_attuale = versione_attuale; self.cache_path = cache_path
+
+    def run(self):
+        v = check_for_updates(self.repo, self.versione_attuale, self.cache_path)
+        if v: self.nuova_versione.emit(v)
@@ -0,0 +1,261 @@
+import json
+import os
+import sqlite3
+import sys
+from array import array
+from collections.abc import Mapping
+from avvio import logger
+
+# --- ARCHIVIO FRASI SU SQLITE ---
+# Sostituisce il vecchio file JSON unico: ogni modifica è una riga inserita/aggiornata/cancellata
+# dentro una transazione, quindi un crash a metà salvataggio non corrompe più il database.
+# In lettura si comporta come il vecchio dizionario {categoria: [frasi]} (Mapping di sola lettura).
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categorie (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS frasi (
+    id INTEGER PRIMARY KEY,
+    categoria_id INTEGER NOT NULL REFERENCES categorie(id) ON DELETE CASCADE,
+    testo TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_frasi_categoria ON frasi(categoria_id, id);
+CREATE INDEX IF NOT EXISTS idx_frasi_testo ON frasi(testo);
+"""
+
+DATABASE_DEFAULT = {"GENERAL": ["GIRA LA RUOTA"]}
+
+class PhraseStore(Mapping):
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.osservatori = []   # callback(evento, frase_id, categoria, testo) chiamate dopo ogni commit
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    # --- LETTURA (interfaccia dizionario) ---
+    def __getitem__(self, categoria):
+        cid = self._id_categoria(categoria)
+        if cid is None: raise KeyError(categoria)
+        return [t for (t,) in self.conn.execute("SELECT testo FROM frasi WHERE categoria_id=? ORDER BY id", (cid,))]
+
+    def __iter__(self):
+        return iter(self.categorie())
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM categorie").fetchone()[0]
+
+    def categorie(self):
+        return [n for (n,) in self.conn.execute("SELECT nome FROM categorie ORDER BY id")]
+
+    def righe(self, categoria=None):
+        # (id, categoria, testo) per l'editor e per le modifiche puntuali
+        q = "SELECT f.id, c.nome, f.testo FROM frasi f JOIN categorie c ON c.id = f.categoria_id"
+        if categoria is None: return self.conn.execute(q + " ORDER BY c.id, f.id").fetchall()
+        return self.conn.execute(q + " WHERE c.nome=? ORDER BY f.id", (categoria,)).fetchall()
+
+    def righe_a_pagine(self, pagina=2000):
+        # Come righe() (stesso ordine) ma una query per pagina, ripresa dall'ultima riga letta: nessun
+        # cursore resta aperto tra una pagina e l'altra, quindi l'archivio si può scorrere un pezzo per giro
+        # dell'event loop anche mentre viene modificato
+        ultimo = (0, 0)
+        while True:
+            blocco = self.conn.execute("SELECT f.id, c.nome, f.testo, f.categoria_id FROM frasi f JOIN categorie c ON c.id = f.categoria_id "
+                                       "WHERE (f.categoria_id, f.id) > (?, ?) ORDER BY f.categoria_id, f.id LIMIT ?", (*ultimo, pagina)).fetchall()
+            if not blocco: return
+            for fid, c, t, _ in blocco: yield fid, c, t
+            ultimo = (blocco[-1][3], blocco[-1][0])
+
+    def tutti_gli_id(self):
+        # Nell'ordine di righe(): l'editor tiene in memoria solo questi e legge il resto a pagine
+        return array("q", (i for (i,) in self.conn.execute("SELECT f.id FROM frasi f JOIN categorie c ON c.id = f.categoria_id ORDER BY c.id, f.id")))
+
+    def righe_per_id(self, ids):
+        # {id: (categoria, testo)} per un gruppo di id (una pagina dell'editor)
+        ids = list(ids); risultato = {}
+        for i in range(0, len(ids), 500):
+            parte = ids[i:i + 500]
+            q = f"SELECT f.id, c.nome, f.testo FROM frasi f JOIN categorie c ON c.id = f.categoria_id WHERE f.id IN ({','.join('?' * len(parte))})"
+            risultato.update((fid, (c, t)) for fid, c, t in self.conn.execute(q, parte))
+        return risultato
+
+    def conta_frasi(self, categoria=None):
+        if categoria is None: return self.conn.execute("SELECT COUNT(*) FROM frasi").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM frasi f JOIN categorie c ON c.id = f.categoria_id WHERE c.nome=?", (categoria,)).fetchone()[0]
+
+    def conteggi(self):
+        # {categoria: numero di frasi}, categorie vuote comprese
+        return dict(self.conn.execute("SELECT c.nome, COUNT(f.id) FROM categorie c LEFT JOIN frasi f ON f.categoria_id = c.id GROUP BY c.id ORDER BY c.id"))
+
+    def id_frasi(self, categoria):
+        return [i for (i,) in self.conn.execute("SELECT f.id FROM frasi f JOIN categorie c ON c.id = f.categoria_id WHERE c.nome=? ORDER BY f.id", (categoria,))]
+
+    def vuoto(self):
+        return self.conn.execute("SELECT 1 FROM frasi LIMIT 1").fetchone() is None
+
+    def contiene_testo(self, testo):
+        return self.conn.execute("SELECT 1 FROM frasi WHERE testo=? LIMIT 1", (testo,)).fetchone() is not None
+
+    def id_con_testo(self, testo):
+        return [i for (i,) in self.conn.execute("SELECT id FROM frasi WHERE testo=?", (testo,))]
+
+    def testo_frase(self, frase_id):
+        r = self.conn.execute("SELECT testo FROM frasi WHERE id=?", (frase_id,)).fetchone()
+        return r[0] if r else None
+
+    def come_dict(self):
+        d = {c: [] for c in self.categorie()}
+        for _, c, t in self.righe(): d[c].append(t)
+        return d
+
+    def _id_categoria(self, categoria):
+        r = self.conn.execute("SELECT id FROM categorie WHERE nome=?", (categoria,)).fetchone()
+        return r[0] if r else None
+
+    def _id_o_crea_categoria(self, categoria):
+        cid = self._id_categoria(categoria)
+        if cid is None: cid = self.conn.execute("INSERT INTO categorie(nome) VALUES (?)", (categoria,)).lastrowid
+        return cid
+
+    # --- NOTIFICHE AGLI OSSERVATORI (es. indice delle frasi per la CPU) ---
+    # Eventi: "aggiunta"/"modificata" (id, categoria, testo), "rimossa" (id), "ricarica" (import massivi)
+    def _notifica(self, eventi):
+        for evento in eventi:
+            for f in self.osservatori: f(*evento)
+
+    def _elimina_con_notifica(self, where, param):
+        ids = [i for (i,) in self.conn.execute("SELECT id FROM frasi WHERE " + where, param)]
+        self.conn.execute("DELETE FROM frasi WHERE " + where, param)
+        return [("rimossa", i, None, None) for i in ids]
+
+    # --- SCRITTURA PUNTUALE (una transazione per operazione) ---
+    def aggiungi_categoria(self, categoria):
+        with self.conn: return self._id_o_crea_categoria(categoria)
+
+    def elimina_categoria(self, categoria):
+        with self.conn:
+            eventi = self._elimina_con_notifica("categoria_id IN (SELECT id FROM categorie WHERE nome=?)", (categoria,))
+            self.conn.execute("DELETE FROM categorie WHERE nome=?", (categoria,))
+        self._notifica(eventi)
+
+    def aggiungi_frase(self, categoria, testo):
+        with self.conn:
+            cid = self._id_o_crea_categoria(categoria)
+            frase_id = self.conn.execute("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)", (cid, testo)).lastrowid
+        self._notifica([("aggiunta", frase_id, categoria, testo)])
+        return frase_id
+
+    def aggiorna_frase(self, frase_id, testo, categoria=None):
+        with self.conn:
+            if categoria is None: self.conn.execute("UPDATE frasi SET testo=? WHERE id=?", (testo, frase_id))
+            else: self.conn.execute("UPDATE frasi SET testo=?, categoria_id=? WHERE id=?", (testo, self._id_o_crea_categoria(categoria), frase_id))
+            r = self.conn.execute("SELECT c.nome FROM frasi f JOIN categorie c ON c.id = f.categoria_id WHERE f.id=?", (frase_id,)).fetchone()
+        if r: self._notifica([("modificata", frase_id, r[0], testo)])
+
+    def elimina_frase(self, frase_id):
+        with self.conn: eventi = self._elimina_con_notifica("id=?", (frase_id,))
+        self._notifica(eventi)
+
+    def applica_modifiche(self, modificate=(), aggiunte=(), eliminate=()):
+        # Salvataggio dell'editor: solo le righe toccate, in un'unica transazione.
+        # modificate: {id: (categoria, testo)}, aggiunte: [(categoria, testo)], eliminate: [id] -> id delle aggiunte
+        eventi = []; nuovi_id = []
+        with self.conn:
+            for fid in eliminate: eventi += self._elimina_con_notifica("id=?", (fid,))
+            for fid, (categoria, testo) in dict(modificate).items():
+                self.conn.execute("UPDATE frasi SET testo=?, categoria_id=? WHERE id=?", (testo, self._id_o_crea_categoria(categoria), fid))
+                eventi.append(("modificata", fid, categoria, testo))
+            for categoria, testo in aggiunte:
+                fid = self.conn.execute("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)", (self._id_o_crea_categoria(categoria), testo)).lastrowid
+                nuovi_id.append(fid); eventi.append(("aggiunta", fid, categoria, testo))
+        self._notifica(eventi)
+        return nuovi_id
+
+    # --- IMPORT / EXPORT JSON (compatibilità con il vecchio formato) ---
+    def importa_dict(self, dati):
+        with self.conn:
+            for categoria, frasi in dati.items():
+                # Una stringa al posto della lista verrebbe importata lettera per lettera
+                if not isinstance(frasi, list) or not all(isinstance(t, str) for t in frasi): raise ValueError(f"categoria {categoria!r}: attesa una lista di frasi")
+                cid = self._id_o_crea_categoria(categoria)
+                self.conn.executemany("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)", [(cid, t) for t in frasi])
+        self._notifica([("ricarica", None, None, None)])
+
+    def importa_righe(self, righe, esito=None, prova=False):
+        # righe: iterabile, anche un generatore, di (categoria, testo, riferimento). I testi già presenti
+        # (nell'archivio o prima nel flusso) vengono saltati; esito(riferimento, inserita) per ogni riga.
+        # Un'unica transazione: o entra tutto o niente, e con prova=True non viene scritto nulla.
+        inserite = 0; categorie = {}
+        try:
+            for categoria, testo, rif in righe:
+                if self.contiene_testo(testo):
+                    if esito: esito(rif, False)
+                    continue
+                cid = categorie.get(categoria)
+                if cid is None: cid = categorie[categoria] = self._id_o_crea_categoria(categoria)
+                self.conn.execute("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)", (cid, testo)); inserite += 1
+                if esito: esito(rif, True)
+        except BaseException:
+            self.conn.rollback(); raise
+        if prova: self.conn.rollback(); return inserite
+        self.conn.commit()
+        if inserite: self._notifica([("ricarica", None, None, None)])
+        return inserite
+
+    def importa_json(self, json_path):
+        with open(json_path, 'r', encoding='utf-8') as f: self.importa_dict(json.load(f))
+
+    def esporta_json(self, json_path):
+        tmp = json_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f: json.dump(self.come_dict(), f, indent=4, ensure_ascii=False)
+        os.replace(tmp, json_path)
+
+# --- MIGRAZIONE UNA TANTUM ---
+def archivio_vuoto(db_path):
+    # Manca o non ha frasi (es. lasciato vuoto da una migrazione fallita): va ricostruito
+    if not os.path.exists(db_path): return True
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try: return conn.execute("SELECT 1 FROM frasi LIMIT 1").fetchone() is None
+        finally: conn.close()
+    except sqlite3.Error as e:
+        # Tabella assente = file creato ma mai popolato; un file illeggibile invece non va sovrascritto
+        return "no such table" in str(e)
+
+def crea_archivio(db_path, sorgenti_json):
+    # Il database viene costruito in un file temporaneo e rinominato solo a migrazione completata.
+    # Ogni sorgente viene importata in una transazione: se fallisce (file illeggibile, JSON malformato,
+    # struttura inattesa) o non contiene frasi si passa alla successiva e infine alle frasi di base.
+    tmp = db_path + ".migrazione"
+    for p in (tmp, tmp + "-wal", tmp + "-shm"):
+        if os.path.exists(p): os.remove(p)
+    with PhraseStore(tmp) as store:
+        for sorgente in sorgenti_json:
+            if not (sorgente and os.path.exists(sorgente)): continue
+            try: store.importa_json(sorgente)
+            except Exception as e: logger.warning("archivio frasi: %s non importabile (%r), provo la sorgente successiva", sorgente, e); continue
+            if store.conta_frasi(): break
+            logger.warning("archivio frasi: %s non contiene frasi, provo la sorgente successiva", sorgente)
+        else: store.importa_dict(DATABASE_DEFAULT)
+        store.conn.execute("PRAGMA journal_mode=DELETE")
+    # Un archivio vuoto rimasto da un tentativo precedente viene sostituito insieme al suo WAL
+    for p in (db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(p): os.remove(p)
+    os.replace(tmp, db_path)
+
+if __name__ == "__main__":
+    # python archivio_frasi.py esporta|importa <database.sqlite> <file.json>
+    if len(sys.argv) != 4 or sys.argv[1] not in ("esporta", "importa"):
+        sys.exit("Uso: python archivio_frasi.py esporta|importa <database.sqlite> <file.json>")
+    with PhraseStore(sys.argv[2]) as store:
+        if sys.argv[1] == "esporta": store.esporta_json(sys.argv[3])
+        else: store.importa_json(sys.argv[3])
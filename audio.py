@@ -0,0 +1,154 @@
+import os
+import time
+from PyQt5.QtCore import QObject, QUrl, QIODevice, QTimer, pyqtSignal
+from PyQt5.QtMultimedia import QSoundEffect, QAudio, QAudioFormat, QAudioOutput
+from avvio import logger
+
+# --- MOTORE EFFETTI SONORI ---
+# Ogni WAV viene decodificato una sola volta in memoria da QSoundEffect (niente pipeline del
+# media backend ad ogni play). Ogni effetto ha un numero fisso di voci: se sono tutte occupate
+# viene "rubata" quella partita per prima, così due "correct" ravvicinati si sovrappongono.
+class SoundEngine(QObject):
+    def __init__(self, voci=3, parent=None):
+        super().__init__(parent)
+        self.voci_per_effetto = voci
+        self.effetti = {}          # nome -> lista di QSoundEffect
+        self.canale_di = {}        # nome -> canale
+        self.avvii = {}            # QSoundEffect -> istante dell'ultimo trigger (perf_counter)
+        self.in_attesa = set()     # voci triggerate che non hanno ancora iniziato a suonare
+        self.volumi = {}           # canale -> 0.0 .. 1.0
+        self.muted = False
+        self.mancanti = []
+
+    def carica(self, nome, path, canale="effetti"):
+        # Gli asset mancanti vengono segnalati una volta qui, non ad ogni play
+        if not os.path.exists(path):
+            logger.warning("audio: file mancante per '%s': %s", nome, path)
+            self.mancanti.append(nome); return False
+        def crea():
+            v = QSoundEffect(self); v.setSource(QUrl.fromLocalFile(path)); return v
+        return self._registra(nome, crea, canale)
+
+    def carica_pcm(self, nome, pcm, formato, canale="effetti"):
+        # Campioni già decodificati (pacchetto risorse): le voci leggono tutte dallo stesso buffer
+        return self._registra(nome, lambda: VocePCM(pcm, formato, self), canale)
+
+    def _registra(self, nome, crea, canale):
+        voci = []
+        for _ in range(self.voci_per_effetto):
+            v = crea()
+            v.setMuted(self.muted); v.setVolume(self.volumi.get(canale, 1.0))
+            v.playingChanged.connect(lambda v=v, nome=nome: self._riproduzione_avviata(nome, v))
+            voci.append(v)
+        self.effetti[nome] = voci; self.canale_di[nome] = canale
+        self.volumi.setdefault(canale, 1.0)
+        return True
+
+    def play(self, nome):
+        voci = self.effetti.get(nome)
+        if not voci or self.muted: return
+        # Una voce appena triggerata non risulta ancora isPlaying(): va considerata occupata
+        libere = [v for v in voci if not v.isPlaying() and v not in self.in_attesa]
+        # Voice stealing: se nessuna voce è libera riparte la più vecchia
+        v = libere[0] if libere else min(voci, key=lambda x: self.avvii.get(x, 0))
+        if v.isPlaying() or v in self.in_attesa: v.stop()
+        self.avvii[v] = time.perf_counter(); self.in_attesa.add(v)
+        v.play()
+
+    def stop(self, nome):
+        for v in self.effetti.get(nome, []): v.stop(); self.in_attesa.discard(v)
+
+    def sta_suonando(self, nome):
+        return any(v.isPlaying() for v in self.effetti.get(nome, []))
+
+    def set_volume(self, canale, volume):
+        self.volumi[canale] = max(0.0, min(1.0, volume))
+        for nome, voci in self.effetti.items():
+            if self.canale_di[nome] == canale:
+                for v in voci: v.setVolume(self.volumi[canale])
+
+    def set_muted(self, muted):
+        self.muted = muted
+        for voci in self.effetti.values():
+            for v in voci:
+                v.setMuted(muted)
+                if muted: v.stop(); self.in_attesa.discard(v)
+
+    def _riproduzione_avviata(self, nome, v):
+        if not v.isPlaying() or v not in self.in_attesa: return
+        self.in_attesa.discard(v)
+        logger.debug("audio: latenza '%s' %.1f ms", nome, (time.perf_counter() - self.avvii[v]) * 1000)
+
+# --- VOCI DA BUFFER PCM ---
+class FlussoPCM(QIODevice):
+    # Sola lettura su un buffer (memoryview sul pacchetto mappato): nessuna copia del suono intero,
+    # QAudioOutput preleva un blocco alla volta
+    def __init__(self, dati, parent=None):
+        super().__init__(parent)
+        self.dati = dati; self.posizione = 0; self.open(QIODevice.ReadOnly | QIODevice.Unbuffered)
+
+    def readData(self, massimo):
+        blocco = self.dati[self.posizione:self.posizione + massimo]; self.posizione += len(blocco)
+        return bytes(blocco)
+
+    def seek(self, pos):
+        self.posizione = pos
+        return super().seek(pos)
+
+    def writeData(self, dati):
+        return -1
+
+    def size(self):
+        return len(self.dati)
+
+    def bytesAvailable(self):
+        return len(self.dati) - self.posizione + super().bytesAvailable()
+
+class VocePCM(QObject):
+    # Stessa interfaccia di QSoundEffect usata da SoundEngine, ma suona campioni PCM già in memoria.
+    # finita: la riproduzione avviata con play() è terminata per qualsiasi motivo (fine, stop, errore)
+    playingChanged = pyqtSignal()
+    finita = pyqtSignal()
+
+    def __init__(self, pcm, formato, parent=None):
+        super().__init__(parent)
+        f = QAudioFormat(); f.setCodec("audio/pcm"); f.setByteOrder(QAudioFormat.LittleEndian)
+        f.setSampleRate(formato["frequenza"]); f.setChannelCount(formato["canali"]); f.setSampleSize(formato["bit"])
+        f.setSampleType(QAudioFormat.SignedInt if formato["bit"] > 8 else QAudioFormat.UnSignedInt)
+        self.uscita = QAudioOutput(f, self); self.flusso = FlussoPCM(pcm, self)
+        self.volume = 1.0; self.muto = False; self.attiva = False; self.in_corso = False; self.errore_segnalato = False
+        self.byte_al_secondo = formato["frequenza"] * formato["canali"] * formato["bit"] // 8
+        self.uscita.stateChanged.connect(self._stato)
+
+    def play(self):
+        self.flusso.seek(0); self.in_corso = True; self.uscita.start(self.flusso)
+        # Senza dispositivo (o se non si apre) l'uscita resta ferma e non notifica nessun cambio di stato
+        if self.uscita.error() != QAudio.NoError:
+            if not self.errore_segnalato: self.errore_segnalato = True; logger.warning("audio: uscita PCM non disponibile (errore %s)", self.uscita.error())
+            QTimer.singleShot(0, self._terminata)
+
+    def durata_ms(self):
+        return len(self.flusso.dati) * 1000 // max(self.byte_al_secondo, 1)
+
+    def stop(self):
+        self.uscita.stop()
+
+    def isPlaying(self):
+        return self.attiva
+
+    def setVolume(self, volume):
+        self.volume = volume; self.uscita.setVolume(0.0 if self.muto else volume)
+
+    def setMuted(self, muto):
+        self.muto = muto; self.uscita.setVolume(0.0 if muto else self.volume)
+
+    def _stato(self, stato):
+        # IdleState: campioni finiti, si ferma l'uscita (che poi notifica StoppedState)
+        if stato == QAudio.IdleState: self.uscita.stop(); return
+        attiva = stato == QAudio.ActiveState
+        if attiva != self.attiva: self.attiva = attiva; self.playingChanged.emit()
+        # StoppedState arriva a fine campioni, dopo stop() e quando il dispositivo dà errore
+        if stato == QAudio.StoppedState: self._terminata()
+
+    def _terminata(self):
+        if self.in_corso: self.in_corso = False; self.finita.emit()
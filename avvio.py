@@ -0,0 +1,26 @@
+import json
+import logging
+import time
+
+logger = logging.getLogger("gira_la_ruota")
+
+# --- TIMELINE DI AVVIO ---
+class StartupTimeline:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.eventi = []
+
+    def segna(self, nome):
+        # Un evento viene registrato una sola volta: conta il primo passaggio
+        if any(n == nome for n, _ in self.eventi): return
+        ms = (time.perf_counter() - self.t0) * 1000
+        self.eventi.append((nome, ms))
+        logger.info("avvio: %-18s %8.1f ms", nome, ms)
+
+    def come_dict(self):
+        return {n: round(ms, 2) for n, ms in self.eventi}
+
+    def come_json(self):
+        return json.dumps(self.come_dict())
+
+TIMELINE = StartupTimeline()
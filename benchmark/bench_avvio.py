@@ -0,0 +1,49 @@
+import json
+import os
+import statistics
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# --- BENCHMARK TEMPI DI AVVIO ---
+# Avvia il gioco N volte in un processo nuovo (avvio a freddo) sulla piattaforma Qt "offscreen"
+# e riporta la timeline: import, splash_mostrato, gioco_pronto (millisecondi dall'avvio).
+# Con --pacchetto confronta i file sciolti con il pacchetto risorse (risorse.py), che viene creato in una
+# cartella temporanea insieme alla sola frasi.json: splash_mostrato è il tempo al primo frame.
+#   python benchmark/bench_avvio.py [ripetizioni] [--pacchetto]
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)
+
+SCHERMO_OFFSCREEN = "800x600"   # dimensione dello schermo della piattaforma offscreen
+
+def esegui_avvio(cartella=RADICE):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    out = subprocess.run([sys.executable, os.path.join(RADICE, "ruota_fortuna.py"), "--benchmark-avvio"],
+                         cwd=cartella, env=env, capture_output=True, text=True, timeout=60)
+    righe = [r for r in out.stdout.splitlines() if r.startswith("{")]
+    if not righe: raise RuntimeError(f"Avvio fallito:\n{out.stderr}")
+    return json.loads(righe[-1])
+
+def stampa(titolo, risultati):
+    print(f"{titolo:<18}{'mediana':>10}{'min':>10}{'max':>10}  (ms, {len(risultati)} avvii)")
+    for evento in risultati[0]:
+        v = [r[evento] for r in risultati if evento in r]
+        print(f"  {evento:<16}{statistics.median(v):>10.1f}{min(v):>10.1f}{max(v):>10.1f}")
+
+def main():
+    argomenti = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(argomenti[0]) if argomenti else 10
+    if "--pacchetto" not in sys.argv: stampa("evento", [esegui_avvio() for _ in range(n)]); return
+    if os.path.exists(os.path.join(RADICE, "risorse.pack")): print("attenzione: risorse.pack nella radice, i 'file sciolti' useranno il pacchetto")
+    stampa("file sciolti", [esegui_avvio() for _ in range(n)])
+    with tempfile.TemporaryDirectory() as cartella:
+        from risorse import main as crea_pacchetto, RISOLUZIONI
+        risoluzioni = ",".join([f"{w}x{h}" for w, h in RISOLUZIONI] + [SCHERMO_OFFSCREEN])
+        crea_pacchetto(["--radice", RADICE, "--uscita", os.path.join(cartella, "risorse.pack"), "--risoluzioni", risoluzioni])
+        shutil.copy(os.path.join(RADICE, "frasi.json"), cartella)
+        stampa("pacchetto", [esegui_avvio(cartella) for _ in range(n)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import Qt
+from coriandoli import SistemaCoriandoli
+
+# --- BENCHMARK CORIANDOLI ---
+# Costo per frame (avanzamento + ridisegno sincrono della regione sporca) a 1920x1080,
+# senza limite di budget, per numeri crescenti di particelle. A 60 fps il frame dura 16.7 ms.
+#   python benchmark/bench_coriandoli.py [frame]
+
+class Scena(QWidget):
+    def __init__(self, sistema):
+        super().__init__(); self.sistema = sistema
+        self.setStyleSheet("background-color: #002244;")
+
+    def paintEvent(self, event):
+        p = QPainter(self); p.setPen(Qt.NoPen)
+        self.sistema.disegna(p, event.region())
+
+def main():
+    frame = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'particelle':>10}{'mediana (ms)':>14}{'p95 (ms)':>10}")
+    for n in (180, 1000, 5000, 10000):
+        sistema = SistemaCoriandoli(budget_ms=float("inf"), seed=1)
+        scena = Scena(sistema); scena.resize(1920, 1080); scena.show(); app.processEvents()
+        # Particelle già in campo: si misura il regime, non l'ingresso dall'alto
+        sistema.lancia(n, 1920); sistema.y += 850
+        tempi = []
+        for _ in range(frame):
+            t = time.perf_counter()
+            scena.repaint(sistema.avanza(1 / 60, 1080 * 4))
+            tempi.append((time.perf_counter() - t) * 1000)
+        tempi.sort(); scena.close()
+        print(f"{n:>10}{statistics.median(tempi):>14.2f}{tempi[int(len(tempi) * 0.95) - 1]:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cpu import GiocatoreCPU
+from indice_frasi import IndiceFrasi
+from motore import Partita
+
+# --- BENCHMARK CPU ---
+# Tempo di costruzione dell'indice e di una decisione (decidi + scegli_lettera) su un database
+# sintetico di frasi plausibili, generate ricombinando le parole di frasi.json.
+#   python benchmark/bench_cpu.py [numero_frasi]
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def genera_frasi(n, rng):
+    import json
+    with open(os.path.join(RADICE, "frasi.json"), 'r', encoding='utf-8') as f: dati = json.load(f)
+    parole = sorted({p for frasi in dati.values() for frase in frasi for p in frase.upper().split()})
+    categorie = list(dati)
+    return [(i, rng.choice(categorie), " ".join(rng.choice(parole) for _ in range(rng.randint(1, 4)))) for i in range(n)]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(1); righe = genera_frasi(n, rng)
+    t = time.perf_counter(); indice = IndiceFrasi().costruisci(righe)
+    print(f"{n:,} frasi, indice costruito in {(time.perf_counter() - t):.2f} s ({len(indice.secchi):,} secchi)")
+    # Costruzione a passi come in partita (GC fermo, come in GiraLaRuota.avvia_indice): durata del passo più lungo
+    passi = []; costruzione = IndiceFrasi().costruisci_a_passi(righe); gc.disable()
+    while True:
+        t = time.perf_counter()
+        if next(costruzione, True) is True: break
+        passi.append((time.perf_counter() - t) * 1000)
+    gc.enable(); passi.sort()
+    print(f"a passi: {len(passi)} passi, mediana {passi[len(passi) // 2]:.1f} ms, max {passi[-1]:.1f} ms")
+    cpu = GiocatoreCPU(indice); partita = Partita(); tempi = []
+    for _ in range(300):
+        _, categoria, frase = rng.choice(righe); partita.nuovo_round(frase); partita.valore = 500
+        # Tabellone a metà partita: qualche lettera già scoperta
+        for let in rng.sample(sorted(partita.lettere_mancanti()), k=len(partita.lettere_mancanti()) // 3): partita.lettere.add(let)
+        t = time.perf_counter()
+        cpu.decidi(partita, categoria); cpu.scegli_lettera(partita, categoria)
+        tempi.append((time.perf_counter() - t) * 1000)
+    tempi.sort()
+    print(f"decisione: mediana {tempi[len(tempi) // 2]:.2f} ms, p99 {tempi[int(len(tempi) * 0.99)]:.2f} ms, max {tempi[-1]:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PyQt5.QtWidgets import QApplication
+from archivio_frasi import PhraseStore
+from editor_frasi import PhraseEditorDialog
+
+# --- BENCHMARK EDITOR FRASI ---
+# Apertura, scorrimento, ricerca e salvataggio dell'editor su un archivio grande (default 500.000
+# frasi). Il vecchio editor serializzava l'intero archivio in JSON dentro un QTextEdit: per confronto
+# viene misurato anche solo quel passo, senza la finestra.
+#   python benchmark/bench_editor.py [frasi]
+
+def crea_archivio(path, n):
+    store = PhraseStore(path)
+    with store.conn:
+        for c in range(20):
+            cid = store._id_o_crea_categoria(f"CATEGORIA {c}")
+            store.conn.executemany("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)",
+                                   ((cid, f"FRASE NUMERO {i} DELLA CATEGORIA {c}") for i in range(c, n, 20)))
+    return store
+
+def cronometra(nome, f):
+    t = time.perf_counter(); r = f(); QApplication.processEvents()
+    print(f"  {nome:<40}{(time.perf_counter() - t) * 1000:>9.1f} ms")
+    return r
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as cartella:
+        store = crea_archivio(os.path.join(cartella, "bench.sqlite"), n)
+        print(f"{n:,} frasi")
+        from PyQt5.QtWidgets import QTextEdit
+        import json
+        cronometra("vecchio editor: json.dumps + QTextEdit", lambda: QTextEdit().setPlainText(json.dumps(store.come_dict(), indent=4, ensure_ascii=False)))
+        d = cronometra("apertura editor", lambda: PhraseEditorDialog(store))
+        cronometra("primo disegno", lambda: (d.show(), d.vista.viewport().repaint()))
+        barra = d.vista.verticalScrollBar(); m = d.modello
+        def scorri():
+            for k in range(50):
+                barra.setValue(barra.maximum() * k // 50); d.vista.viewport().repaint()
+        cronometra("50 salti di scorrimento", scorri)
+        cronometra("fino all'ultima riga", lambda: (d.vista.scrollToBottom(), d.vista.viewport().repaint()))
+        cronometra("indice di ricerca (a blocchi, in background)", lambda: [d.passo_indice() for _ in iter(lambda: m.indice.completo, True)])
+        cronometra("prima ricerca", lambda: m.filtra("CATEGORIA 7"))
+        cronometra("ricerca raffinata", lambda: m.filtra("CATEGORIA 7 NUMERO 12"))
+        cronometra("ricerca nuova", lambda: m.filtra("NUMERO 4999"))
+        cronometra("azzera ricerca", lambda: m.filtra(""))
+        def modifica():
+            for r in range(0, 100, 10): m.setData(m.index(r, 1), f"frase modificata {r}")
+        cronometra("10 modifiche con validazione", modifica)
+        cronometra("salvataggio (solo righe cambiate)", m.salva)
+        cronometra("elimina 2.000 righe contigue", lambda: m.elimina(range(100, 2100)))
+        cronometra("elimina 50 righe sparse", lambda: m.elimina(range(0, 5000, 100)))
+        cronometra("elimina 1.000 righe sparse", lambda: m.elimina(range(0, 20000, 20)))
+        cronometra("salvataggio eliminazioni", m.salva)
+        d.close(); store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from archivio_frasi import PhraseStore
+from estrattore_frasi import PhraseSampler
+
+# --- BENCHMARK ESTRATTORE FRASI ---
+# Costo medio di una pesca al crescere del database (da 100 a 1.000.000 di frasi).
+# Il caricamento degli id della categoria avviene una volta sola ed è riportato a parte.
+# Lo storico è salvato su disco come nel gioco, quindi ogni pesca comprende anche la sua scrittura;
+# la compattazione del registro alla chiusura è riportata a parte.
+#   python benchmark/bench_estrattore.py [pesche]
+
+DIMENSIONI = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+def crea_store(n):
+    store = PhraseStore(":memory:")
+    with store.conn:
+        cid = store._id_o_crea_categoria("BENCH")
+        store.conn.executemany("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)", ((cid, f"FRASE {i}") for i in range(n)))
+    return store
+
+def main():
+    pesche = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    cartella = tempfile.mkdtemp(prefix="bench_estrattore_")
+    print(f"{'frasi':>10}{'caricamento (ms)':>18}{'per pesca (µs)':>16}{'chiusura (ms)':>15}")
+    for n in DIMENSIONI:
+        store = crea_store(n); sampler = PhraseSampler(store, os.path.join(cartella, f"storico_{n}.json"), seed=1)
+        t = time.perf_counter(); sampler.estrai(); caricamento = (time.perf_counter() - t) * 1000
+        k = min(pesche, n - 1)
+        t = time.perf_counter()
+        for _ in range(k): sampler.estrai()
+        per_pesca = (time.perf_counter() - t) / k * 1e6
+        t = time.perf_counter(); sampler.chiudi(); chiusura = (time.perf_counter() - t) * 1000
+        print(f"{n:>10}{caricamento:>18.1f}{per_pesca:>16.2f}{chiusura:>15.1f}")
+        store.close()
+    shutil.rmtree(cartella, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from archivio_frasi import PhraseStore
+from importa_frasi import importa_file
+
+# --- BENCHMARK IMPORTAZIONE MASSIVA ---
+# Genera file TXT di dimensione crescente e li importa in un archivio vuoto, riportando velocità
+# e picco di memoria del processo principale: deve restare piatto al crescere del file.
+#   python benchmark/bench_importazione.py [righe_massime] [processi]
+
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def genera_file(path, n, rng, parole):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(n): f.write(" ".join(rng.choice(parole) for _ in range(rng.randint(1, 5))) + f" {i}\n")
+
+def picco_mb():
+    # ru_maxrss è in KB su Linux, in byte su macOS
+    r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return r / (1024 * 1024) if sys.platform == "darwin" else r / 1024
+
+def main():
+    massimo = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    processi = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with open(os.path.join(RADICE, "frasi.json"), 'r', encoding='utf-8') as f: dati = json.load(f)
+    parole = sorted({p for frasi in dati.values() for frase in frasi for p in frase.split()})
+    rng = random.Random(1); dimensioni = [n for n in (10_000, 100_000, 1_000_000, 10_000_000) if n <= massimo]
+    print(f"{'righe':>10}{'secondi':>10}{'frasi/s':>10}{'importate':>11}{'picco MB':>10}")
+    with tempfile.TemporaryDirectory() as cartella:
+        for n in dimensioni:
+            sorgente = os.path.join(cartella, f"frasi_{n}.txt"); genera_file(sorgente, n, rng, parole)
+            with PhraseStore(os.path.join(cartella, f"archivio_{n}.sqlite")) as store:
+                t = time.perf_counter(); r = importa_file(store, sorgente, processi=processi); s = time.perf_counter() - t
+            print(f"{n:>10,}{s:>10.1f}{n / s:>10,.0f}{r.conteggi['importata']:>11,}{picco_mb():>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spettatori import ServerSpettatori, Cronista, applica, stato_vuoto
+from griglia import vista_tabellone
+from motore import Partita
+
+# --- BENCHMARK SERVER SPETTATORI ---
+# Centinaia di spettatori finti (client SSE su localhost) e qualche client "lento" che non legge mai.
+# Il thread principale fa la parte del gioco: gioca round casuali e pubblica tramite il Cronista.
+# Misura il costo di pubblicazione per il gioco, la latenza di consegna, verifica che ogni spettatore
+# ricostruisca esattamente lo stato del server e che i lenti vengano scollegati.
+#   python benchmark/bench_spettatori.py [spettatori] [lenti] [giri_al_secondo]
+
+class Spettatore:
+    def __init__(self, lento=False):
+        self.lento = lento; self.stato = stato_vuoto(); self.arrivi = []; self.chiuso = False
+
+    async def segui(self, porta):
+        s = socket.socket()
+        if self.lento: s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        s.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(s, ("127.0.0.1", porta))
+        reader, writer = await asyncio.open_connection(sock=s, limit=1 << 20)
+        writer.write(b"GET /eventi HTTP/1.1\r\nHost: x\r\n\r\n"); await writer.drain()
+        if self.lento: await asyncio.sleep(3600); return   # connesso ma non legge mai
+        await reader.readuntil(b"\r\n\r\n")
+        try:
+            while True:
+                blocco = await reader.readuntil(b"\n\n")
+                if blocco.startswith(b"data: "):
+                    applica(self.stato, json.loads(blocco[6:])); self.arrivi.append(time.perf_counter())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.chiuso = True
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    n_lenti = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    giri = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    rounds, raffica, giri_raffica = 5, 150, 150
+    # Buffer ridotto rispetto al default: una partita di prova produce poche centinaia di KB per spettatore
+    server = ServerSpettatori("127.0.0.1", 0, buffer_max=64 * 1024).avvia()
+    spettatori = [Spettatore() for _ in range(n)] + [Spettatore(lento=True) for _ in range(n_lenti)]
+
+    # I client vivono in un loop asyncio tutto loro, come se fossero altri dispositivi
+    loop_client = asyncio.new_event_loop()
+    threading.Thread(target=loop_client.run_forever, daemon=True).start()
+    for s in spettatori: asyncio.run_coroutine_threadsafe(s.segui(server.porta), loop_client)
+    t = time.perf_counter()
+    while len(server.spettatori) < len(spettatori) and time.perf_counter() - t < 30: time.sleep(0.05)
+    print(f"{len(server.spettatori)} spettatori collegati ({n_lenti} lenti)")
+
+    # Il "gioco": round casuali, pubblicati tramite il Cronista come fa GiraLaRuota
+    pubblicati = []; costi = []
+    def pubblica(ev):
+        t0 = time.perf_counter(); server.pubblica(ev); costi.append(time.perf_counter() - t0); pubblicati.append(t0)
+    cronista = Cronista(pubblica); rng = random.Random(1); partita = Partita(); nomi = ["ANNA", "BRUNO", "CPU 1"]
+    frasi = ["CHI VA PIANO VA SANO E VA LONTANO", "L'OCEANO", "NON MUOVERE UN DITO", "LA VITA E' BELLA"]
+    def gioca(rounds, giri_al_secondo=None):
+        prossimo = time.perf_counter()
+        for numero in range(1, rounds + 1):
+            partita.nuovo_round(rng.choice(frasi))
+            cronista.nuovo_round(numero, rounds, "PROVERBI", vista_tabellone(partita.soluzione, partita.lettere))
+            while partita.lettere_mancanti():
+                # Come flash: lo spicchio uscito, anche il JOLLY che gira() ha già sostituito sulla ruota
+                indice, esito = partita.gira(rng); cronista.ruota("JOLLY" if esito == "JOLLY" else partita.premi[indice])
+                if esito not in ("BANCAROTTA", "PASSA", "PROTETTO"): partita.chiama_lettera(rng.choice(sorted(partita.lettere_mancanti() | {"K"})))
+                cronista.tabellone(vista_tabellone(partita.soluzione, partita.lettere))
+                cronista.giocatori_aggiornati(nomi, partita.portafogli, partita.totali, partita.jolly, partita.turno)
+                if giri_al_secondo: prossimo += 1 / giri_al_secondo; time.sleep(max(0.0, prossimo - time.perf_counter()))
+            partita.risolvi(partita.soluzione); sol = partita.soluzione
+            cronista.risolto(partita.turno, sol, vista_tabellone(sol, set(sol)))
+    veloci = [s for s in spettatori if not s.lento]
+    def attendi_consegna():
+        t = time.perf_counter()
+        while any(len(s.arrivi) < len(pubblicati) + 1 and not s.chiuso for s in veloci) and time.perf_counter() - t < 60: time.sleep(0.05)
+    q = lambda v, f: v[min(int(len(v) * f), len(v) - 1)] if v else float("nan")
+
+    # 1) Ritmo da partita vera (anzi più svelto): costo per il gioco e latenza di consegna
+    inizio = time.perf_counter(); gioca(rounds, giri); durata = time.perf_counter() - inizio; attendi_consegna()
+    latenze = sorted((a - p) * 1000 for s in veloci for a, p in zip(s.arrivi[1:], pubblicati)); costi.sort()
+    print(f"{len(pubblicati)} eventi in {durata:.1f} s ({len(pubblicati) / durata:.0f}/s), {len(json.dumps(server.stato))} byte di stato completo")
+    print(f"costo per il gioco (pubblica): mediana {q(costi, 0.5) * 1e6:.1f} µs, p99 {q(costi, 0.99) * 1e6:.1f} µs")
+    print(f"latenza di consegna a {len(veloci)} spettatori: mediana {q(latenze, 0.5):.1f} ms, p99 {q(latenze, 0.99):.1f} ms")
+
+    # 2) Raffica lunga e fitta: i lenti devono saltare, i veloci restare allineati
+    costi.clear(); inizio = time.perf_counter(); gioca(raffica, giri_raffica); durata = time.perf_counter() - inizio; attendi_consegna(); costi.sort()
+    coerenti = sum(1 for s in veloci if s.stato == server.stato)
+    print(f"raffica: {server.eventi} eventi in {server.invii} invii, pubblica p99 {q(costi, 0.99) * 1e6:.1f} µs")
+    print(f"spettatori con stato identico al server: {coerenti}/{len(veloci)}, veloci scollegati: {sum(s.chiuso for s in veloci)}")
+    print(f"lenti scollegati: {server.scollegati_lenti}/{n_lenti}")
+    server.ferma()
+    # I client si chiudono dentro il loop, prima di fermarlo: niente compiti abbandonati a metà cancellazione
+    async def chiudi_client():
+        attivi = [c for c in asyncio.all_tasks() if c is not asyncio.current_task()]
+        for c in attivi: c.cancel()
+        await asyncio.gather(*attivi, return_exceptions=True)
+    asyncio.run_coroutine_threadsafe(chiudi_client(), loop_client).result(30)
+    loop_client.call_soon_threadsafe(loop_client.stop)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QGridLayout, QLabel
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt
+from tabellone import Tabellone
+
+# --- BENCHMARK TABELLONE ---
+# Tempo per frame (aggiornamento + ridisegno sincrono) per ogni lettera scoperta:
+# vecchia griglia di 56 QLabel con setStyleSheet contro il widget Tabellone disegnato.
+#   python benchmark/bench_tabellone.py [larghezza altezza]
+
+FRASE = "NEL MEZZO DEL CAMMIN DI NOSTRA VITA MI RITROVAI"
+
+class GrigliaQLabel(QWidget):
+    # Copia fedele del vecchio agg_tabellone, usata come riferimento
+    def __init__(self):
+        super().__init__(); g = QGridLayout(self); self.celle = []
+        for r in range(4):
+            riga = []
+            for c in range(14):
+                lbl = QLabel(""); lbl.setFixedSize(55, 75); lbl.setAlignment(Qt.AlignCenter); lbl.setFont(QFont("Arial", 26, QFont.Bold))
+                g.addWidget(lbl, r, c); riga.append(lbl)
+            self.celle.append(riga)
+
+    def aggiorna(self, frase, lettere):
+        for r in range(4):
+            for c in range(14):
+                self.celle[r][c].setText(""); self.celle[r][c].setStyleSheet("background-color: #003366; border: none;")
+        riga, col = 1, 1
+        for p in frase.split(" "):
+            if col + len(p) > 13: riga += 1; col = 1
+            if riga > 3: break
+            for char in p:
+                cella = self.celle[riga][col]
+                if char in lettere or not char.isalpha():
+                    cella.setText(char); cella.setStyleSheet("background-color: white; color: black; border: 2px solid #444;")
+                else: cella.setStyleSheet("background-color: white; border: 2px solid #444;")
+                col += 1
+            col += 1
+
+def misura(contenitore, widget, app):
+    lettere = set(); widget.aggiorna(FRASE, lettere); app.processEvents()
+    tempi = []
+    for let in dict.fromkeys(c for c in FRASE if c.isalpha()):
+        lettere.add(let)
+        t = time.perf_counter()
+        widget.aggiorna(FRASE, lettere); contenitore.repaint(); app.processEvents()
+        tempi.append((time.perf_counter() - t) * 1000)
+    return tempi
+
+def main():
+    w, h = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) > 2 else (1920, 1080)
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"Frame per lettera scoperta ({w}x{h}), ms")
+    print(f"{'widget':<14}{'mediana':>10}{'p95':>10}{'max':>10}")
+    for nome, widget in (("QLabel x56", GrigliaQLabel()), ("Tabellone", Tabellone())):
+        # Stesso contesto della finestra di gioco: sfondo via stylesheet sul contenitore
+        contenitore = QWidget(); contenitore.setStyleSheet("background-color: #002244;")
+        QVBoxLayout(contenitore).addWidget(widget)
+        contenitore.resize(w, h); contenitore.show(); app.processEvents()
+        misura(contenitore, widget, app)  # riscaldamento (cache font e tessere)
+        t = sorted(misura(contenitore, widget, app))
+        contenitore.close()
+        print(f"{nome:<14}{statistics.median(t):>10.2f}{t[int(len(t) * 0.95) - 1]:>10.2f}{t[-1]:>10.2f}")
+
+if __name__ == "__main__":
+    main()
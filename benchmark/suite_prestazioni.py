@@ -0,0 +1,205 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+RADICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RADICE)
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtTest import QTest
+from archivio_frasi import PhraseStore
+from estrattore_frasi import PhraseSampler
+from traccia import statistiche
+
+# --- SUITE DI BENCHMARK OFFSCREEN ---
+# Cronometra i percorsi caldi della finestra di gioco sulla piattaforma Qt "offscreen", senza audio
+# (QtMultimedia non viene importato): tabellone e giocatori, un giro di ruota fino a flash, i frame dei
+# coriandoli, tasto -> tabellone, apertura e salvataggio dell'archivio e scelta della frase con database
+# di varie dimensioni. Ogni campione comprende il ridisegno (processEvents). I risultati vanno in JSON:
+# con --confronta si paragonano le mediane a un'esecuzione precedente e l'uscita è 1 se un caso
+# rallenta oltre la soglia (relativa, ignorando differenze sotto MINIMO_MS).
+#   python benchmark/suite_prestazioni.py --uscita base.json
+#   python benchmark/suite_prestazioni.py --confronta base.json [--soglia 0.25] [--casi tabellone,flash]
+
+FRASE = "NEL MEZZO DEL CAMMIN DI NOSTRA VITA MI RITROVAI"
+DIMENSIONI = [1_000, 10_000, 100_000]
+SOGLIA = 0.25       # +25% sulla mediana = regressione
+MINIMO_MS = 0.1     # sotto questa differenza assoluta è rumore
+
+class Muto:
+    # Al posto del lettore della musica di sottofondo: la suite gira senza scheda audio
+    def __getattr__(self, nome): return lambda *a, **k: None
+
+def ms_da(t):
+    return (time.perf_counter() - t) * 1000
+
+def frame(app, f):
+    # Gestore + ridisegno delle zone sporche, come in un frame vero
+    t = time.perf_counter(); f(); app.processEvents()
+    return ms_da(t)
+
+def crea_archivio(path, n):
+    # Creato una volta sola per dimensione: riscaldamento e misura usano lo stesso file
+    if os.path.exists(path): return
+    store = PhraseStore(path)
+    with store.conn:
+        for c in range(20):
+            cid = store._id_o_crea_categoria(f"CATEGORIA {c}")
+            store.conn.executemany("INSERT INTO frasi(categoria_id, testo) VALUES (?, ?)",
+                                   ((cid, f"FRASE {i} DELLA CATEGORIA {c}") for i in range(c, n, 20)))
+    store.close()
+
+# --- CASI ---
+def caso_tabellone(g, app, giri, cartella):
+    tempi = []
+    for _ in range(giri * 4):
+        g.motore.nuovo_round(FRASE); g.agg_tabellone(); app.processEvents()
+        for let in dict.fromkeys(c for c in FRASE if c.isalpha()):
+            g.motore.lettere.add(let); tempi.append(frame(app, g.agg_tabellone))
+    return {"agg_tabellone": tempi}
+
+def caso_giocatori(g, app, giri, cartella):
+    tempi = []
+    for k in range(giri * 30):
+        g.motore.portafogli[k % 3] += 100; g.motore.turno = k % 3
+        tempi.append(frame(app, g.agg_giocatori))
+    return {"agg_giocatori": tempi}
+
+def caso_giro(g, app, giri, cartella):
+    # Il giro viene avanzato a mano a 60 fps (niente attese) e si chiude con flash come la ruota vera
+    frame_ruota, tempi_flash = [], []
+    g.motore.nuovo_round(FRASE); g.ruota.imposta_premi(g.motore.premi)
+    for k in range(giri):
+        g.motore.turno = 0; g.ruota.gira(seed=k); g.ruota.animazione.stop()
+        passi = int(g.ruota.durata * 60)
+        for i in range(1, passi + 1): frame_ruota.append(frame(app, lambda: g.ruota.avanza(i / passi)))
+        g.ruota.angolo = g.ruota.angolo_finale % 360
+        # flash su ogni spicchio a turno (premio, JOLLY, BANCAROTTA...), non solo su quello uscito
+        for indice in range(len(g.motore.premi)):
+            g.motore.jolly = [False] * 3
+            tempi_flash.append(frame(app, lambda: g.flash(indice))); g.timer_gioco.stop(); g.modo_input = None
+        g.motore.nuovo_round(FRASE); g.ruota.imposta_premi(g.motore.premi)
+    return {"giro_ruota_frame": frame_ruota, "flash": tempi_flash}
+
+def caso_tasto(g, app, giri, cartella):
+    # Tasto premuto nella finestra -> lettera disegnata, misurato da Tabellone.latenze
+    latenze = []
+    for _ in range(giri):
+        g.motore.nuovo_round(FRASE); g.agg_tabellone(); app.processEvents(); g.tabellone.latenze.clear()
+        for let in dict.fromkeys(c for c in FRASE if c.isalpha()):
+            g.motore.turno = 0; g.motore.valore = 500; g.modo_input = "lettera"; g.testo_premio = "500"
+            QTest.keyClick(g, getattr(Qt, f"Key_{let}")); app.processEvents()
+        latenze += g.tabellone.latenze
+    return {"tasto_tabellone": latenze}
+
+def caso_coriandoli(g, app, giri, cartella):
+    tempi = []
+    for _ in range(giri):
+        g.avvia_coriandoli(); g.timer_coriandoli.stop()
+        while len(g.coriandoli) and len(tempi) < giri * 600:
+            g.t_frame_coriandoli = time.perf_counter() - 1 / 60   # passo fisso da 60 fps
+            tempi.append(frame(app, g.aggiorna_animazione_coriandoli))
+        g.coriandoli.svuota(); g.update(); app.processEvents()
+    return {"coriandoli_frame": tempi}
+
+def caso_archivio(g, app, giri, cartella):
+    # carica_database e salvataggio dell'editor (solo righe toccate) per ogni dimensione
+    risultati = {}; originale = (g.db_path, g.database, g.estrattore)
+    for n in DIMENSIONI:
+        path = os.path.join(cartella, f"archivio_{n}.sqlite"); crea_archivio(path, n)
+        g.db_path = path; carica, salva, round_ = [], [], []
+        for _ in range(giri * 10):
+            t = time.perf_counter(); g.carica_database(); carica.append(ms_da(t)); g.database.close()
+        g.carica_database(); store = g.database
+        ids = list(store.tutti_gli_id()); righe = store.righe_per_id(ids[:50])
+        for k in range(giri * 2):
+            modificate = {i: (c, f"FRASE {i} MODIFICATA {k}") for i, (c, _) in righe.items()}
+            aggiunte = [("CATEGORIA 0", f"FRASE AGGIUNTA {k} {j}") for j in range(50)]
+            t = time.perf_counter(); nuovi = store.applica_modifiche(modificate, aggiunte, ()); salva.append(ms_da(t))
+            store.applica_modifiche((), (), nuovi)
+        # nuovo_round: scelta della frase (compresa la prima pesca, che carica gli id) e aggiornamento della finestra
+        g.estrattore = PhraseSampler(store, os.path.join(cartella, f"storico_{n}.json"), seed=1)
+        g.tot_round = 10 ** 9
+        for _ in range(giri * 10): round_.append(frame(app, g.nuovo_round))
+        g.estrattore.chiudi(); store.close()
+        risultati.update({f"carica_database[{n}]": carica, f"salva_modifiche[{n}]": salva, f"nuovo_round[{n}]": round_})
+    g.db_path, g.database, g.estrattore = originale
+    return risultati
+
+CASI = {"tabellone": caso_tabellone, "giocatori": caso_giocatori, "giro": caso_giro, "tasto": caso_tasto,
+        "coriandoli": caso_coriandoli, "archivio": caso_archivio}
+
+# --- ESECUZIONE E CONFRONTO ---
+def prepara_finestra(app, larghezza, altezza):
+    import ruota_fortuna as rf
+    g = rf.GiraLaRuota(); g.giocatori = ["ANNA", "BRUNO", "CARLA"]; g.tot_round = 3
+    g.bg_player = Muto()   # init_audio non parte: nessun QtMultimedia
+    g.init_effetti(); g.resize(larghezza, altezza); g.show(); app.processEvents()
+    g.motore.nuovo_round(FRASE); g.agg_tabellone(); g.agg_giocatori(); app.processEvents()
+    return g, rf.VERSION_ATTUALE
+
+def esegui(casi, giri, larghezza, altezza):
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as cartella:
+        # Archivio e storico del gioco in una cartella temporanea, non nei Documenti dell'utente
+        os.environ["HOME"] = os.environ["USERPROFILE"] = cartella; os.makedirs(os.path.join(cartella, "Documents"))
+        g, versione = prepara_finestra(app, larghezza, altezza)
+        risultati = {}
+        for nome in casi:
+            CASI[nome](g, app, 1, cartella)   # riscaldamento: cache di font, tessere e ruota
+            t = time.perf_counter()
+            for caso, campioni in CASI[nome](g, app, giri, cartella).items(): risultati[caso] = statistiche(campioni)
+            print(f"  {nome:<12}{time.perf_counter() - t:>6.1f} s", file=sys.stderr)
+        g.database.close(); g.close()
+    return {"versione": versione, "data": datetime.datetime.now().isoformat(timespec="seconds"),
+            "piattaforma": platform.platform(), "python": platform.python_version(), "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR, "finestra": [larghezza, altezza], "giri": giri, "casi": risultati}
+
+def confronta(base, attuale, soglia):
+    # -> nomi dei casi la cui mediana è peggiorata oltre la soglia
+    casi_base = base["casi"]; regrediti = []
+    print(f"{'caso':<28}{'base':>10}{'attuale':>10}{'diff':>9}  (mediane in ms, base v{base.get('versione', '?')})")
+    for nome, r in attuale["casi"].items():
+        b = casi_base.get(nome)
+        if b is None: print(f"{nome:<28}{'-':>10}{r['mediana_ms']:>10.3f}{'nuovo':>9}"); continue
+        diff = (r["mediana_ms"] - b["mediana_ms"]) / b["mediana_ms"] if b["mediana_ms"] else 0.0
+        peggio = diff > soglia and r["mediana_ms"] - b["mediana_ms"] > MINIMO_MS
+        if peggio: regrediti.append(nome)
+        print(f"{nome:<28}{b['mediana_ms']:>10.3f}{r['mediana_ms']:>10.3f}{diff:>+9.0%}" + ("  REGRESSIONE" if peggio else ""))
+    return regrediti
+
+def stampa(risultati):
+    print(f"{'caso':<28}{'n':>6}{'mediana':>10}{'p95':>10}{'max':>10}  (ms, finestra {risultati['finestra'][0]}x{risultati['finestra'][1]})")
+    for nome, r in risultati["casi"].items():
+        print(f"{nome:<28}{r['n']:>6}{r['mediana_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['max_ms']:>10.3f}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Suite di benchmark offscreen di Gira la Ruota")
+    ap.add_argument("--casi", default=",".join(CASI), help="tra: " + ", ".join(CASI))
+    ap.add_argument("--giri", type=int, default=5, help="ripetizioni di ogni caso")
+    ap.add_argument("--finestra", default="1920x1080")
+    ap.add_argument("--uscita", help="file JSON dei risultati")
+    ap.add_argument("--confronta", help="risultati precedenti da usare come base")
+    ap.add_argument("--soglia", type=float, default=SOGLIA)
+    a = ap.parse_args(argv)
+    casi = [c for c in a.casi.split(",") if c]
+    ignoti = [c for c in casi if c not in CASI]
+    if ignoti: ap.error(f"casi sconosciuti: {', '.join(ignoti)}")
+    larghezza, altezza = (int(x) for x in a.finestra.lower().split("x"))
+    risultati = esegui(casi, a.giri, larghezza, altezza); stampa(risultati)
+    if a.uscita:
+        with open(a.uscita, "w", encoding="utf-8") as f: json.dump(risultati, f, indent=1)
+    if a.confronta:
+        with open(a.confronta, encoding="utf-8") as f: base = json.load(f)
+        print(); regrediti = confronta(base, risultati, a.soglia)
+        if regrediti: print(f"\n{len(regrediti)} casi oltre la soglia del {a.soglia:.0%}: {', '.join(regrediti)}"); return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import numpy as np
+from PyQt5.QtCore import QRect, QRectF
+from PyQt5.QtGui import QColor, QRegion
+
+# --- SISTEMA PARTICELLARE CORIANDOLI ---
+# Stato "struct of arrays" su NumPy: posizioni, velocità, dimensioni e colore di tutte le particelle
+# vengono aggiornate con poche operazioni vettoriali per frame. Le particelle uscite dallo schermo
+# vengono eliminate subito (compattazione degli array), il disegno avviene con un drawRects per
+# colore e viene ridisegnata solo l'unione delle tessere dello schermo toccate dalle particelle.
+# Oltre il budget di tempo solo le prime max_attivi particelle vengono aggiornate e disegnate: le altre
+# restano sospese negli array e riprendono quando il limite risale o le attive escono dallo schermo.
+
+PASSO_RIFERIMENTO = 0.030   # le velocità sono espresse in pixel ogni 30 ms (come il vecchio timer)
+LATO_TESSERA = 64           # granularità delle regioni sporche
+NUM_COLORI = 24
+
+class SistemaCoriandoli:
+    def __init__(self, budget_ms=12.0, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.budget_ms = budget_ms          # tempo massimo per frame (aggiornamento + disegno)
+        self.max_attivi = None              # limite adattivo di particelle attive quando il budget viene superato
+        self.costo_ms = 0.0
+        self.svuota()
+
+    def svuota(self):
+        vuoto = np.empty(0, dtype=np.float32)
+        self.x, self.y, self.vx, self.vy, self.lato = vuoto, vuoto, vuoto, vuoto, vuoto
+        self.colore = np.empty(0, dtype=np.int16)
+        self.colori = []; self.zona_precedente = QRegion()
+
+    def __len__(self):
+        return len(self.x)
+
+    def attivi(self):
+        # Quante particelle (dall'inizio degli array) vengono aggiornate e disegnate in questo frame
+        return len(self.x) if self.max_attivi is None else min(len(self.x), self.max_attivi)
+
+    def lancia(self, n, larghezza):
+        # Stessa distribuzione dei vecchi oggetti Coriandolo, ma generata in blocco
+        r = self.rng
+        self.colori = [QColor(*map(int, c)) for c in r.integers(0, 256, size=(NUM_COLORI, 3))]
+        self.x = r.integers(0, larghezza + 1, n).astype(np.float32)
+        self.y = r.integers(-800, -49, n).astype(np.float32)
+        self.lato = r.integers(6, 15, n).astype(np.float32)
+        self.vy = r.integers(5, 12, n).astype(np.float32)
+        self.vx = r.uniform(-3, 3, n).astype(np.float32)
+        self.colore = r.integers(0, NUM_COLORI, n).astype(np.int16)
+        self.max_attivi = None
+
+    def avanza(self, dt, altezza):
+        # -> regione da ridisegnare (posizioni vecchie + nuove)
+        k = dt / PASSO_RIFERIMENTO; n = self.attivi()
+        self.y[:n] += self.vy[:n] * k; self.x[:n] += self.vx[:n] * k
+        # Escono solo le attive cadute oltre il bordo; le sospese restano dove sono
+        vivi = np.ones(len(self.x), dtype=bool); vivi[:n] = self.y[:n] <= altezza
+        if not vivi.all():
+            self.x, self.y, self.vx, self.vy = self.x[vivi], self.y[vivi], self.vx[vivi], self.vy[vivi]
+            self.lato, self.colore = self.lato[vivi], self.colore[vivi]
+        zona = self.regione_occupata()
+        sporca = zona.united(self.zona_precedente); self.zona_precedente = zona
+        return sporca
+
+    def regione_occupata(self):
+        regione = QRegion(); n = self.attivi()
+        visibili = (self.y[:n] + self.lato[:n] >= 0) & (self.x[:n] + self.lato[:n] >= 0)
+        if not visibili.any(): return regione
+        x, y, lato = np.maximum(self.x[:n][visibili], 0), np.maximum(self.y[:n][visibili], 0), self.lato[:n][visibili]
+        x0 = (x // LATO_TESSERA).astype(np.int32); y0 = (y // LATO_TESSERA).astype(np.int32)
+        x1 = ((x + lato) // LATO_TESSERA).astype(np.int32); y1 = ((y + lato) // LATO_TESSERA).astype(np.int32)
+        tessere = np.unique(np.concatenate([y0 * 65536 + x0, y0 * 65536 + x1, y1 * 65536 + x0, y1 * 65536 + x1]))
+        # Tessere contigue sulla stessa riga vengono fuse in un unico rettangolo
+        inizio = prec = None
+        for t in tessere.tolist():
+            if prec is not None and t == prec + 1: prec = t; continue
+            if inizio is not None: regione = regione.united(self._rettangolo_tessere(inizio, prec))
+            inizio = prec = t
+        if inizio is not None: regione = regione.united(self._rettangolo_tessere(inizio, prec))
+        return regione
+
+    def _rettangolo_tessere(self, da, a):
+        riga, c0, c1 = da >> 16, da & 0xFFFF, a & 0xFFFF
+        return QRect(c0 * LATO_TESSERA, riga * LATO_TESSERA, (c1 - c0 + 1) * LATO_TESSERA, LATO_TESSERA)
+
+    def disegna(self, painter, area):
+        n = self.attivi()
+        if not n: return
+        r = area.boundingRect(); x, y, lato = self.x[:n], self.y[:n], self.lato[:n]
+        dentro = (x + lato >= r.left()) & (x <= r.right()) & (y + lato >= r.top()) & (y <= r.bottom())
+        xs, ys, ls, cs = x[dentro].tolist(), y[dentro].tolist(), lato[dentro].tolist(), self.colore[:n][dentro]
+        ordine = np.argsort(cs, kind="stable"); cs = cs[ordine]
+        confini = np.searchsorted(cs, np.arange(NUM_COLORI + 1))
+        for c in range(NUM_COLORI):
+            a, b = confini[c], confini[c + 1]
+            if a == b: continue
+            painter.setBrush(self.colori[c])
+            painter.drawRects([QRectF(xs[i], ys[i], ls[i], ls[i]) for i in ordine[a:b].tolist()])
+
+    def registra_costo(self, ms):
+        # Se il frame sfora il budget si sospende una parte delle particelle, poi si risale piano
+        self.costo_ms = 0.8 * self.costo_ms + 0.2 * ms
+        attivi = self.attivi()
+        if self.costo_ms > self.budget_ms and attivi > 100: self.max_attivi = int(attivi * 0.9)
+        elif self.max_attivi is not None and self.costo_ms < self.budget_ms * 0.7:
+            self.max_attivi = int(self.max_attivi * 1.05) + 1
+            if self.max_attivi >= len(self.x): self.max_attivi = None
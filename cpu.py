@@ -0,0 +1,48 @@
+from griglia import vista_tabellone
+
+# --- GIOCATORE CPU ---
+# Ragiona come un solutore: dal tabellone visibile, dalla categoria e dalle lettere già chiamate
+# ricava (tramite IndiceFrasi) le frasi ancora compatibili e sceglie la lettera con il guadagno
+# atteso più alto. Vede solo ciò che vede il pubblico, mai la soluzione.
+
+VOCALI = "AEIOU"
+CONSONANTI = "BCDFGHJKLMNPQRSTVWXYZ"
+FREQUENZE_IT = "EAIONLRTSCDUPMVGHFBQZ"   # ripiego quando la frase non è nell'indice
+GIRA, VOCALE, RISOLVI = "gira", "vocale", "risolvi"
+
+class GiocatoreCPU:
+    def __init__(self, indice, valore_atteso_ruota=400, min_scoperta=0.4):
+        self.indice = indice
+        self.valore_atteso_ruota = valore_atteso_ruota   # valore medio di uno spicchio in denaro
+        self.min_scoperta = min_scoperta                 # non risolve a tabellone quasi vuoto, anche se saprebbe
+
+    def _contesto(self, partita):
+        vista = vista_tabellone(partita.soluzione, partita.lettere)
+        return vista, partita.lettere | partita.lettere_errate
+
+    def decidi(self, partita, categoria):
+        # -> (GIRA, None) | (VOCALE, None) | (RISOLVI, frase)
+        vista, chiamate = self._contesto(partita)
+        frasi = self.indice.frasi_candidate(categoria, vista, partita.lettere_errate, limite=2)
+        if len(frasi) == 1 and partita.frazione_scoperta() >= self.min_scoperta: return RISOLVI, frasi[0]
+        consonanti = [c for c in CONSONANTI if c not in chiamate]
+        vocali = [v for v in VOCALI if v not in chiamate]
+        stat, n = self.indice.statistiche_lettere(categoria, vista, consonanti + vocali, partita.lettere_errate)
+        # Incasso atteso di un giro con la consonante migliore; vocale se conviene o se non resta altro
+        ev_giro = max((stat[c][1] * self.valore_atteso_ruota for c in consonanti if c in stat), default=0)
+        prob_vocale = max((stat[v][0] for v in vocali if v in stat), default=0)
+        if partita.puo_comprare_vocale() and prob_vocale > 0 and (ev_giro == 0 or prob_vocale >= 0.9): return VOCALE, None
+        if frasi and ev_giro == 0: return RISOLVI, frasi[0]
+        return GIRA, None
+
+    def scegli_lettera(self, partita, categoria, vocale=False):
+        vista, chiamate = self._contesto(partita)
+        lettere = [c for c in (VOCALI if vocale else CONSONANTI) if c not in chiamate]
+        if not lettere: return None
+        stat, n = self.indice.statistiche_lettere(categoria, vista, lettere, partita.lettere_errate)
+        if n:
+            # Consonante: massimo incasso atteso (occorrenze * valore); vocale: massima probabilità di esserci
+            chiave = (lambda c: (stat[c][0], stat[c][1])) if vocale else (lambda c: (stat[c][1] * partita.valore, stat[c][0]))
+            migliore = max(lettere, key=chiave)
+            if stat[migliore][0] > 0: return migliore
+        return next((c for c in FREQUENZE_IT if c in lettere), lettere[0])
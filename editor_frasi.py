@@ -0,0 +1,319 @@
+from array import array
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel, QPushButton, QTableView,
+                             QHeaderView, QAbstractItemView, QMessageBox, QFileDialog, QProgressDialog, QApplication)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+from importa_frasi import normalizza, valuta, importa_file, IMPORTATA, DUPLICATA, CATEGORIA_DEFAULT
+
+# --- EDITOR DELLE FRASI ---
+# Al posto del vecchio JSON in un QTextEdit: il modello tiene in memoria solo gli id delle frasi
+# (nell'ordine dell'archivio), legge testo e categoria a pagine quando la vista li mostra e
+# conserva a parte le sole righe modificate, aggiunte o eliminate. Il salvataggio scrive quelle.
+
+PAGINA = 256            # righe lette dall'archivio in una volta
+PAGINE_IN_CACHE = 64
+PASSO_FETCH = 2000      # righe rese visibili alla vista ad ogni fetchMore
+MAX_INTERVALLI = 64     # oltre questi blocchi di righe contigue un'eliminazione azzera il modello
+RITARDO_RICERCA = 200   # ms dopo l'ultimo tasto prima di filtrare
+COLONNE = ["Categoria", "Frase", "Esito"]
+TESTI_ESITO = {IMPORTATA: "✓", DUPLICATA: "già presente", "non_entra": "non entra", "caratteri": "caratteri non ammessi", "vuota": "vuota"}
+
+# --- INDICE DI RICERCA ---
+# Una chiave "CATEGORIA\tTESTO" per frase, costruita a blocchi mentre l'editor è aperto e inattivo
+# (o tutta insieme se si cerca prima). Se la nuova ricerca contiene la precedente (si sta continuando
+# a scrivere) si filtrano solo i risultati precedenti; con più parole si parte dalla più lunga.
+PASSO_INDICE = 20000
+
+class IndiceRicerca:
+    def __init__(self, righe):
+        self.chiavi = {}; self.rimosse = set(); self.righe = iter(righe); self.completo = False
+        self.ultima = None; self.risultati = None
+
+    def costruisci(self, quante=None):
+        # -> True quando tutte le righe sono indicizzate; quante=None completa in un colpo solo
+        chiavi, rimosse = self.chiavi, self.rimosse; lette = 0
+        for fid, c, t in self.righe:
+            # Le modifiche registrate nel frattempo hanno la precedenza sull'archivio
+            if fid not in chiavi and fid not in rimosse: chiavi[fid] = f"{c}\t{t}".upper()
+            lette += 1
+            if quante is not None and lette >= quante: return False
+        self.completo = True
+        return True
+
+    def cerca(self, testo):
+        if not self.completo: self.costruisci()
+        q = " ".join(testo.upper().split())
+        if not q: self.ultima = None; return None
+        termini = sorted(set(q.split(" ")), key=len, reverse=True)
+        if self.ultima is not None and self.ultima in q: ids = [i for i in self.risultati if i in self.chiavi]
+        else: ids = [i for i, k in self.chiavi.items() if termini[0] in k]; termini = termini[1:]
+        for t in termini: ids = [i for i in ids if t in self.chiavi[i]]
+        self.ultima = q; self.risultati = ids
+        return ids
+
+    def aggiorna(self, fid, categoria, testo):
+        self.chiavi[fid] = f"{categoria}\t{testo}".upper(); self.ultima = None
+
+    def rimuovi(self, fid):
+        self.chiavi.pop(fid, None); self.rimosse.add(fid); self.ultima = None
+
+# --- MODELLO ---
+class PhraseTableModel(QAbstractTableModel):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.tutti = store.tutti_gli_id(); self.ids = self.tutti; self.mostrate = min(PASSO_FETCH, len(self.ids))
+        self.cache = {}; self.pagine = []     # pagine lette di recente (id -> (categoria, testo))
+        self.valutazioni = {}                  # esito delle righe in cache, calcolato alla prima visualizzazione
+        self.modificate = {}; self.aggiunte = {}; self.eliminate = set()
+        self.esiti = {}                        # esito delle sole righe toccate, calcolato in setData
+        self.prossimo_nuovo = -1               # le righe nuove hanno id negativi fino al salvataggio
+        self.indice = IndiceRicerca(store.righe_a_pagine())
+
+    # --- LETTURA PIGRA ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.mostrate
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLONNE)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.mostrate < len(self.ids)
+
+    def fetchMore(self, parent=QModelIndex()):
+        n = min(PASSO_FETCH, len(self.ids) - self.mostrate)
+        self.beginInsertRows(QModelIndex(), self.mostrate, self.mostrate + n - 1); self.mostrate += n; self.endInsertRows()
+
+    def riga(self, r):
+        fid = self.ids[r]
+        if fid in self.modificate: return self.modificate[fid]
+        if fid in self.aggiunte: return self.aggiunte[fid]
+        if fid not in self.cache:
+            inizio = r - r % PAGINA
+            pagina = self.store.righe_per_id(i for i in self.ids[inizio:inizio + PAGINA] if i > 0)
+            self.cache.update(pagina); self.pagine.append(pagina)
+            if len(self.pagine) > PAGINE_IN_CACHE:
+                for i in self.pagine.pop(0): self.cache.pop(i, None); self.valutazioni.pop(i, None)
+        return self.cache.get(fid, ("", ""))
+
+    def esito(self, r):
+        fid = self.ids[r]
+        if fid in self.esiti: return self.esiti[fid]
+        if fid not in self.valutazioni: self.valutazioni[fid] = valuta(self.riga(r)[1])[1:]
+        return self.valutazioni[fid]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        r, c = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if c < 2: return self.riga(r)[c]
+            esito, dettaglio = self.esito(r)
+            return TESTI_ESITO.get(esito, esito) + (f": {dettaglio}" if dettaglio else "")
+        if role == Qt.BackgroundRole:
+            if self.esito(r)[0] != IMPORTATA: return QColor("#5a1a1a")
+            if self.ids[r] in self.modificate or self.ids[r] in self.aggiunte: return QColor("#1a3a5a")
+        if role == Qt.ToolTipRole and c == 2: return self.data(index)
+        return None
+
+    def headerData(self, sezione, orientamento, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole: return None
+        return COLONNE[sezione] if orientamento == Qt.Horizontal else str(sezione + 1)
+
+    def flags(self, index):
+        f = super().flags(index)
+        return f | Qt.ItemIsEditable if index.column() < 2 else f
+
+    # --- MODIFICHE (restano in memoria fino al salvataggio) ---
+    def setData(self, index, valore, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() > 1: return False
+        r = index.row(); fid = self.ids[r]
+        categoria, testo = self.riga(r)
+        if index.column() == 0: categoria = " ".join(str(valore).split()).upper() or CATEGORIA_DEFAULT
+        else: testo = normalizza(str(valore))
+        if (categoria, testo) == self.riga(r): return False
+        (self.aggiunte if fid < 0 else self.modificate)[fid] = (categoria, testo)
+        # Validazione della sola riga toccata: stesse regole di a capo del tabellone e dell'importazione
+        esito = valuta(testo)[1:]
+        if esito[0] == IMPORTATA and index.column() == 1 and self.testo_duplicato(fid, testo): esito = (DUPLICATA, "")
+        self.esiti[fid] = esito
+        self.indice.aggiorna(fid, categoria, testo)
+        self.dataChanged.emit(self.index(r, 0), self.index(r, len(COLONNE) - 1))
+        return True
+
+    def testo_duplicato(self, fid, testo):
+        in_sospeso = {**self.modificate, **self.aggiunte}
+        if any(t == testo for i, (_, t) in in_sospeso.items() if i != fid): return True
+        if not self.store.contiene_testo(testo): return False
+        # Il testo è in archivio: non conta se la riga che lo contiene sta per cambiare o sparire
+        return any(i not in in_sospeso and i not in self.eliminate for i in self.store.id_con_testo(testo))
+
+    def aggiungi(self, categoria):
+        fid = self.prossimo_nuovo; self.prossimo_nuovo -= 1
+        self.aggiunte[fid] = (categoria, ""); self.esiti[fid] = ("vuota", "")
+        for lista in self.liste(): lista.append(fid)
+        self.indice.aggiorna(fid, categoria, "")
+        # Riga aggiunta in fondo: se la vista non l'ha ancora raggiunta, la si rende visibile subito
+        self.beginInsertRows(QModelIndex(), self.mostrate, len(self.ids) - 1); self.mostrate = len(self.ids); self.endInsertRows()
+        return self.index(len(self.ids) - 1, 1)
+
+    def elimina(self, righe):
+        righe = sorted(set(righe))
+        if not righe: return
+        via = {self.ids[r] for r in righe}
+        for fid in via:
+            if fid < 0: self.aggiunte.pop(fid, None)
+            else: self.eliminate.add(fid); self.modificate.pop(fid, None)
+            self.esiti.pop(fid, None); self.indice.rimuovi(fid)
+        # Blocchi di righe contigue, tolti dal fondo così gli indici dei precedenti restano validi
+        intervalli = []
+        for r in righe:
+            if intervalli and r == intervalli[-1][1] + 1: intervalli[-1][1] = r
+            else: intervalli.append([r, r])
+        filtrate = self.ids is not self.tutti
+        if len(intervalli) > MAX_INTERVALLI:
+            # Tante righe sparse: un'unica passata sull'elenco e un reset costano meno di molte notifiche
+            self.beginResetModel()
+            self.ids = array("q", (i for i in self.ids if i not in via)); self.mostrate -= len(righe)
+            if not filtrate: self.tutti = self.ids
+            self.endResetModel()
+        else:
+            for a, b in reversed(intervalli):
+                self.beginRemoveRows(QModelIndex(), a, b); del self.ids[a:b + 1]; self.mostrate -= b - a + 1; self.endRemoveRows()
+        # Con un filtro attivo anche l'elenco completo perde le stesse frasi, in un'unica passata
+        if filtrate: self.tutti = array("q", (i for i in self.tutti if i not in via))
+
+    def liste(self):
+        # Tutte le frasi e, se c'è un filtro attivo, i risultati mostrati
+        return [self.tutti] if self.ids is self.tutti else [self.tutti, self.ids]
+
+    def in_sospeso(self):
+        return len(self.modificate) + len(self.aggiunte) + len(self.eliminate)
+
+    def righe_non_valide(self):
+        return [fid for fid in list(self.modificate) + list(self.aggiunte) if self.esiti.get(fid, (IMPORTATA,))[0] != IMPORTATA]
+
+    def salva(self):
+        # Scrive solo le righe valide; quelle non valide restano nell'editor, evidenziate
+        scartate = set(self.righe_non_valide())
+        modificate = {i: v for i, v in self.modificate.items() if i not in scartate}
+        aggiunte = [(i, v) for i, v in self.aggiunte.items() if i not in scartate]
+        nuovi_id = self.store.applica_modifiche(modificate, [v for _, v in aggiunte], self.eliminate)
+        rinominati = {}
+        for (vecchio, v), nuovo in zip(aggiunte, nuovi_id):
+            self.aggiunte.pop(vecchio); self.esiti.pop(vecchio, None); self.cache[nuovo] = v; rinominati[vecchio] = nuovo
+            self.indice.rimuovi(vecchio); self.indice.aggiorna(nuovo, *v)
+        # Le righe nuove sono in fondo: si cercano a ritroso, senza scorrere tutto l'elenco per ognuna
+        for lista in self.liste() if rinominati else ():
+            mancano = len(rinominati)
+            for k in range(len(lista) - 1, -1, -1):
+                if lista[k] in rinominati: lista[k] = rinominati[lista[k]]; mancano -= 1
+                if not mancano: break
+        for i, v in modificate.items(): self.cache[i] = v; self.modificate.pop(i); self.esiti.pop(i, None); self.valutazioni.pop(i, None)
+        salvate = len(modificate) + len(aggiunte) + len(self.eliminate)
+        self.eliminate = set()
+        self.dataChanged.emit(self.index(0, 0), self.index(max(self.mostrate - 1, 0), len(COLONNE) - 1))
+        return salvate, len(scartate)
+
+    # --- RICERCA ---
+    def filtra(self, testo):
+        risultati = self.indice.cerca(testo)
+        self.beginResetModel()
+        self.ids = self.tutti if risultati is None else array("q", risultati)
+        self.mostrate = min(PASSO_FETCH, len(self.ids))
+        self.endResetModel()
+        return len(self.ids)
+
+# --- FINESTRA ---
+class PhraseEditorDialog(QDialog):
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Editor Frasi"); self.resize(900, 650)
+        self.store = store; self.salvate = 0
+        layout = QVBoxLayout(self)
+
+        cerca = QHBoxLayout()
+        self.campo_ricerca = QLineEdit(); self.campo_ricerca.setPlaceholderText("🔍 Cerca per categoria o frase...")
+        self.label_conteggio = QLabel(""); cerca.addWidget(self.campo_ricerca, 1); cerca.addWidget(self.label_conteggio)
+        layout.addLayout(cerca)
+        self.timer_ricerca = QTimer(self); self.timer_ricerca.setSingleShot(True); self.timer_ricerca.timeout.connect(self.applica_ricerca)
+        self.campo_ricerca.textChanged.connect(lambda: self.timer_ricerca.start(RITARDO_RICERCA))
+
+        # Righe ad altezza fissa: la vista non deve misurare 500.000 righe per disegnare la barra di scorrimento
+        self.vista = QTableView()
+        self.vista.verticalHeader().setSectionResizeMode(QHeaderView.Fixed); self.vista.verticalHeader().setDefaultSectionSize(24)
+        self.vista.setSelectionBehavior(QAbstractItemView.SelectRows); self.vista.setWordWrap(False)
+        layout.addWidget(self.vista, 1)
+
+        btns = QHBoxLayout()
+        self.btn_nuova = QPushButton("➕ Nuova"); self.btn_elimina = QPushButton("🗑 Elimina"); self.btn_importa = QPushButton("📥 Importa...")
+        self.label_stato = QLabel("")
+        self.btn_save = QPushButton("Salva"); self.btn_cancel = QPushButton("Chiudi")
+        for b in [self.btn_nuova, self.btn_elimina, self.btn_importa]: btns.addWidget(b)
+        btns.addWidget(self.label_stato, 1); btns.addWidget(self.btn_save); btns.addWidget(self.btn_cancel)
+        layout.addLayout(btns)
+        self.btn_nuova.clicked.connect(self.nuova_frase); self.btn_elimina.clicked.connect(self.elimina_selezione)
+        self.btn_importa.clicked.connect(self.importa); self.btn_save.clicked.connect(self.salva); self.btn_cancel.clicked.connect(self.reject)
+        self.timer_indice = QTimer(self); self.timer_indice.timeout.connect(self.passo_indice)
+        self.imposta_modello()
+
+    def passo_indice(self):
+        # Indice di ricerca costruito a blocchi negli istanti liberi: la finestra resta reattiva
+        if self.modello.indice.completo or self.modello.indice.costruisci(PASSO_INDICE): self.timer_indice.stop()
+
+    def imposta_modello(self):
+        self.modello = PhraseTableModel(self.store, self); self.vista.setModel(self.modello)
+        self.vista.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.vista.setColumnWidth(0, 180); self.vista.setColumnWidth(2, 200)
+        for segnale in (self.modello.dataChanged, self.modello.rowsInserted, self.modello.rowsRemoved, self.modello.modelReset):
+            segnale.connect(self.agg_stato)
+        self.agg_stato(); self.timer_indice.start(0)
+
+    def agg_stato(self, *_):
+        m = self.modello
+        self.label_conteggio.setText(f"{len(m.ids):,} frasi")
+        n, errate = m.in_sospeso(), len(m.righe_non_valide())
+        self.label_stato.setText(f"{n} modifiche da salvare" + (f", {errate} non valide" if errate else "") if n else "")
+
+    def applica_ricerca(self):
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try: self.modello.filtra(self.campo_ricerca.text())
+        finally: QApplication.restoreOverrideCursor()
+
+    def nuova_frase(self):
+        corrente = self.vista.currentIndex()
+        categoria = self.modello.riga(corrente.row())[0] if corrente.isValid() else CATEGORIA_DEFAULT
+        indice = self.modello.aggiungi(categoria)
+        self.vista.scrollTo(indice); self.vista.setCurrentIndex(indice); self.vista.edit(indice)
+
+    def elimina_selezione(self):
+        righe = [i.row() for i in self.vista.selectionModel().selectedRows()]
+        if righe: self.modello.elimina(righe)
+
+    def salva(self):
+        m = self.modello
+        errate = len(m.righe_non_valide())
+        if errate:
+            r = QMessageBox.question(self, "Righe non valide", f"{errate} righe non sono valide (evidenziate in rosso) e non verranno salvate.\nSalvare le altre modifiche?", QMessageBox.Yes | QMessageBox.No)
+            if r != QMessageBox.Yes: return
+        try: salvate, _ = m.salva()
+        except Exception as e: QMessageBox.critical(self, "Errore", f"Salvataggio fallito: {e}"); return
+        self.salvate += salvate; self.agg_stato()
+        if not m.in_sospeso(): self.accept()
+
+    def importa(self):
+        if self.modello.in_sospeso():
+            QMessageBox.information(self, "Importa", "Salva o annulla le modifiche prima di importare."); return
+        path, _ = QFileDialog.getOpenFileName(self, "Importa frasi", "", "Frasi (*.csv *.txt *.json *.jsonl *.tsv)")
+        if not path: return
+        attesa = QProgressDialog("Importazione in corso...", None, 0, 0, self); attesa.setWindowModality(Qt.WindowModal); attesa.show()
+        def avanzamento(n):
+            attesa.setLabelText(f"Importazione in corso... {n:,} frasi"); QApplication.processEvents()
+        try: r = importa_file(self.store, path, processi=0, avanzamento=avanzamento)
+        except Exception as e: attesa.close(); QMessageBox.critical(self, "Errore", f"Importazione fallita: {e}"); return
+        attesa.close()
+        self.salvate += r.conteggi[IMPORTATA]
+        # L'archivio è cambiato in blocco: si riparte da un modello nuovo
+        self.campo_ricerca.blockSignals(True); self.campo_ricerca.clear(); self.campo_ricerca.blockSignals(False)
+        self.imposta_modello()
+        esiti = "\n".join(f"{k}: {v:,}" for k, v in r.conteggi.items())
+        QMessageBox.information(self, "Importazione completata", f"{r.lette:,} frasi lette\n\n{esiti}")
@@ -0,0 +1,114 @@
+import bisect
+import json
+import os
+import random
+from array import array
+
+# --- ESTRATTORE FRASI SENZA RIPETIZIONI ---
+# Ogni categoria è un "sacchetto": una frase non esce di nuovo finché il sacchetto non è vuoto.
+# L'estrazione usa un Fisher-Yates pigro (solo gli scambi effettuati vengono memorizzati),
+# quindi ogni pesca costa O(1) indipendentemente dalla dimensione del database, che non viene
+# mai modificato. Lo storico delle frasi già uscite viene salvato su disco tra una sessione e l'altra:
+# ogni pesca aggiunge una riga a un registro (JSON lines), che viene compattato in un'unica
+# istantanea all'apertura e alla chiusura. Formato delle righe:
+#   {"categoria": [id, ...]}   istantanea (anche il vecchio file JSON a riga singola)
+#   ["categoria", id]          frase uscita
+#   ["categoria", null]        sacchetto svuotato, la categoria ricomincia da capo
+
+class _Sacchetto:
+    def __init__(self, ids, gia_usciti, rng):
+        self.ids = ids; self.rng = rng
+        self.usciti = set(gia_usciti); self.svuotato = False
+        # Le frasi già uscite nelle sessioni precedenti restano fuori fino al prossimo giro
+        self.disponibili = array('q', (i for i in ids if i not in self.usciti)) if self.usciti else ids
+        if not self.disponibili: self.ricomincia()
+        else: self.rimaste = len(self.disponibili); self.scambi = {}
+
+    def ricomincia(self):
+        self.usciti = set(); self.disponibili = self.ids; self.svuotato = True
+        self.rimaste = len(self.ids); self.scambi = {}
+
+    def pesca(self):
+        if self.rimaste == 0: self.ricomincia()
+        j = self.rng.randrange(self.rimaste); ultimo = self.rimaste - 1
+        scelto = self.scambi.get(j, j)
+        self.scambi[j] = self.scambi.pop(ultimo, ultimo)
+        self.rimaste = ultimo
+        frase_id = self.disponibili[scelto]; self.usciti.add(frase_id)
+        return frase_id
+
+class PhraseSampler:
+    def __init__(self, store, storico_path=None, pesi=None, seed=None):
+        self.store = store; self.storico_path = storico_path
+        self.pesi = dict(pesi or {})
+        self.rng = random.Random(seed)
+        self.registro = None
+        self.storico = self._leggi_storico()
+        self._compatta()
+        self.invalida()
+
+    def invalida(self, categoria=None):
+        # Da chiamare dopo una modifica del database: i sacchetti vengono ricostruiti alla prossima pesca
+        if categoria is None: self.sacchetti = {}
+        else: self.sacchetti.pop(categoria, None)
+        conteggi = self.store.conteggi()
+        self.categorie = [c for c, n in conteggi.items() if n > 0 and self.pesi.get(c, 1) > 0]
+        cumulati, tot = [], 0
+        for c in self.categorie: tot += self.pesi.get(c, 1); cumulati.append(tot)
+        self.pesi_cumulati = cumulati
+
+    def imposta_pesi(self, pesi):
+        self.pesi = dict(pesi); self.invalida()
+
+    def scegli_categoria(self):
+        if not self.categorie: raise LookupError("Nessuna frase disponibile nel database")
+        x = self.rng.random() * self.pesi_cumulati[-1]
+        return self.categorie[bisect.bisect_right(self.pesi_cumulati, x)]
+
+    def estrai(self, categoria=None):
+        categoria = categoria or self.scegli_categoria()
+        sacchetto = self.sacchetti.get(categoria)
+        if sacchetto is None:
+            ids = array('q', self.store.id_frasi(categoria))
+            sacchetto = self.sacchetti[categoria] = _Sacchetto(ids, self.storico.get(categoria, ()), self.rng)
+        frase_id = sacchetto.pesca()
+        if sacchetto.svuotato: self._annota(categoria, None); sacchetto.svuotato = False
+        self.storico[categoria] = sacchetto.usciti
+        self._annota(categoria, frase_id)
+        return categoria, self.store.testo_frase(frase_id)
+
+    def chiudi(self):
+        # Riscrive il registro come istantanea; senza chiudi() lo storico resta comunque completo
+        self._compatta()
+        if self.registro: self.registro.close(); self.registro = None
+
+    # --- STORICO PERSISTENTE ---
+    def _leggi_storico(self):
+        storico = {}
+        if not self.storico_path: return storico
+        try:
+            with open(self.storico_path, 'r', encoding='utf-8') as f:
+                for riga in f:
+                    try: voce = json.loads(riga)
+                    except ValueError: continue   # ultima riga troncata da una chiusura brusca
+                    if isinstance(voce, dict): storico = {c: set(v) for c, v in voce.items()}
+                    elif voce[1] is None: storico[voce[0]] = set()
+                    else: storico.setdefault(voce[0], set()).add(voce[1])
+        except: pass
+        return storico
+
+    def _annota(self, categoria, frase_id):
+        # Una riga per pesca: costo costante, indipendente da quante frasi sono già uscite
+        if not self.registro: return
+        try: self.registro.write(json.dumps([categoria, frase_id]) + "\n"); self.registro.flush()
+        except: pass
+
+    def _compatta(self):
+        if not self.storico_path: return
+        try:
+            if self.registro: self.registro.close(); self.registro = None
+            tmp = self.storico_path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f: f.write(json.dumps({c: list(v) for c, v in self.storico.items()}) + "\n")
+            os.replace(tmp, self.storico_path)
+            self.registro = open(self.storico_path, 'a', encoding='utf-8')
+        except: pass
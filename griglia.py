@@ -0,0 +1,54 @@
+import unicodedata
+
+# --- DISPOSIZIONE DELLA FRASE SUL TABELLONE 4x14 ---
+# Regole storiche di agg_tabellone: si parte da riga 1 / colonna 1, una parola va a capo se
+# supererebbe la colonna 12 (una parola di 13 lettere occupa anche il margine destro), dopo la
+# riga 3 le parole vengono scartate. Nessuna dipendenza da Qt: la usano anche motore, importazione e CPU.
+
+RIGHE, COLONNE = 4, 14
+
+def disponi_frase(frase):
+    # -> (lista di (riga, colonna, carattere), parole che non entrano nel tabellone)
+    celle, escluse = [], []
+    parole = frase.split(" ")
+    riga, col = 1, 1
+    for i, p in enumerate(parole):
+        if col + len(p) > COLONNE - 1: riga += 1; col = 1
+        if riga > RIGHE - 1 or len(p) > COLONNE - 1: escluse = parole[i:]; break
+        for char in p:
+            celle.append((riga, col, char)); col += 1
+        col += 1
+    return celle, escluse
+
+def entra_nel_tabellone(frase):
+    return not disponi_frase(frase)[1]
+
+def vista_tabellone(frase, lettere_indovinate):
+    # Ciò che vede il pubblico: (riga, colonna, carattere) con None al posto delle lettere coperte
+    return [(r, c, ch if (ch in lettere_indovinate or not ch.isalpha()) else None) for r, c, ch in disponi_frase(frase)[0]]
+
+def forma_celle(celle):
+    # Lunghezze delle parole sul tabellone, ricavate dalle posizioni delle celle occupate
+    forma, prec = [], None
+    for r, c, _ in celle:
+        if prec is not None and r == prec[0] and c == prec[1] + 1: forma[-1] += 1
+        else: forma.append(1)
+        prec = (r, c)
+    return tuple(forma)
+
+# --- TESTO COME SUL TABELLONE ---
+# Stessa forma per frasi in archivio, soluzione del round e tentativi di soluzione (tastiera e CPU)
+SOSTITUZIONI = str.maketrans({"’": "'", "‘": "'", "`": "'", "´": "'", "ʼ": "'", "“": '"', "”": '"', "«": '"', "»": '"',
+                              "–": "-", "—": "-", "…": "...", " ": " "})
+def normalizza(testo):
+    # Maiuscolo, spazi compressi, apostrofi tipografici uniformati. Le lettere accentate non esistono
+    # sul tabellone: a fine parola diventano lettera + apostrofo (CITTÀ -> CITTA'), altrove perdono l'accento.
+    t = " ".join(testo.translate(SOSTITUZIONI).split()).upper()
+    if t.isascii(): return t
+    out = []
+    for i, ch in enumerate(t):
+        base = unicodedata.normalize("NFD", ch)
+        if len(base) == 1 or not base[0].isascii(): out.append(ch); continue
+        fine_parola = i + 1 == len(t) or not t[i + 1].isalpha()
+        out.append(base[0] + ("'" if fine_parola and t[i + 1:i + 2] != "'" else ""))
+    return "".join(out)
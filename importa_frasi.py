@@ -0,0 +1,207 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from griglia import disponi_frase, normalizza
+
+# --- IMPORTAZIONE MASSIVA DI FRASI ---
+# Legge file CSV, TXT, JSON e JSONL un pezzo alla volta (mai il file intero in memoria), normalizza
+# le frasi su un pool di processi, le passa per le stesse regole di a capo del tabellone e scarta
+# (o segnala) quelle che non entrerebbero, poi le inserisce saltando i doppioni già in archivio.
+#   python importa_frasi.py frasi.sqlite nuove.csv --categoria PROVERBI --rapporto esiti.csv
+#   python importa_frasi.py frasi.sqlite nuove.txt --prova      (solo verifica, non scrive nulla)
+#   python importa_frasi.py frasi.sqlite --verifica             (frasi già in archivio che non entrano)
+
+IMPORTATA, SEGNALATA, DUPLICATA, NON_ENTRA, VUOTA, CARATTERI = "importata", "segnalata", "duplicata", "non_entra", "vuota", "caratteri"
+ESEMPI_PER_ESITO = 20
+CATEGORIA_DEFAULT = "GENERAL"
+
+# --- NORMALIZZAZIONE (normalizza è in griglia.py, condivisa con il motore) ---
+AMMESSI = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 '.,:;!?-\"&()/")
+
+def valuta(testo):
+    # -> (testo normalizzato, esito, dettaglio) con le stesse regole di a capo di agg_tabellone
+    t = normalizza(testo)
+    if not any(ch.isalpha() for ch in t): return t, VUOTA, ""
+    strani = sorted(set(t) - AMMESSI)
+    if strani: return t, CARATTERI, "".join(strani)
+    escluse = disponi_frase(t)[1]
+    if escluse: return t, NON_ENTRA, " ".join(escluse)
+    return t, IMPORTATA, ""
+
+def valuta_blocco(blocco):
+    return [(rif, " ".join(categoria.split()).upper() or CATEGORIA_DEFAULT, *valuta(testo)) for rif, categoria, testo in blocco]
+
+# --- LETTORI IN STREAMING: generano (riferimento, categoria, testo) ---
+def leggi_txt(path, categoria):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for n, riga in enumerate(f, 1):
+            riga = riga.strip()
+            if riga and not riga.startswith("#"): yield f"riga {n}", categoria, riga
+
+def leggi_csv(path, categoria):
+    # Colonne: frase oppure categoria,frase; l'intestazione (se c'è) viene riconosciuta e saltata
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        campione = f.read(4096); f.seek(0)
+        try: dialetto = csv.Sniffer().sniff(campione, delimiters=",;\t")
+        except csv.Error: dialetto = csv.excel
+        for n, r in enumerate(csv.reader(f, dialetto), 1):
+            if not any(c.strip() for c in r): continue
+            if n == 1 and r[0].strip().lower() in ("categoria", "category", "frase", "phrase"): continue
+            if len(r) == 1: yield f"riga {n}", categoria, r[0]
+            else: yield f"riga {n}", r[0], r[1]
+
+def leggi_jsonl(path, categoria):
+    # Una riga per frase: "testo" oppure {"categoria": ..., "frase": ...}
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for n, riga in enumerate(f, 1):
+            if not riga.strip(): continue
+            d = json.loads(riga)
+            if isinstance(d, str): yield f"riga {n}", categoria, d
+            else: yield f"riga {n}", d.get("categoria", categoria), d.get("frase", "")
+
+def leggi_json(path, categoria, pezzo=1 << 16):
+    # Parser incrementale per {categoria: [frasi]} (il formato di esporta_json) o per una lista di frasi:
+    # solo le stringhe vengono decodificate, il resto della struttura è tracciato con una pila.
+    pila = []; buf = ""; pos = 0; n = 0; finito = False
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,:": pos += 1
+            if pos >= len(buf):
+                if finito: break
+                buf = f.read(pezzo); pos = 0; finito = not buf; continue
+            ch = buf[pos]
+            if ch in "{[": pila.append(ch); pos += 1
+            elif ch in "}]": pila.pop(); pos += 1
+            elif ch == '"':
+                try: s, fine = json.decoder.scanstring(buf, pos + 1)
+                except json.JSONDecodeError:
+                    # Stringa spezzata tra due letture: si accoda il pezzo successivo e si riprova
+                    altro = f.read(pezzo)
+                    if not altro: raise
+                    buf = buf[pos:] + altro; pos = 0; continue
+                pos = fine
+                if pila and pila[-1] == "{" and len(pila) == 1: categoria = s
+                elif pila and pila[-1] == "[": n += 1; yield f"elemento {n}", categoria, s
+                else: raise ValueError(f"{path}: struttura JSON non supportata")
+            else: raise ValueError(f"{path}: valore non testuale alla posizione {pos} del blocco")
+            if pos > pezzo: buf = buf[pos:]; pos = 0
+
+LETTORI = {"txt": leggi_txt, "csv": leggi_csv, "tsv": leggi_csv, "json": leggi_json, "jsonl": leggi_jsonl}
+
+def leggi(path, formato=None, categoria=CATEGORIA_DEFAULT):
+    formato = formato or os.path.splitext(path)[1].lstrip(".").lower()
+    if formato not in LETTORI: raise ValueError(f"formato non supportato: {formato} (usa {', '.join(LETTORI)})")
+    return LETTORI[formato](path, categoria)
+
+# --- PIPELINE ---
+def a_blocchi(righe, dimensione):
+    blocco = []
+    for r in righe:
+        blocco.append(r)
+        if len(blocco) >= dimensione: yield blocco; blocco = []
+    if blocco: yield blocco
+
+def in_parallelo(blocchi, processi):
+    # Al massimo due blocchi per processo in volo: la memoria resta limitata qualunque sia la dimensione del file
+    if processi == 0: yield from map(valuta_blocco, blocchi); return
+    with ProcessPoolExecutor(max_workers=processi) as pool:
+        in_volo = deque(); limite = 2 * (processi or os.cpu_count() or 1)
+        for b in blocchi:
+            in_volo.append(pool.submit(valuta_blocco, b))
+            if len(in_volo) >= limite: yield in_volo.popleft().result()
+        while in_volo: yield in_volo.popleft().result()
+
+class RapportoImport:
+    def __init__(self, path_csv=None):
+        self.conteggi = Counter(); self.esempi = {}; self.lette = 0
+        self.file = open(path_csv, 'w', encoding='utf-8', newline='') if path_csv else None
+        self.scrittore = csv.writer(self.file) if self.file else None
+        if self.scrittore: self.scrittore.writerow(["riferimento", "esito", "categoria", "frase", "dettaglio"])
+
+    def registra(self, rif, esito, categoria, testo, dettaglio=""):
+        self.conteggi[esito] += 1
+        if esito != IMPORTATA:
+            esempi = self.esempi.setdefault(esito, [])
+            if len(esempi) < ESEMPI_PER_ESITO: esempi.append((rif, testo, dettaglio))
+        if self.scrittore: self.scrittore.writerow([rif, esito, categoria, testo, dettaglio])
+
+    def chiudi(self):
+        if self.file: self.file.close()
+
+    def come_dict(self):
+        return {"lette": self.lette, "esiti": dict(self.conteggi), "esempi": self.esempi}
+
+    def stampa(self, secondi=None):
+        durata = f" in {secondi:.1f} s ({self.lette / max(secondi, 1e-9):,.0f} frasi/s)" if secondi else ""
+        print(f"{self.lette:,} frasi lette{durata}")
+        for esito in (IMPORTATA, SEGNALATA, DUPLICATA, NON_ENTRA, CARATTERI, VUOTA):
+            if self.conteggi[esito]: print(f"  {esito:<10}{self.conteggi[esito]:>10,}")
+        for esito, esempi in self.esempi.items():
+            print(f"\n{esito}:")
+            for rif, testo, dettaglio in esempi: print(f"  {rif}: {testo}" + (f"  [{dettaglio}]" if dettaglio else ""))
+
+def importa_file(store, path, formato=None, categoria=CATEGORIA_DEFAULT, processi=None, non_entra="scarta",
+                 prova=False, rapporto=None, blocco=2000, avanzamento=None):
+    # non_entra: "scarta" le frasi troppo lunghe per il tabellone oppure le importa e le "segnala"
+    rapporto = rapporto or RapportoImport(); in_attesa = {}
+
+    def accettate():
+        for b in in_parallelo(a_blocchi(leggi(path, formato, categoria), blocco), processi):
+            for rif, cat, testo, esito, dettaglio in b:
+                rapporto.lette += 1
+                if esito == NON_ENTRA and non_entra == "segnala": esito = SEGNALATA
+                if esito in (IMPORTATA, SEGNALATA): in_attesa[rif] = (esito, cat, testo, dettaglio); yield cat, testo, rif
+                else: rapporto.registra(rif, esito, cat, testo, dettaglio)
+            if avanzamento: avanzamento(rapporto.lette)
+
+    def esito_inserimento(rif, inserita):
+        esito, cat, testo, dettaglio = in_attesa.pop(rif)
+        rapporto.registra(rif, esito if inserita else DUPLICATA, cat, testo, dettaglio)
+
+    store.importa_righe(accettate(), esito_inserimento, prova=prova)
+    return rapporto
+
+def frasi_fuori_misura(store):
+    # Frasi già in archivio che il tabellone taglierebbe: (id, categoria, testo, parole escluse)
+    for frase_id, categoria, testo in store.righe():
+        escluse = disponi_frase(normalizza(testo))[1]
+        if escluse: yield frase_id, categoria, testo, " ".join(escluse)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Importazione massiva di frasi per Gira la Ruota")
+    ap.add_argument("database")
+    ap.add_argument("file", nargs="?")
+    ap.add_argument("--formato", choices=sorted(LETTORI), help="di default dall'estensione del file")
+    ap.add_argument("--categoria", default=CATEGORIA_DEFAULT, help="per le righe senza categoria")
+    ap.add_argument("--processi", type=int, default=None, help="0 = nessun pool, tutto nel processo principale")
+    ap.add_argument("--non-entra", choices=["scarta", "segnala"], default="scarta")
+    ap.add_argument("--prova", action="store_true", help="valuta e riporta senza scrivere nell'archivio")
+    ap.add_argument("--rapporto", help="file CSV con l'esito di ogni riga")
+    ap.add_argument("--json", action="store_true", help="stampa il riepilogo in JSON")
+    ap.add_argument("--verifica", action="store_true", help="elenca le frasi dell'archivio che non entrano nel tabellone")
+    a = ap.parse_args(argv)
+    from archivio_frasi import PhraseStore
+    with PhraseStore(a.database) as store:
+        if a.verifica:
+            n = 0
+            for frase_id, categoria, testo, escluse in frasi_fuori_misura(store): n += 1; print(f"{frase_id}\t{categoria}\t{testo}\t[{escluse}]")
+            print(f"{n} frasi non entrano nel tabellone", file=sys.stderr); return 1 if n else 0
+        if not a.file: ap.error("indicare il file da importare")
+        rapporto = RapportoImport(a.rapporto); t = time.perf_counter()
+        soglia = [100_000]
+        def avanzamento(n):
+            if n >= soglia[0] and not a.json: print(f"  {n:,} frasi...", file=sys.stderr); soglia[0] += 100_000
+        try: importa_file(store, a.file, a.formato, a.categoria.upper(), a.processi, a.non_entra, a.prova, rapporto, avanzamento=avanzamento)
+        finally: rapporto.chiudi()
+        if a.json: print(json.dumps(rapporto.come_dict(), indent=2, ensure_ascii=False))
+        else: rapporto.stampa(time.perf_counter() - t)
+        if a.prova and not a.json: print("\n(prova: nessuna modifica all'archivio)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
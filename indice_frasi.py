@@ -0,0 +1,176 @@
+from array import array
+from griglia import disponi_frase, forma_celle, normalizza
+
+# --- INDICE DELLE FRASI PER LA CPU ---
+# Le frasi sono divise in secchi per (categoria, forma), dove la forma è la sequenza delle lunghezze
+# delle parole sul tabellone. In ogni secchio, per ogni (lettera, posizione) c'è un bitset (un int
+# Python) delle frasi che hanno quella lettera in quella posizione: eliminare i candidati
+# incompatibili con il tabellone è una serie di AND su interi, non una scansione del database.
+
+BLOCCO_COSTRUZIONE = 250   # frasi per passo di costruisci_a_passi (circa 10 ms)
+
+class _Secchio:
+    __slots__ = ("testi", "ids", "vivi", "pos", "contiene", "liberi")
+
+    def __init__(self):
+        self.testi = []; self.ids = []; self.vivi = 0
+        self.pos = {}        # (lettera, posizione) -> bitset
+        self.contiene = {}   # lettera -> bitset delle frasi che la contengono
+        self.liberi = []     # slot riutilizzabili dopo una rimozione
+
+    def aggiungi(self, frase_id, testo, celle):
+        slot = self.liberi.pop() if self.liberi else len(self.testi)
+        if slot == len(self.testi): self.testi.append(testo); self.ids.append(frase_id)
+        else: self.testi[slot] = testo; self.ids[slot] = frase_id
+        bit = 1 << slot
+        for p, (_, _, ch) in enumerate(celle):
+            self.pos[(ch, p)] = self.pos.get((ch, p), 0) | bit
+            self.contiene[ch] = self.contiene.get(ch, 0) | bit
+        self.vivi |= bit
+        return slot
+
+    def rimuovi(self, slot):
+        bit = 1 << slot; maschera = ~bit
+        for k, v in self.pos.items():
+            if v & bit: self.pos[k] = v & maschera
+        for k, v in self.contiene.items():
+            if v & bit: self.contiene[k] = v & maschera
+        self.vivi &= maschera; self.testi[slot] = None; self.ids[slot] = None
+        self.liberi.append(slot)
+
+def _costruisci_bitset(slots, n):
+    # Costruzione in blocco: O(n) per chiave invece di un OR su interi sempre più grandi
+    b = bytearray((n + 7) // 8)
+    for s in slots: b[s >> 3] |= 1 << (s & 7)
+    return int.from_bytes(b, "little")
+
+def bit_attivi(x):
+    while x:
+        basso = x & -x
+        yield basso.bit_length() - 1
+        x ^= basso
+
+class IndiceFrasi:
+    def __init__(self):
+        self.secchi = {}     # (categoria, forma) -> _Secchio
+        self.posizione = {}  # frase_id -> (chiave secchio, slot)
+        self.sospesi = None  # modifiche dell'archivio arrivate durante una costruzione a passi
+        self.ricostruisci = None
+
+    # --- COSTRUZIONE ---
+    def costruisci(self, righe):
+        # righe: (id, categoria, testo), es. PhraseStore.righe()
+        for _ in self.costruisci_a_passi(righe): pass
+        return self
+
+    def costruisci_a_passi(self, righe, blocco=BLOCCO_COSTRUZIONE):
+        # Generatore: si ferma ogni `blocco` frasi elaborate, così la costruzione si alterna all'event loop.
+        # L'indice resta quello precedente finché la costruzione non è completa; le modifiche arrivate
+        # nel frattempo vengono riapplicate dopo lo scambio (aggiornamenti idempotenti: anche se la
+        # pagina che le contiene è stata letta dopo la modifica il risultato non cambia).
+        self.sospesi = []; secchi = {}; posizione = {}
+        raccolta = {}; fatte = 0
+        for frase_id, categoria, testo in righe:
+            # Stessa forma della soluzione in Partita: tabellone e candidati coincidono anche con accenti e apostrofi
+            testo = normalizza(testo); celle = disponi_frase(testo)[0]
+            chiave = (categoria, forma_celle(celle))
+            testi, ids, chiavi = raccolta.setdefault(chiave, ([], [], {}))
+            slot = len(testi); testi.append(testo); ids.append(frase_id)
+            for p, (_, _, ch) in enumerate(celle):
+                # array invece di liste: un milione di liste piccole terrebbe impegnato il garbage collector
+                slots = chiavi.get((ch, p))
+                if slots is None: chiavi[(ch, p)] = array("l", (slot,))
+                else: slots.append(slot)
+            posizione[frase_id] = (chiave, slot)
+            fatte += 1
+            if fatte % blocco == 0: yield
+        # Bitset: il lavoro si misura in celle (circa una ventina per frase), anche dentro un secchio grande
+        lavoro = 0; soglia = blocco * 20
+        for chiave, (testi, ids, chiavi) in raccolta.items():
+            s = _Secchio(); n = len(testi)
+            s.testi, s.ids = testi, ids
+            s.vivi = (1 << n) - 1
+            per_lettera = {}
+            for (ch, p), slots in chiavi.items():
+                s.pos[(ch, p)] = _costruisci_bitset(slots, n)
+                per_lettera.setdefault(ch, []).append(s.pos[(ch, p)])
+                lavoro += len(slots) + n // 64
+                if lavoro >= soglia: lavoro = 0; yield
+            for ch, bitsets in per_lettera.items():
+                tot = 0
+                for b in bitsets: tot |= b
+                s.contiene[ch] = tot
+                lavoro += len(bitsets) * (n // 64 + 1)
+                if lavoro >= soglia: lavoro = 0; yield
+            secchi[chiave] = s
+        self.secchi, self.posizione = secchi, posizione
+        sospesi, self.sospesi = self.sospesi, None
+        for evento in sospesi: self.evento_archivio(*evento)
+
+    def collega(self, store, ricostruisci=None):
+        # Da qui in poi l'indice segue le modifiche dell'archivio tramite gli osservatori. Dopo una
+        # "ricarica" chiama ricostruisci() (chi possiede l'indice lo rifà a passi), altrimenti si
+        # ricostruisce subito. Collegato prima della costruzione, così nessuna modifica va persa.
+        self.ricostruisci = ricostruisci or (lambda: self.costruisci(store.righe()))
+        store.osservatori.append(self.evento_archivio)
+        return self
+
+    # --- AGGIORNAMENTO INCREMENTALE ---
+    def aggiungi(self, frase_id, categoria, testo):
+        testo = normalizza(testo); celle = disponi_frase(testo)[0]
+        chiave = (categoria, forma_celle(celle))
+        slot = self.secchi.setdefault(chiave, _Secchio()).aggiungi(frase_id, testo, celle)
+        self.posizione[frase_id] = (chiave, slot)
+
+    def rimuovi(self, frase_id):
+        dove = self.posizione.pop(frase_id, None)
+        if dove: self.secchi[dove[0]].rimuovi(dove[1])
+
+    def evento_archivio(self, evento, frase_id, categoria, testo):
+        if evento == "ricarica": self.ricostruisci()
+        elif self.sospesi is not None: self.sospesi.append((evento, frase_id, categoria, testo))
+        elif evento == "rimossa": self.rimuovi(frase_id)
+        else: self.rimuovi(frase_id); self.aggiungi(frase_id, categoria, testo)
+
+    # --- INTERROGAZIONE ---
+    def candidati(self, categoria, vista, escluse=()):
+        # vista: [(riga, colonna, carattere o None)] come griglia.vista_tabellone -> (secchio, bitset)
+        s = self.secchi.get((categoria, forma_celle(vista)))
+        if s is None: return None, 0
+        cand = s.vivi; rivelate = set(); coperte = []
+        for p, (_, _, ch) in enumerate(vista):
+            if ch is None: coperte.append(p); continue
+            cand &= s.pos.get((ch, p), 0)
+            if ch.isalpha(): rivelate.add(ch)
+            if not cand: return s, 0
+        # Una lettera già chiamata non può nascondersi in una cella coperta
+        for ch in rivelate:
+            for p in coperte:
+                b = s.pos.get((ch, p))
+                if b: cand &= ~b
+        for ch in escluse:
+            b = s.contiene.get(ch)
+            if b: cand &= ~b
+        return s, cand
+
+    def frasi_candidate(self, categoria, vista, escluse=(), limite=None):
+        s, cand = self.candidati(categoria, vista, escluse)
+        frasi = []
+        for slot in bit_attivi(cand):
+            frasi.append(s.testi[slot])
+            if limite and len(frasi) >= limite: break
+        return frasi
+
+    def statistiche_lettere(self, categoria, vista, lettere, escluse=()):
+        # Per ogni lettera: (probabilità che compaia, occorrenze attese nelle celle coperte, n candidati)
+        s, cand = self.candidati(categoria, vista, escluse)
+        n = cand.bit_count() if cand else 0
+        if not n: return {}, 0
+        coperte = [p for p, (_, _, ch) in enumerate(vista) if ch is None]
+        stat = {}
+        for let in lettere:
+            presenza = (s.contiene.get(let, 0) & cand).bit_count()
+            if not presenza: stat[let] = (0.0, 0.0); continue
+            occorrenze = sum((s.pos.get((let, p), 0) & cand).bit_count() for p in coperte)
+            stat[let] = (presenza / n, occorrenze / n)
+        return stat, n
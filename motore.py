@@ -0,0 +1,99 @@
+from griglia import normalizza
+
+# --- MOTORE DELLE REGOLE (senza Qt) ---
+# Tutte le regole che prima vivevano dentro GiraLaRuota: rotazione dei turni, portafogli di round
+# e totali, JOLLY che protegge da BANCAROTTA/PASSA, vocale a 500€, pagamento per lettera.
+# Lo stato è un oggetto con __slots__ e tipi semplici, così il simulatore può giocarne milioni.
+
+PREMI_BASE = [100, 300, 500, 1000, "BANCAROTTA", "PASSA", 200, 400, 800, 150, 250, 600]
+JOLLY_PER_ROUND = 2
+PREZZO_VOCALE = 500
+VALORE_JOLLY = 500        # valore della lettera chiamata dopo aver pescato il JOLLY
+SOSTITUTO_JOLLY = 200     # lo spicchio JOLLY pescato diventa 200
+NUM_GIOCATORI = 3
+
+# Esiti di applica_spicchio
+PROTETTO, BANCAROTTA, PASSA, JOLLY, PREMIO = "PROTETTO", "BANCAROTTA", "PASSA", "JOLLY", "PREMIO"
+
+class Partita:
+    __slots__ = ("premi_base", "giocatori", "premi", "soluzione", "lettere", "turno", "round_corrente",
+                 "portafogli", "totali", "jolly", "valore", "jolly_pescati", "risolto", "lettere_errate")
+
+    def __init__(self, premi_base=PREMI_BASE, giocatori=NUM_GIOCATORI):
+        self.premi_base = list(premi_base); self.giocatori = giocatori
+        self.soluzione = ""; self.premi = []
+        self.nuova_partita()
+
+    def nuova_partita(self):
+        n = self.giocatori
+        self.turno = 0; self.round_corrente = 1
+        self.portafogli = [0] * n; self.totali = [0] * n; self.jolly = [False] * n
+        self.lettere = set(); self.lettere_errate = set(); self.valore = 0; self.jolly_pescati = 0; self.risolto = False
+
+    def nuovo_round(self, soluzione):
+        # Nella forma del tabellone (CITTÀ -> CITTA', apostrofi e spazi uniformati): lettere e tentativi si confrontano con questa
+        self.soluzione = normalizza(soluzione)
+        self.premi = self.premi_base + ["JOLLY"] * JOLLY_PER_ROUND
+        self.lettere = set(); self.lettere_errate = set(); self.portafogli = [0] * self.giocatori
+        self.valore = 0; self.jolly_pescati = 0; self.risolto = False
+
+    def prossimo_round(self):
+        self.round_corrente += 1
+
+    def passa_turno(self):
+        self.turno = (self.turno + 1) % self.giocatori
+
+    # --- RUOTA ---
+    def gira(self, rng):
+        # Spicchio uniforme, come la ruota disegnata
+        indice = rng.randrange(len(self.premi))
+        return indice, self.applica_spicchio(indice)
+
+    def applica_spicchio(self, indice):
+        res = self.premi[indice]; t = self.turno
+        if res in ("BANCAROTTA", "PASSA"):
+            # Il JOLLY si consuma e il giocatore gira di nuovo
+            if self.jolly[t]: self.jolly[t] = False; return PROTETTO
+            if res == "BANCAROTTA": self.portafogli[t] = 0
+            self.passa_turno(); return BANCAROTTA if res == "BANCAROTTA" else PASSA
+        if res == "JOLLY":
+            self.jolly[t] = True; self.jolly_pescati += 1
+            self.premi[indice] = SOSTITUTO_JOLLY; self.valore = VALORE_JOLLY
+            return JOLLY
+        self.valore = res
+        return PREMIO
+
+    # --- LETTERE E SOLUZIONE ---
+    def chiama_lettera(self, lettera, vocale=False):
+        # -> occorrenze scoperte; 0 significa lettera sbagliata/già chiamata e turno perso
+        let = (lettera or "").upper().strip()
+        if len(let) != 1 or not let.isalpha() or let in self.lettere or let not in self.soluzione:
+            if len(let) == 1 and let.isalpha() and let not in self.soluzione: self.lettere_errate.add(let)
+            self.passa_turno(); return 0
+        cnt = self.soluzione.count(let); self.lettere.add(let)
+        if not vocale: self.portafogli[self.turno] += cnt * self.valore
+        return cnt
+
+    def puo_comprare_vocale(self):
+        return self.portafogli[self.turno] >= PREZZO_VOCALE
+
+    def compra_vocale(self):
+        if not self.puo_comprare_vocale(): return False
+        self.portafogli[self.turno] -= PREZZO_VOCALE
+        return True
+
+    def risolvi(self, tentativo):
+        if normalizza(tentativo or "") == self.soluzione:
+            self.totali[self.turno] += self.portafogli[self.turno]; self.risolto = True
+            return True
+        self.passa_turno()
+        return False
+
+    # --- UTILITÀ PER STRATEGIE E SIMULATORE ---
+    def lettere_mancanti(self):
+        return {c for c in self.soluzione if c.isalpha()} - self.lettere
+
+    def frazione_scoperta(self):
+        tot = sum(1 for c in self.soluzione if c.isalpha())
+        if not tot: return 1.0
+        return sum(1 for c in self.soluzione if c in self.lettere) / tot
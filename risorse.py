@@ -0,0 +1,137 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import wave
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImage, QPixmap
+from avvio import logger
+
+# --- PACCHETTO DELLE RISORSE ---
+# In fase di build (python risorse.py) immagini e suoni finiscono in un unico file:
+#   - le immagini già scalate per le risoluzioni più comuni, in pixel ARGB32 premoltiplicati pronti per Qt
+#   - l'audio già decodificato in PCM, senza intestazione WAV
+#   - un indice JSON in coda con posizione e formato di ogni blocco
+# A runtime il file viene mappato in memoria: QImage e buffer PCM puntano direttamente alle pagine
+# del file, senza decodifiche, copie o ridimensionamenti. Senza pacchetto il gioco usa i file sciolti.
+
+NOME_PACCHETTO = "risorse.pack"
+MAGICO = b"GLRPACK1"
+INTESTAZIONE = struct.Struct("<8sQQ")      # magico, posizione dell'indice, lunghezza dell'indice
+ALLINEAMENTO = 64                          # ogni blocco parte allineato: righe di pixel e campioni restano allineati
+RISOLUZIONI = [(1366, 768), (1920, 1080), (2560, 1440)]
+IMMAGINI = ["images/logo.png"]             # solo quelle che il gioco mostra davvero
+SUONI = ["sound/sigla.wav", "sound/spin.wav", "sound/bad.wav", "sound/correct.wav", "sound/victory.wav"]
+VARIANTI_IN_CACHE = 4
+FORMATO_IMMAGINI = QImage.Format_ARGB32_Premultiplied
+
+# --- COSTRUZIONE (in fase di build) ---
+def _scrivi_blocco(f, dati):
+    f.write(b"\0" * (-f.tell() % ALLINEAMENTO))
+    pos = f.tell(); f.write(dati)
+    return pos, len(dati)
+
+def impacchetta(radice, destinazione, risoluzioni=RISOLUZIONI, immagini=IMMAGINI, suoni=SUONI):
+    indice = {"immagini": {}, "audio": {}}
+    temporaneo = destinazione + ".tmp"
+    with open(temporaneo, "wb") as f:
+        f.write(INTESTAZIONE.pack(MAGICO, 0, 0))
+        for nome in immagini:
+            origine = QImage(os.path.join(radice, nome))
+            if origine.isNull(): logger.warning("risorse: immagine mancante o illeggibile: %s", nome); continue
+            origine = origine.convertToFormat(FORMATO_IMMAGINI); varianti = []
+            for w, h in risoluzioni:
+                img = origine.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pos, lung = _scrivi_blocco(f, img.constBits().asstring(img.sizeInBytes()))
+                varianti.append({"schermo": [w, h], "w": img.width(), "h": img.height(), "bpl": img.bytesPerLine(), "pos": pos, "lung": lung})
+            indice["immagini"][nome] = varianti
+        for nome in suoni:
+            path = os.path.join(radice, nome)
+            if not os.path.exists(path): logger.warning("risorse: suono mancante: %s", nome); continue
+            with wave.open(path, "rb") as w:
+                formato = {"canali": w.getnchannels(), "bit": w.getsampwidth() * 8, "frequenza": w.getframerate()}
+                pos, lung = _scrivi_blocco(f, w.readframes(w.getnframes()))
+            indice["audio"][nome] = {**formato, "pos": pos, "lung": lung}
+        dati_indice = json.dumps(indice, separators=(",", ":")).encode()
+        pos, lung = _scrivi_blocco(f, dati_indice)
+        f.seek(0); f.write(INTESTAZIONE.pack(MAGICO, pos, lung))
+    os.replace(temporaneo, destinazione)
+    return indice
+
+# --- LETTURA (a runtime) ---
+class PacchettoRisorse:
+    def __init__(self, path, varianti_in_cache=VARIANTI_IN_CACHE):
+        self.path = path
+        with open(path, "rb") as f: self.mappa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.dati = memoryview(self.mappa); self.cache = OrderedDict()
+        magico, pos, lung = INTESTAZIONE.unpack_from(self.mappa, 0)
+        if magico != MAGICO: self.chiudi(); raise ValueError(f"{path}: non è un pacchetto di risorse")
+        self.indice = json.loads(bytes(self.dati[pos:pos + lung]))
+        # LRU delle varianti in uso: (nome, w, h) -> QImage; tenerle vive tiene vivi anche i puntatori al file
+        self.varianti_in_cache = varianti_in_cache
+
+    def contiene(self, nome):
+        return nome in self.indice["immagini"] or nome in self.indice["audio"]
+
+    def immagine(self, nome, schermo):
+        # Immagine adattata (KeepAspectRatio) a uno schermo di dimensione data, senza copie se la variante esiste
+        w, h = (schermo.width(), schermo.height()) if isinstance(schermo, QSize) else schermo
+        chiave = (nome, w, h)
+        if chiave in self.cache: self.cache.move_to_end(chiave); return self.cache[chiave]
+        varianti = self.indice["immagini"][nome]
+        esatta = next((v for v in varianti if v["schermo"] == [w, h]), None)
+        if esatta: img = self._vista(esatta)
+        else:
+            # Schermo non previsto: si parte dalla variante più piccola che lo copre (o dalla più grande)
+            v = min((v for v in varianti if v["schermo"][0] >= w and v["schermo"][1] >= h),
+                    key=lambda v: v["lung"], default=max(varianti, key=lambda v: v["lung"]))
+            img = self._vista(v).scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            logger.info("risorse: nessuna variante %dx%d per %s, scalata da %dx%d", w, h, nome, *v["schermo"])
+        self.cache[chiave] = img
+        if len(self.cache) > self.varianti_in_cache: self.cache.popitem(last=False)
+        return img
+
+    def pixmap(self, nome, schermo):
+        # QPixmap.fromImage copia i pixel una volta (verso la pixmap di piattaforma) ma non li converte né scala
+        return QPixmap.fromImage(self.immagine(nome, schermo))
+
+    def _vista(self, v):
+        return QImage(self.dati[v["pos"]:v["pos"] + v["lung"]], v["w"], v["h"], v["bpl"], FORMATO_IMMAGINI)
+
+    def pcm(self, nome):
+        # Campioni PCM (memoryview sul file mappato) e formato: canali, bit, frequenza
+        a = self.indice["audio"][nome]
+        return self.dati[a["pos"]:a["pos"] + a["lung"]], {k: a[k] for k in ("canali", "bit", "frequenza")}
+
+    def chiudi(self):
+        # Se qualcuno usa ancora un buffer (voce che suona, QImage vivo) la mappa resta finché non lo rilascia
+        self.cache.clear()
+        try: self.dati.release(); self.mappa.close()
+        except BufferError: pass
+
+def apri_pacchetto(path):
+    if not os.path.exists(path): return None
+    try: return PacchettoRisorse(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logger.warning("risorse: pacchetto non utilizzabile (%s), uso i file sciolti", e); return None
+
+# --- RIGA DI COMANDO ---
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pacchetto delle risorse (immagini prescalate e audio PCM) per la build di Gira la Ruota")
+    ap.add_argument("--radice", default=os.path.dirname(os.path.abspath(__file__)))
+    ap.add_argument("--uscita", default=NOME_PACCHETTO)
+    ap.add_argument("--risoluzioni", default=",".join(f"{w}x{h}" for w, h in RISOLUZIONI), help="es. 1920x1080,2560x1440")
+    a = ap.parse_args(argv)
+    risoluzioni = [tuple(int(x) for x in r.lower().split("x")) for r in a.risoluzioni.split(",") if r]
+    indice = impacchetta(a.radice, a.uscita, risoluzioni)
+    for nome, varianti in indice["immagini"].items():
+        print(f"{nome}: " + ", ".join(f"{v['w']}x{v['h']}" for v in varianti))
+    for nome, s in indice["audio"].items():
+        print(f"{nome}: PCM {s['canali']}ch {s['bit']} bit {s['frequenza']} Hz, {s['lung'] / 1024:.0f} KB")
+    print(f"{a.uscita}: {os.path.getsize(a.uscita) / (1024 * 1024):.1f} MB")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import random
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QPointF, QRectF, QSize, QVariantAnimation, QEasingCurve, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QPolygonF
+from avvio import logger
+
+# --- RUOTA DISEGNATA ---
+# Gli spicchi vengono disegnati una volta in una pixmap (rigenerata solo se cambiano i premi o la
+# dimensione); ad ogni frame si ruota soltanto la pixmap. La rotazione segue una decelerazione
+# costante guidata da QVariantAnimation, che avanza al ritmo del refresh del display. L'angolo
+# finale viene deciso alla partenza e il premio si legge da lì: stesso seed, stesso giro.
+
+COLORI_SPICCHI = ["#E53935", "#1E88E5", "#FDD835", "#8E24AA", "#43A047", "#FB8C00"]
+COLORI_SPECIALI = {"BANCAROTTA": ("#000000", "#FFFFFF"), "PASSA": ("#FFFFFF", "#000000"), "JOLLY": ("#00C853", "#000000")}
+
+class Ruota(QWidget):
+    settore_cambiato = pyqtSignal(str)   # premio sotto l'indicatore durante il giro
+    fermata = pyqtSignal(int)            # indice dello spicchio vincente in premi
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.premi = []; self.angolo = 0.0
+        self.cache = None; self.ultimo_settore = None; self.ultimo_seed = None
+        self.animazione = QVariantAnimation(self)
+        self.animazione.setStartValue(0.0); self.animazione.setEndValue(1.0)
+        self.animazione.setEasingCurve(QEasingCurve.Linear)
+        self.animazione.valueChanged.connect(self.avanza)
+        self.animazione.finished.connect(self.fine_giro)
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Expanding)
+        self.setMinimumSize(160, 160)
+
+    def sizeHint(self):
+        return QSize(320, 320)
+
+    def heightForWidth(self, w):
+        return w
+
+    # --- PREMI E CACHE ---
+    def imposta_premi(self, premi):
+        if list(premi) != self.premi:
+            self.premi = list(premi); self.cache = None; self.update()
+
+    def lato(self):
+        return min(self.width(), self.height()) - 20
+
+    def genera_cache(self):
+        lato = self.lato()
+        if lato <= 0 or not self.premi: return
+        pix = QPixmap(lato, lato); pix.fill(Qt.transparent)
+        p = QPainter(pix); p.setRenderHint(QPainter.Antialiasing); p.setRenderHint(QPainter.TextAntialiasing)
+        ampiezza = 360 / len(self.premi); raggio = lato / 2
+        p.translate(raggio, raggio)
+        cerchio = QRectF(-raggio + 2, -raggio + 2, lato - 4, lato - 4)
+        font = QFont("Arial"); font.setBold(True); font.setPixelSize(max(8, int(lato / 22))); p.setFont(font)
+        for i, premio in enumerate(self.premi):
+            sfondo, testo = COLORI_SPECIALI.get(premio, (COLORI_SPICCHI[i % len(COLORI_SPICCHI)], "#000000"))
+            p.setPen(QPen(QColor("gold"), 2)); p.setBrush(QColor(sfondo))
+            # Spicchio i: da i*ampiezza gradi in senso orario partendo dall'alto
+            p.drawPie(cerchio, int((90 - i * ampiezza) * 16), int(-ampiezza * 16))
+            p.save(); p.rotate((i + 0.5) * ampiezza); p.setPen(QColor(testo))
+            p.translate(0, -raggio * 0.58); p.rotate(-90)
+            p.drawText(QRectF(-raggio * 0.4, -raggio * 0.1, raggio * 0.8, raggio * 0.2), Qt.AlignCenter, str(premio))
+            p.restore()
+        p.setPen(QPen(QColor("gold"), 3)); p.setBrush(QColor("#002244"))
+        p.drawEllipse(QPointF(0, 0), raggio * 0.12, raggio * 0.12)
+        p.end()
+        self.cache = pix
+
+    # --- FISICA DEL GIRO ---
+    def indice_sotto_indicatore(self, angolo=None):
+        angolo = self.angolo if angolo is None else angolo
+        return int(((-angolo) % 360) / (360 / len(self.premi))) % len(self.premi)
+
+    def sta_girando(self):
+        return self.animazione.state() == QVariantAnimation.Running
+
+    def gira(self, seed=None):
+        if not self.premi or self.sta_girando(): return
+        self.ultimo_seed = seed if seed is not None else random.getrandbits(32)
+        rng = random.Random(self.ultimo_seed)
+        # Decelerazione costante: distanza d in durata T -> velocità iniziale 2d/T, a = v0/T
+        self.durata = rng.uniform(3.5, 4.5)
+        # L'angolo d'arrivo dipende solo dal seed, non da dove si era fermata la ruota
+        arrivo = rng.uniform(0, 360)
+        distanza = rng.randint(3, 5) * 360 + (arrivo - self.angolo) % 360
+        self.v0 = 2 * distanza / self.durata; self.decelerazione = self.v0 / self.durata
+        self.angolo_partenza = self.angolo
+        self.angolo_finale = self.angolo + distanza
+        logger.info("ruota: seed %d -> %s", self.ultimo_seed, self.premi[self.indice_sotto_indicatore(self.angolo_finale)])
+        self.animazione.setDuration(int(self.durata * 1000)); self.animazione.start()
+
+    def avanza(self, progresso):
+        t = progresso * self.durata
+        self.angolo = self.angolo_partenza + self.v0 * t - 0.5 * self.decelerazione * t * t
+        settore = self.indice_sotto_indicatore()
+        if settore != self.ultimo_settore:
+            self.ultimo_settore = settore; self.settore_cambiato.emit(str(self.premi[settore]))
+        self.update()
+
+    def fine_giro(self):
+        self.angolo = self.angolo_finale % 360; self.update()
+        self.fermata.emit(self.indice_sotto_indicatore())
+
+    # --- EVENTI ---
+    def resizeEvent(self, event):
+        self.cache = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self.cache is None: self.genera_cache()
+        if self.cache is None: return
+        p = QPainter(self); p.setRenderHint(QPainter.SmoothPixmapTransform); p.setRenderHint(QPainter.Antialiasing)
+        cx, cy = self.width() / 2, self.height() / 2
+        p.save(); p.translate(cx, cy); p.rotate(self.angolo)
+        p.drawPixmap(QPointF(-self.cache.width() / 2, -self.cache.height() / 2), self.cache)
+        p.restore()
+        # Indicatore fisso in alto
+        r = self.cache.width() / 2; punta = QPointF(cx, cy - r + 18)
+        p.setPen(QPen(QColor("black"), 2)); p.setBrush(QColor("gold"))
+        p.drawPolygon(QPolygonF([punta, QPointF(cx - 12, cy - r - 8), QPointF(cx + 12, cy - r - 8)]))
@@ -1,34 +1,39 @@
+from avvio import TIMELINE, logger
 import sys
-import json
-import random
 import os
-import shutil
-import requests
+import gc
+import logging
+import time
+import unicodedata
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QPushButton, QGridLayout, QMessageBox,
-                             QInputDialog, QFrame, QProgressBar, QGraphicsOpacityEffect,
-                             QTextEdit, QDialog, QMainWindow)
-from PyQt5.QtCore import Qt, QTimer, QUrl, QPropertyAnimation, QRectF
-from PyQt5.QtGui import QFont, QPixmap, QPainter, QColor
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QMediaPlaylist, QSound
+                             QLabel, QPushButton, QMessageBox,
+                             QInputDialog, QProgressBar, QGraphicsOpacityEffect)
+from PyQt5.QtCore import Qt, QTimer, QUrl, QPropertyAnimation
+from PyQt5.QtGui import QPixmap, QPainter
+from aggiornamenti import UpdateChecker
+from archivio_frasi import PhraseStore, crea_archivio, archivio_vuoto, DATABASE_DEFAULT
+from estrattore_frasi import PhraseSampler
+from tabellone import Tabellone
+from griglia import disponi_frase, vista_tabellone
+from ruota import Ruota
+from motore import Partita, PREMI_BASE, PROTETTO, BANCAROTTA, PASSA, JOLLY
+from cpu import GiocatoreCPU, RISOLVI, VOCALE
+from indice_frasi import IndiceFrasi
+from risorse import apri_pacchetto, NOME_PACCHETTO
+# QtMultimedia e requests vengono importati solo quando servono (avvio più rapido)
+TIMELINE.segna("import")
 
 # --- CONFIGURAZIONE VERSIONING ---
 VERSION_ATTUALE = "1.1.5"
 GITHUB_REPO = "PakyITA/Ruota-Della-Fortuna"
 
-# --- CLASSE SUPPORTO CORIANDOLI ---
-class Coriandolo:
-    def __init__(self, screen_width):
-        self.x = random.randint(0, screen_width)
-        self.y = random.randint(-800, -50)
-        self.color = QColor(random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
-        self.size = random.randint(6, 14)
-        self.speed = random.randint(5, 11)
-        self.swing = random.uniform(-3, 3)
+# --- GIOCATORI CPU ---
+PREFISSO_CPU = "CPU"   # un nome che inizia così fa giocare il computer in quel posto
+RITARDO_CPU = 900     # ms tra una mossa e l'altra, per lasciarla seguire al pubblico
 
-    def caduta(self):
-        self.y += self.speed
-        self.x += self.swing
+# --- INPUT DA TASTIERA NELLA FINESTRA ---
+LETTERA, VOCALE_INPUT, SOLUZIONE = "lettera", "vocale", "soluzione"   # modalità di self.modo_input
+SECONDI_LETTERA = 7
 
 # --- FUNZIONI DI SERVIZIO ---
 def resource_path(relative_path):
@@ -38,68 +43,51 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def check_for_updates():
-    try:
-        url = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            latest_version = data.get("tag_name", "1.0.0").replace("v", "")
-            if latest_version > VERSION_ATTUALE:
-                return latest_version
-    except: pass
-    return None
+def get_data_path(nome_file):
+    home_docs = os.path.expanduser("~/Documents")
+    return os.path.join(home_docs, nome_file)
+
+_RISORSE = False   # aperto alla prima richiesta; None se il pacchetto non c'è
+
+def get_risorse():
+    # Pacchetto creato in fase di build (python risorse.py); senza, immagini e suoni si leggono dai file sciolti
+    global _RISORSE
+    if _RISORSE is False: _RISORSE = apri_pacchetto(resource_path(NOME_PACCHETTO))
+    return _RISORSE
 
 def get_db_path():
-    home_docs = os.path.expanduser("~/Documents")
-    db_path = os.path.join(home_docs, 'frasi_gira_la_ruota.json')
-    if not os.path.exists(db_path):
-        try:
-            base_json = resource_path('frasi.json')
-            if os.path.exists(base_json):
-                shutil.copy(base_json, db_path)
-            else:
-                with open(db_path, 'w', encoding='utf-8') as f:
-                    json.dump({"GENERAL": ["GIRA LA RUOTA"]}, f, indent=4, ensure_ascii=False)
-        except: pass
+    db_path = get_data_path('frasi_gira_la_ruota.sqlite')
+    if archivio_vuoto(db_path):
+        # Migrazione una tantum: il vecchio JSON dell'utente (se c'è) ha la precedenza sulle frasi di base
+        try: crea_archivio(db_path, [get_data_path('frasi_gira_la_ruota.json'), resource_path('frasi.json')])
+        except Exception: logger.exception("archivio frasi: migrazione non riuscita, al prossimo avvio si riprova")
     return db_path
 
-# --- EDITOR DATABASE ---
-class JsonEditorDialog(QDialog):
-    def __init__(self, current_data, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Editor Manuale Database")
-        self.resize(600, 500)
-        layout = QVBoxLayout(self)
-        self.text_edit = QTextEdit()
-        self.text_edit.setPlainText(json.dumps(current_data, indent=4, ensure_ascii=False))
-        self.text_edit.setFont(QFont("Courier", 12))
-        layout.addWidget(self.text_edit)
-        btns = QHBoxLayout()
-        self.btn_save = QPushButton("Salva"); self.btn_cancel = QPushButton("Annulla")
-        self.btn_save.clicked.connect(self.accept); self.btn_cancel.clicked.connect(self.reject)
-        btns.addWidget(self.btn_save); btns.addWidget(self.btn_cancel); layout.addLayout(btns)
-    def get_data(self):
-        try: return json.loads(self.text_edit.toPlainText())
-        except Exception as e: return str(e)
-
-# --- SCHERMATA INTRO ---
 class SplashScreen(QWidget):
     def __init__(self):
         super().__init__()
         self.setStyleSheet("background-color: black;")
-        self.media_player = QMediaPlayer()
+        self.nuova_versione = None
+        self.intro_conclusa = False
+        self.game = None
+        self.gioco_pronto = False
+        self.modalita_benchmark = "--benchmark-avvio" in sys.argv
         self.init_ui()
         self.showFullScreen()
-        self.play_intro_music()
         self.avvia_dissolvenza()
-        self.nuova_versione = check_for_updates()
+        # Musica, controllo versione e costruzione del gioco partono dopo il primo frame
+        QTimer.singleShot(0, self.play_intro_music)
+        if not self.modalita_benchmark: QTimer.singleShot(0, self.avvia_controllo_aggiornamenti)
+        QTimer.singleShot(0, self.prepara_gioco)
 
     def init_ui(self):
         self.layout_centrale = QVBoxLayout(self)
         self.logo_label = QLabel()
-        logo_path = resource_path(os.path.join("images", "logo.png"))
-        if os.path.exists(logo_path):
+        logo_path = resource_path(os.path.join("images", "logo.png")); risorse = get_risorse()
+        if risorse and risorse.contiene("images/logo.png"):
+            # Variante già alla risoluzione dello schermo: niente decodifica PNG né ridimensionamento
+            self.logo_label.setPixmap(risorse.pixmap("images/logo.png", QApplication.primaryScreen().size()))
+        elif os.path.exists(logo_path):
             pix = QPixmap(logo_path)
             self.logo_label.setPixmap(pix.scaled(QApplication.primaryScreen().size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
         else:
@@ -122,6 +110,10 @@ class SplashScreen(QWidget):
         """)
         self.btn_skip.clicked.connect(self.concludi_intro)
 
+    def paintEvent(self, event):
+        TIMELINE.segna("splash_mostrato")
+        super().paintEvent(event)
+
     def resizeEvent(self, event):
         self.btn_skip.move(self.width() - 240, self.height() - 100)
         self.label_v.move(20, self.height() - 30)
@@ -132,21 +124,81 @@ class SplashScreen(QWidget):
         self.anim.setDuration(2000); self.anim.setStartValue(0); self.anim.setEndValue(1); self.anim.start()
 
     def play_intro_music(self):
-        p = resource_path(os.path.join("sound", "sigla.wav"))
+        p = resource_path(os.path.join("sound", "sigla.wav")); risorse = get_risorse()
+        if risorse and risorse.contiene("sound/sigla.wav"):
+            from audio import VocePCM
+            self.media_player = VocePCM(*risorse.pcm("sound/sigla.wav"), parent=self)
+            self.media_player.finita.connect(self.concludi_intro)
+            # Rete di sicurezza se l'uscita audio non notifica mai la fine (dispositivo assente o bloccato)
+            QTimer.singleShot(self.media_player.durata_ms() + 1000, self.concludi_intro)
+            self.media_player.play(); return
+        # Solo senza pacchetto risorse: il media backend si carica unicamente se serve davvero
+        from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+        self.media_player = QMediaPlayer()
         if os.path.exists(p):
             self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(p)))
             self.media_player.play()
             self.media_player.mediaStatusChanged.connect(lambda s: self.concludi_intro() if s == QMediaPlayer.EndOfMedia else None)
         else: QTimer.singleShot(3000, self.concludi_intro)
 
+    def avvia_controllo_aggiornamenti(self):
+        # Il controllo gira in un thread: la sigla e la dissolvenza non attendono mai la rete
+        self.update_checker = UpdateChecker(GITHUB_REPO, VERSION_ATTUALE, get_data_path(".gira_la_ruota_update.json"))
+        self.update_checker.nuova_versione.connect(self.aggiornamento_trovato)
+        QApplication.instance().aboutToQuit.connect(self.update_checker.wait)
+        self.update_checker.start()
+
+    def aggiornamento_trovato(self, versione):
+        self.nuova_versione = versione
+        # Risposta arrivata a intro già conclusa: avvisa sulla finestra di gioco
+        if self.intro_conclusa: self.mostra_aggiornamento(self.game)
+
+    def mostra_aggiornamento(self, parent):
+        QMessageBox.information(parent, "Aggiornamento Disponibile", f"È disponibile una nuova versione: v{self.nuova_versione}")
+
     def keyPressEvent(self, event):
         if event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space): self.concludi_intro()
 
-    def concludi_intro(self):
-        self.media_player.stop()
-        if self.nuova_versione:
-            QMessageBox.information(self, "Aggiornamento Disponibile", f"È disponibile una nuova versione: v{self.nuova_versione}")
+    # --- PREPARAZIONE DEL GIOCO DURANTE LA SIGLA ---
+    def prepara_gioco(self):
+        # Un passo per giro dell'event loop: la dissolvenza resta fluida mentre il gioco si costruisce
+        self.passi_preparazione = iter([self.crea_gioco, self.precarica_audio, self.precarica_effetti])
+        QTimer.singleShot(0, self.passo_preparazione)
+
+    def crea_gioco(self):
         self.game = GiraLaRuota()
+
+    def precarica_audio(self):
+        self.game.init_audio()
+
+    def precarica_effetti(self):
+        self.game.init_effetti()
+
+    def passo_preparazione(self):
+        passo = next(self.passi_preparazione, None)
+        if passo is None: self.preparazione_completata(); return
+        passo(); QTimer.singleShot(0, self.passo_preparazione)
+
+    def completa_preparazione(self):
+        for passo in self.passi_preparazione: passo()
+        self.preparazione_completata()
+
+    def preparazione_completata(self):
+        # Può arrivare due volte: da un passo già in coda e da completa_preparazione a fine sigla
+        if self.gioco_pronto: return
+        self.gioco_pronto = True
+        TIMELINE.segna("gioco_pronto")
+        logger.info("avvio completato: %s", TIMELINE.come_json())
+        if self.modalita_benchmark:
+            print(TIMELINE.come_json(), flush=True); QApplication.instance().quit()
+
+    def concludi_intro(self):
+        if self.intro_conclusa: return
+        self.intro_conclusa = True
+        if hasattr(self, "media_player"): self.media_player.stop()
+        if self.nuova_versione: self.mostra_aggiornamento(self)
+        if not hasattr(self, "passi_preparazione"): self.prepara_gioco()
+        self.completa_preparazione()
         self.game.avvia_configurazione()
         self.close()
 
@@ -156,42 +208,78 @@ class GiraLaRuota(QWidget):
         super().__init__()
         self.db_path = get_db_path()
         self.carica_database()
-        self.turno_attuale = 0
-        self.round_corrente = 1
-        self.portafogli_round = [0, 0, 0]
-        self.montepremi_totale = [0, 0, 0]
-        self.ha_jolly = [False, False, False]
-        self.lettere_indovinate = set()
+        self.estrattore = PhraseSampler(self.database, get_data_path(".gira_la_ruota_storico.json"))
         self.is_muted = False
-        self.coriandoli = []
-
-        self.premi_base = [100, 300, 500, 1000, "BANCAROTTA", "PASSA", 200, 400, 800, 150, 250, 600]
-        self.premi_correnti = []
-        self.jolly_pescati_nel_round = 0
-
-        self.timer_gioco = QTimer(); self.timer_gioco.timeout.connect(self.aggiorna_timer)
-        self.timer_coriandoli = QTimer(); self.timer_coriandoli.timeout.connect(self.aggiorna_animazione_coriandoli)
+        self.coriandoli = None; self.costo_frame_coriandoli = 0.0
+
+        # Regole e stato della partita (turni, portafogli, JOLLY, lettere) vivono nel motore senza Qt
+        self.premi_base = list(PREMI_BASE)
+        self.motore = Partita(self.premi_base)
+        self.seed_ruota = None  # impostare un intero per riprodurre esattamente il prossimo giro
+        self.cpu = {}; self.indice = None; self.tentativo_cpu = None  # posto -> GiocatoreCPU
+        self.costruzione_indice = None; self.timer_indice = QTimer(self); self.timer_indice.timeout.connect(self.passo_indice)
+        self.indice_congelato = False
+        # Un solo timer per la prossima azione della CPU: riprogrammarla sostituisce quella in attesa
+        self.azione_cpu = None; self.timer_cpu = QTimer(self); self.timer_cpu.setSingleShot(True); self.timer_cpu.timeout.connect(self.esegui_azione_cpu)
+
+        # Lettere e soluzioni si digitano direttamente nella finestra (keyPressEvent), senza dialoghi
+        self.modo_input = None; self.testo_soluzione = ""; self.scadenza = None
+        self.timer_gioco = QTimer(); self.timer_gioco.setTimerType(Qt.PreciseTimer); self.timer_gioco.timeout.connect(self.aggiorna_timer)
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.timer_coriandoli = QTimer(); self.timer_coriandoli.setTimerType(Qt.PreciseTimer); self.timer_coriandoli.timeout.connect(self.aggiorna_animazione_coriandoli)
+
+        # L'audio viene preparato a parte (init_audio) mentre la sigla è ancora in corso
+        self.suoni = None; self.bg_player = None
+        self.init_ui()
 
-        self.init_audio(); self.init_ui()
+        # Schermi del pubblico (opzionale): --spettatori oppure --spettatori=host:porta
+        self.cronista = None; self.server_spettatori = None
+        opzione = next((a for a in sys.argv if a.split("=")[0] == "--spettatori"), None)
+        if opzione is not None: self.avvia_spettatori(opzione.partition("=")[2])
+
+        # Overlay delle prestazioni (--overlay): richiede l'applicazione tracciata, vedi traccia.py
+        traccia = getattr(QApplication.instance(), "traccia", None)
+        if traccia is not None and "--overlay" in sys.argv:
+            from traccia import OverlayPrestazioni
+            self.overlay = OverlayPrestazioni(traccia, self)
+
+    def avvia_spettatori(self, indirizzo=""):
+        from spettatori import ServerSpettatori, Cronista, PORTA_DEFAULT
+        host, _, porta = indirizzo.rpartition(":") if ":" in indirizzo else ("", "", indirizzo)
+        self.server_spettatori = ServerSpettatori(host or "0.0.0.0", int(porta or PORTA_DEFAULT)).avvia()
+        self.cronista = Cronista(self.server_spettatori.pubblica)
+
+    def closeEvent(self, event):
+        if self.server_spettatori: self.server_spettatori.ferma()
+        if self.costruzione_indice is not None: self.ferma_indice()
+        self.estrattore.chiudi()
+        super().closeEvent(event)
 
     def carica_database(self):
-        try:
-            with open(self.db_path, 'r', encoding='utf-8') as f: self.database = json.load(f)
-        except: self.database = {"GENERAL": ["GIRA LA RUOTA"]}
-
-    def salva_database(self):
-        try:
-            with open(self.db_path, 'w', encoding='utf-8') as f: json.dump(self.database, f, indent=4, ensure_ascii=False)
-        except Exception as e: QMessageBox.critical(self, "Errore", f"Salvataggio fallito: {e}")
+        # Un archivio esistente si apre sempre, anche vuoto (riceve le frasi di base), così le modifiche
+        # restano salvate. Solo se manca o non si apre si gioca in memoria, senza creare un file vuoto
+        # che farebbe saltare la migrazione ai prossimi avvii.
+        self.archivio_in_memoria = False
+        if os.path.exists(self.db_path):
+            try:
+                store = PhraseStore(self.db_path)
+                if store.vuoto(): store.importa_dict(DATABASE_DEFAULT)
+                self.database = store; return
+            except Exception: logger.exception("archivio frasi: %s non apribile", self.db_path)
+        logger.warning("archivio frasi: uso le frasi di base in memoria, le modifiche non verranno salvate")
+        self.database = PhraseStore(":memory:"); self.database.importa_dict(DATABASE_DEFAULT)
+        self.archivio_in_memoria = True
 
     def init_audio(self):
-        self.suoni = {}
-        suoni_files = {"spin": "spin.wav", "bad": "bad.wav", "correct": "correct.wav", "vittoria": "vittoria.wav", "victory": "victory.wav"}
+        if self.bg_player is not None: return
+        from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QMediaPlaylist
+        from audio import SoundEngine
+        self.suoni = SoundEngine(voci=3, parent=self); self.suoni.set_muted(self.is_muted)
+        suoni_files = {"spin": "spin.wav", "bad": "bad.wav", "correct": "correct.wav", "victory": "victory.wav"}
+        risorse = get_risorse()
         for k, v in suoni_files.items():
-            path = resource_path(os.path.join("sound", v))
-            p = QMediaPlayer()
-            p.setMedia(QMediaContent(QUrl.fromLocalFile(path)))
-            self.suoni[k] = p
+            if risorse and risorse.contiene("sound/" + v): self.suoni.carica_pcm(k, *risorse.pcm("sound/" + v))
+            else: self.suoni.carica(k, resource_path(os.path.join("sound", v)))
 
         self.bg_player = QMediaPlayer()
         bg_file = resource_path(os.path.join("sound", "background.wav"))
@@ -200,13 +288,16 @@ class GiraLaRuota(QWidget):
             self.playlist.setPlaybackMode(QMediaPlaylist.Loop); self.bg_player.setPlaylist(self.playlist); self.bg_player.setVolume(20)
 
     def play_sound(self, n):
-        if n in self.suoni and not self.is_muted:
-            self.suoni[n].stop(); self.suoni[n].play()
+        if self.suoni is not None and not self.is_muted: self.suoni.play(n)
+
+    def stop_sound(self, n):
+        if self.suoni is not None: self.suoni.stop(n)
 
     def toggle_mute(self):
         self.is_muted = not self.is_muted
+        self.init_audio()
         self.bg_player.setMuted(self.is_muted)
-        for s in self.suoni.values(): s.setMuted(self.is_muted)
+        self.suoni.set_muted(self.is_muted)
         self.btn_mute.setText("🔇" if self.is_muted else "🔊")
 
     def init_ui(self):
@@ -223,22 +314,17 @@ class GiraLaRuota(QWidget):
         self.btn_exit.setStyleSheet("background-color: #900; color: white; border: 2px solid white; border-radius: 27px; font-size: 20px;")
         self.btn_set.clicked.connect(self.menu_impostazioni); self.btn_next_phrase.clicked.connect(self.skip_phrase)
         self.btn_mute.clicked.connect(self.toggle_mute); self.btn_exit.clicked.connect(self.close)
-        self.btn_cheat.clicked.connect(lambda: QMessageBox.information(self, "Soluzione", f"Soluzione: {self.soluzione}"))
+        self.btn_cheat.clicked.connect(lambda: QMessageBox.information(self, "Soluzione", f"Soluzione: {self.motore.soluzione}"))
 
         top.addWidget(self.btn_set); top.addWidget(self.btn_next_phrase); top.addWidget(self.btn_mute); top.addStretch(); top.addWidget(self.btn_cheat); top.addSpacing(10); top.addWidget(self.btn_exit); layout.addLayout(top)
 
         self.label_info = QLabel(""); self.label_info.setStyleSheet("color: #00FFFF; font-size: 18px; font-weight: bold;"); self.label_info.setAlignment(Qt.AlignCenter); layout.addWidget(self.label_info)
         self.label_cat = QLabel(""); self.label_cat.setAlignment(Qt.AlignCenter); self.label_cat.setStyleSheet("font-size: 24px; color: #FFD700; font-weight: bold; background: rgba(0,0,0,120); border-radius: 10px; padding: 5px;"); layout.addWidget(self.label_cat)
 
-        self.grid_container = QFrame(); self.grid_layout = QGridLayout(self.grid_container); self.celle = []
-        for r in range(4):
-            riga = []
-            for c in range(14):
-                lbl = QLabel(""); lbl.setFixedSize(55, 75); lbl.setAlignment(Qt.AlignCenter); lbl.setFont(QFont("Arial", 26, QFont.Bold))
-                lbl.setStyleSheet("background-color: #003366; border: 2px solid #001122; border-radius: 5px;")
-                self.grid_layout.addWidget(lbl, r, c); riga.append(lbl)
-            self.celle.append(riga)
-        layout.addWidget(self.grid_container, alignment=Qt.AlignCenter)
+        centro = QHBoxLayout()
+        self.tabellone = Tabellone(); centro.addWidget(self.tabellone, 3)
+        self.ruota = Ruota(); centro.addWidget(self.ruota, 1); layout.addLayout(centro, 1)
+        self.ruota.settore_cambiato.connect(lambda premio: self.label_ruota.setText(premio)); self.ruota.fermata.connect(self.flash)
 
         self.progress = QProgressBar(); self.progress.setFixedHeight(12); self.progress.setTextVisible(False); self.progress.setStyleSheet("QProgressBar::chunk { background-color: #00FF00; }"); layout.addWidget(self.progress)
         self.label_ruota = QLabel("GIRA LA RUOTA!"); self.label_ruota.setAlignment(Qt.AlignCenter); self.label_ruota.setStyleSheet("color: white; font-size: 32px; font-weight: bold; padding: 10px; background: #000; border: 3px solid gold;"); layout.addWidget(self.label_ruota)
@@ -254,32 +340,69 @@ class GiraLaRuota(QWidget):
             b.setFixedSize(200, 65); b.setStyleSheet("background-color: #FFD700; color: black; font-weight: bold; border-radius: 12px; font-size: 14px;"); btns.addWidget(b)
         self.btn_spin.clicked.connect(self.anim_ruota); self.btn_vow.clicked.connect(self.buy_vowel)
         self.btn_pass.clicked.connect(self.manual_pass); self.btn_sol.clicked.connect(self.solve); layout.addLayout(btns)
+        # I tasti arrivano sempre alla finestra di gioco, anche dopo aver cliccato un pulsante
+        for b in [self.btn_set, self.btn_next_phrase, self.btn_mute, self.btn_cheat, self.btn_exit, self.btn_spin, self.btn_vow, self.btn_pass, self.btn_sol]:
+            b.setFocusPolicy(Qt.NoFocus)
 
     def nuovo_round(self):
-        if self.round_corrente > self.tot_round: self.classifica(); return
-        self.bg_player.play()
-        self.jolly_pescati_nel_round = 0
-        self.premi_correnti = list(self.premi_base) + ["JOLLY", "JOLLY"]
-
-        # --- LOGICA DI SELEZIONE CASUALE MIGLIORATA ---
-        categorie = list(self.database.keys())
-        random.shuffle(categorie)  # Mischia le categorie
-        cat = categorie[0]
+        if self.motore.round_corrente > self.tot_round: self.classifica(); return
+        self.init_audio(); self.bg_player.play(); self.stop_sound("spin")
 
-        frasi = self.database[cat]
-        random.shuffle(frasi)  # Mischia le frasi della categoria scelta
-        self.soluzione = frasi[0].upper()
+        # --- SELEZIONE CASUALE SENZA RIPETIZIONI (il database non viene mai rimescolato) ---
+        cat, frase = self.estrattore.estrai()
+        self.motore.nuovo_round(frase); self.ruota.imposta_premi(self.motore.premi)
+        escluse = disponi_frase(self.motore.soluzione)[1]
+        if escluse: logger.warning("frase troppo lunga per il tabellone, parole nascoste: %s (python importa_frasi.py --verifica)", " ".join(escluse))
 
-        self.categoria = cat; self.lettere_indovinate = set(); self.portafogli_round = [0, 0, 0]
-        self.label_info.setText(f"ROUND {self.round_corrente} / {self.tot_round}"); self.label_cat.setText(self.categoria); self.agg_tabellone(); self.agg_giocatori()
+        self.categoria = cat
+        if self.cronista: self.cronista.nuovo_round(self.motore.round_corrente, self.tot_round, cat, vista_tabellone(self.motore.soluzione, self.motore.lettere))
+        self.label_info.setText(f"ROUND {self.motore.round_corrente} / {self.tot_round}"); self.label_cat.setText(self.categoria); self.agg_tabellone(); self.agg_giocatori(); self.abilita_comandi()
 
     def avvia_configurazione(self):
+        if self.archivio_in_memoria:
+            QMessageBox.warning(self, "Archivio Frasi", f"Impossibile aprire l'archivio delle frasi:\n{self.db_path}\n\n"
+                                "Si gioca con le frasi di base: le modifiche fatte nell'editor non verranno salvate.")
         self.giocatori = []
         for i in range(3):
-            n, ok = QInputDialog.getText(self, "Setup Giocatori", f"Nome Giocatore {i+1}:")
+            n, ok = QInputDialog.getText(self, "Setup Giocatori", f"Nome Giocatore {i+1} (CPU... per il computer):")
             self.giocatori.append(n.strip().upper() if ok and n.strip() else f"GIOCATORE {i+1}")
         nr, ok = QInputDialog.getInt(self, "Configurazione", "Numero di Round:", 3, 1, 10); self.tot_round = nr if ok else 3
-        self.showFullScreen(); self.nuovo_round()
+        self.prepara_cpu(); self.showFullScreen(); self.nuovo_round()
+
+    def prepara_cpu(self):
+        posti = [i for i, n in enumerate(self.giocatori) if n.startswith(PREFISSO_CPU)]
+        if posti and self.indice is None: self.avvia_indice()
+        self.cpu = {i: GiocatoreCPU(self.indice) for i in posti}
+
+    # --- INDICE DELLE FRASI PER LA CPU ---
+    # Serve solo con almeno un posto CPU: parte quando si scelgono i giocatori e viene costruito a blocchi
+    # (uno per giro dell'event loop) nell'attesa della prima mossa; mossa_cpu completa al momento solo
+    # quello che manca. Dopo una "ricarica" dell'archivio si ricostruisce allo stesso modo.
+    def avvia_indice(self):
+        # L'indice è collegato all'archivio prima di leggerlo: le modifiche durante la costruzione non vanno perse
+        if self.indice is None: self.indice = IndiceFrasi().collega(self.database, self.avvia_indice)
+        self.costruzione_indice = self.indice.costruisci_a_passi(self.database.righe_a_pagine())
+        # Con centinaia di migliaia di oggetti nuovi il GC farebbe passate lunghe a metà costruzione
+        gc.disable(); self.timer_indice.start(0)
+
+    def passo_indice(self):
+        try: finita = next(self.costruzione_indice, True) is True
+        except BaseException: self.ferma_indice(); raise
+        if finita: self.completa_indice()
+
+    def completa_indice(self):
+        if self.costruzione_indice is None: return
+        try:
+            for _ in self.costruzione_indice: pass
+        finally: self.ferma_indice()
+        # Vive quanto il gioco: fuori dalle raccolte del GC, che altrimenti lo ripercorrerebbe a ogni passata
+        # completa. Basta la prima costruzione: le ricostruzioni restano al GC, che ne libera anche i cicli
+        if not self.indice_congelato: gc.freeze(); self.indice_congelato = True
+        TIMELINE.segna("indice_cpu")
+
+    def ferma_indice(self):
+        # Costruzione finita, fallita o interrotta dalla chiusura: il GC torna sempre attivo
+        self.timer_indice.stop(); self.costruzione_indice = None; gc.enable()
 
     def skip_phrase(self):
         r = QMessageBox.question(self, 'Cambia Frase', "Vuoi rigenerare la frase?", QMessageBox.Yes | QMessageBox.No)
@@ -290,131 +413,209 @@ class GiraLaRuota(QWidget):
         if r == QMessageBox.Yes: self.play_sound("bad"); self.next_turn()
 
     def agg_tabellone(self):
-        for r in range(4):
-            for c in range(14):
-                self.celle[r][c].setText(""); self.celle[r][c].setStyleSheet("background-color: #003366; border: none;")
-        parole = self.soluzione.split(" ")
-        riga, col = 1, 1
-        for p in parole:
-            if col + len(p) > 13: riga += 1; col = 1
-            if riga > 3: break
-            for char in p:
-                cella = self.celle[riga][col]
-                if char in self.lettere_indovinate or not char.isalpha():
-                    cella.setText(char); cella.setStyleSheet("background-color: white; color: black; border: 2px solid #444;")
-                else: cella.setStyleSheet("background-color: white; border: 2px solid #444;")
-                col += 1
-            col += 1
+        # Ridisegna solo le celle che cambiano (vedi Tabellone)
+        self.tabellone.aggiorna(self.motore.soluzione, self.motore.lettere)
+        if self.cronista: self.cronista.tabellone(vista_tabellone(self.motore.soluzione, self.motore.lettere))
 
     def anim_ruota(self):
         self.btn_spin.setEnabled(False); self.play_sound("spin")
-        self.timer_f = QTimer(); self.timer_f.timeout.connect(self.flash); self.timer_f.start(100)
-
-    def flash(self):
-        if self.suoni["spin"].state() == QMediaPlayer.PlayingState:
-            self.label_ruota.setText(str(random.choice(self.premi_correnti)))
-        else:
-            self.timer_f.stop(); res = random.choice(self.premi_correnti); self.label_ruota.setText(str(res))
-            if res in ["BANCAROTTA", "PASSA"]:
-                if self.ha_jolly[self.turno_attuale]:
-                    self.ha_jolly[self.turno_attuale] = False; self.btn_spin.setEnabled(True)
-                else:
-                    if res == "BANCAROTTA": self.portafogli_round[self.turno_attuale] = 0
-                    self.play_sound("bad"); self.next_turn()
-            elif res == "JOLLY":
-                self.ha_jolly[self.turno_attuale] = True; self.jolly_pescati_nel_round += 1
-                self.premi_correnti.remove("JOLLY"); self.premi_correnti.append(200)
-                self.valore_ruota = 500; self.start_timer(7)
-            else: self.valore_ruota = res; self.start_timer(7)
+        self.ruota.gira(self.seed_ruota); self.seed_ruota = None
+
+    def flash(self, indice):
+        # Chiamata dalla ruota quando si ferma: il premio è lo spicchio sotto l'indicatore.
+        # L'effetto della ruota dura più del giro e coprirebbe i suoni che seguono
+        self.stop_sound("spin")
+        self.label_ruota.setText(str(self.motore.premi[indice]))
+        if self.cronista: self.cronista.ruota(self.motore.premi[indice])
+        esito = self.motore.applica_spicchio(indice)
+        if esito == PROTETTO: self.abilita_comandi(); self.agg_giocatori()
+        elif esito == JOLLY: self.ruota.imposta_premi(self.motore.premi); self.agg_giocatori(); self.start_timer(SECONDI_LETTERA)
+        elif esito in (BANCAROTTA, PASSA): self.play_sound("bad"); self.agg_turno()
+        else: self.start_timer(SECONDI_LETTERA)
 
     def start_timer(self, s):
-        self.rem_t = s * 10; self.progress.setMaximum(self.rem_t); self.timer_gioco.start(100); self.ask_letter()
+        # Scadenza su orologio monotono: il tempo concesso non dipende da quanti tick arrivano né da quando.
+        # La barra ha un passo per pixel e il timer batte al ritmo del display: si ridisegna solo se cambia.
+        self.scadenza = time.monotonic() + s; self.durata_turno = s
+        passi = max(self.progress.width(), 1); self.progress.setMaximum(passi); self.progress.setValue(passi)
+        refresh = self.screen().refreshRate() if self.screen() else 60
+        self.timer_gioco.start(max(int(1000 / (refresh or 60)), 8)); self.ask_letter()
 
     def aggiorna_timer(self):
-        self.rem_t -= 1; self.progress.setValue(self.rem_t)
-        if self.rem_t <= 0: self.timer_gioco.stop(); self.play_sound("bad"); self.next_turn()
+        resto = self.scadenza - time.monotonic()
+        if resto <= 0:
+            self.timer_gioco.stop(); self.progress.setValue(0); self.modo_input = None; self.label_ruota.setText(self.testo_premio)
+            self.play_sound("bad"); self.next_turn(); return
+        valore = int(self.progress.maximum() * resto / self.durata_turno)
+        if valore != self.progress.value(): self.progress.setValue(valore)
 
     def ask_letter(self, is_v=False):
-        let, ok = QInputDialog.getText(self, "Lettera", "Digita una lettera:"); self.timer_gioco.stop()
-        let = let.upper().strip() if ok else ""
-        if ok and len(let) == 1 and let.isalpha():
-            if let in self.soluzione and let not in self.lettere_indovinate:
-                cnt = self.soluzione.count(let); self.lettere_indovinate.add(let)
-                if not is_v: self.portafogli_round[self.turno_attuale] += (cnt * self.valore_ruota)
-                self.play_sound("correct"); self.agg_tabellone(); self.agg_giocatori(); self.btn_spin.setEnabled(True)
-            else: self.play_sound("bad"); self.next_turn()
+        self.modo_input = VOCALE_INPUT if is_v else LETTERA
+        self.testo_premio = self.label_ruota.text()
+        cpu = self.cpu.get(self.motore.turno)
+        if cpu:
+            # La CPU usa lo stesso ingresso della tastiera, dopo una pausa
+            self.programma_cpu(lambda: self.inserisci_lettera(cpu.scegli_lettera(self.motore, self.categoria, is_v) or ""))
+            return
+        for b in [self.btn_spin, self.btn_vow, self.btn_pass, self.btn_sol]: b.setEnabled(False)
+        self.label_ruota.setText(f"{self.testo_premio}  ⌨️ {'DIGITA UNA VOCALE' if is_v else 'DIGITA UNA LETTERA'}")
+        self.activateWindow(); self.setFocus()
+
+    def inserisci_lettera(self, let, t_tasto=None):
+        # Unico punto d'ingresso per tastiera e CPU; t_tasto (perf_counter del tasto) misura la latenza fino al tabellone
+        if self.modo_input not in (LETTERA, VOCALE_INPUT): return
+        is_v = self.modo_input == VOCALE_INPUT; self.modo_input = None
+        self.timer_gioco.stop(); self.label_ruota.setText(self.testo_premio)
+        let = let.upper().strip()
+        if len(let) == 1 and let.isalpha():
+            if self.motore.chiama_lettera(let, vocale=is_v):
+                if t_tasto is not None: self.tabellone.misura_prossimo_disegno(t_tasto)
+                self.agg_tabellone(); self.play_sound("correct"); self.agg_giocatori(); self.abilita_comandi()
+            else: self.play_sound("bad"); self.agg_turno()
         else: self.next_turn()
 
     def buy_vowel(self):
-        if self.portafogli_round[self.turno_attuale] >= 500:
-            self.portafogli_round[self.turno_attuale] -= 500; self.agg_giocatori(); self.ask_letter(True)
+        if self.motore.compra_vocale(): self.agg_giocatori(); self.ask_letter(True)
 
     def solve(self):
-        res, ok = QInputDialog.getText(self, "Risolvi", "La soluzione è:"); self.timer_gioco.stop()
-        if ok and res.upper().strip() == self.soluzione:
-            self.play_sound("victory")
-
-            nome_vincitore = self.giocatori[self.turno_attuale]
+        self.timer_gioco.stop()
+        if self.motore.turno in self.cpu: self.modo_input = SOLUZIONE; self.conferma_soluzione(self.tentativo_cpu or ""); return
+        for b in [self.btn_spin, self.btn_vow, self.btn_pass, self.btn_sol]: b.setEnabled(False)
+        self.modo_input = SOLUZIONE; self.testo_soluzione = ""; self.testo_premio = self.label_ruota.text(); self.mostra_soluzione()
+        self.activateWindow(); self.setFocus()
+
+    def mostra_soluzione(self):
+        self.label_ruota.setText(f"💡 {self.testo_soluzione}▌")
+
+    def conferma_soluzione(self, res):
+        # res=None: soluzione annullata (ESC)
+        if self.modo_input != SOLUZIONE: return
+        self.modo_input = None
+        if self.motore.turno not in self.cpu: self.label_ruota.setText(self.testo_premio)
+        if res is not None and self.motore.risolvi(res):
+            self.play_sound("victory"); self.agg_giocatori()
+            sol = self.motore.soluzione
+            if self.cronista: self.cronista.risolto(self.motore.turno, sol, vista_tabellone(sol, set(sol)))
+
+            nome_vincitore = self.giocatori[self.motore.turno]
             msg_vincitore = f"🏆🏆🏆 COMPLIMENTI 🏆🏆🏆\n\n🥇 {nome_vincitore} 🥇\n\nHAI VINTO IL ROUND!"
             QMessageBox.information(self, "RISOLTO!", msg_vincitore)
 
             self.avvia_coriandoli()
-            self.montepremi_totale[self.turno_attuale] += self.portafogli_round[self.turno_attuale]
             QTimer.singleShot(4500, self.prossimo_round_dopo_festa)
+        elif res is not None: self.play_sound("bad"); self.agg_turno()
         else: self.play_sound("bad"); self.next_turn()
 
-    def avvia_coriandoli(self):
-        self.coriandoli = [Coriandolo(self.width()) for _ in range(180)]
-        self.timer_coriandoli.start(30)
+    def init_effetti(self):
+        # NumPy viene caricato durante la sigla, non alla prima vittoria
+        if self.coriandoli is None:
+            from coriandoli import SistemaCoriandoli
+            self.coriandoli = SistemaCoriandoli(budget_ms=12.0)
+
+    def avvia_coriandoli(self, quanti=180):
+        self.init_effetti()
+        self.coriandoli.lancia(quanti, self.width()); self.t_frame_coriandoli = time.perf_counter()
+        self.timer_coriandoli.start(16)
 
     def aggiorna_animazione_coriandoli(self):
-        for c in self.coriandoli: c.caduta()
-        if all(c.y > self.height() for c in self.coriandoli):
-            self.timer_coriandoli.stop(); self.coriandoli = []
-        self.update()
+        t = time.perf_counter(); dt = min(t - self.t_frame_coriandoli, 0.1); self.t_frame_coriandoli = t
+        zona = self.coriandoli.avanza(dt, self.height())
+        if not len(self.coriandoli): self.timer_coriandoli.stop()
+        self.costo_frame_coriandoli = (time.perf_counter() - t) * 1000
+        self.update(zona)
 
     def paintEvent(self, event):
-        if self.coriandoli:
-            painter = QPainter(self)
-            for c in self.coriandoli:
-                painter.setBrush(c.color)
-                painter.setPen(Qt.NoPen)
-                painter.drawRect(int(c.x), int(c.y), c.size, c.size)
+        if self.coriandoli is not None and len(self.coriandoli):
+            t = time.perf_counter()
+            painter = QPainter(self); painter.setPen(Qt.NoPen)
+            self.coriandoli.disegna(painter, event.region()); painter.end()
+            self.coriandoli.registra_costo(self.costo_frame_coriandoli + (time.perf_counter() - t) * 1000)
 
     def prossimo_round_dopo_festa(self):
-        self.round_corrente += 1; self.nuovo_round()
+        self.motore.prossimo_round(); self.nuovo_round()
 
     def next_turn(self):
-        self.turno_attuale = (self.turno_attuale + 1) % 3; self.btn_spin.setEnabled(True); self.agg_giocatori()
+        self.stop_sound("spin"); self.motore.passa_turno(); self.agg_turno()
+
+    def agg_turno(self):
+        # Il turno è già stato passato dal motore: aggiorna solo l'interfaccia
+        self.abilita_comandi(); self.agg_giocatori()
+
+    def abilita_comandi(self):
+        # Durante il turno della CPU i comandi sono bloccati e la mossa parte da sola
+        umano = self.motore.turno not in self.cpu
+        for b in [self.btn_spin, self.btn_vow, self.btn_pass, self.btn_sol]: b.setEnabled(umano)
+        if not umano: self.programma_cpu(self.mossa_cpu)
+        else: self.timer_cpu.stop()
+
+    def programma_cpu(self, azione):
+        # Anche se abilita_comandi viene richiamata più volte nello stesso turno parte una sola mossa
+        self.azione_cpu = azione; self.timer_cpu.start(RITARDO_CPU)
+
+    def esegui_azione_cpu(self):
+        azione, self.azione_cpu = self.azione_cpu, None
+        if azione: azione()
+
+    def mossa_cpu(self):
+        cpu = self.cpu.get(self.motore.turno)
+        if cpu is None or self.motore.risolto or self.ruota.sta_girando(): return
+        self.completa_indice()
+        mossa, self.tentativo_cpu = cpu.decidi(self.motore, self.categoria)
+        logger.info("cpu %s: %s", self.giocatori[self.motore.turno], mossa)
+        # Stessi percorsi dei pulsanti: suoni, tabellone e turni si comportano come per un umano
+        if mossa == RISOLVI: self.solve()
+        elif mossa == VOCALE: self.buy_vowel()
+        else: self.anim_ruota()
 
     def agg_giocatori(self):
+        m = self.motore
         for i in range(3):
-            att = (i == self.turno_attuale); jolly = " 🍀" if self.ha_jolly[i] else ""
+            att = (i == m.turno); jolly = (" 🍀" if m.jolly[i] else "") + (" 🤖" if i in self.cpu else "")
             self.lab_gio[i].setStyleSheet(f"background: {'#0F0' if att else '#333'}; color: {'#000' if att else '#FFF'}; border: 2px solid gold; border-radius: 12px; padding: 10px;")
-            self.lab_gio[i].setText(f"{self.giocatori[i]}{jolly}\nRound: {self.portafogli_round[i]}€\nTOT: {self.montepremi_totale[i]}€")
+            self.lab_gio[i].setText(f"{self.giocatori[i]}{jolly}\nRound: {m.portafogli[i]}€\nTOT: {m.totali[i]}€")
+        if self.cronista: self.cronista.giocatori_aggiornati(self.giocatori, m.portafogli, m.totali, m.jolly, m.turno)
 
     def classifica(self):
         self.bg_player.stop()
-        r = sorted(zip(self.giocatori, self.montepremi_totale), key=lambda x: x[1], reverse=True)
+        r = sorted(zip(self.giocatori, self.motore.totali), key=lambda x: x[1], reverse=True)
         m_classifica = "📊 CLASSIFICA GENERALE 📊\n\n" + "\n".join([f"{n}: {s}€" for n, s in r])
         m_classifica += "\n\nVuoi giocare un'altra partita?"
 
         risp = QMessageBox.question(self, "Fine Gioco", m_classifica, QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
 
         if risp == QMessageBox.Yes:
-            self.round_corrente = 1; self.montepremi_totale = [0, 0, 0]; self.portafogli_round = [0, 0, 0]
-            self.ha_jolly = [False, False, False]; self.nuovo_round()
+            self.motore.nuova_partita(); self.nuovo_round()
         else: self.close()
 
     def menu_impostazioni(self):
-        d = JsonEditorDialog(self.database, self)
-        if d.exec_():
-            new = d.get_data()
-            if isinstance(new, dict): self.database = new; self.salva_database()
+        # Editor a tabella: legge le frasi a pagine e salva solo le righe cambiate (vedi editor_frasi)
+        from editor_frasi import PhraseEditorDialog
+        d = PhraseEditorDialog(self.database, self); d.exec_()
+        if d.salvate: self.estrattore.invalida()
 
     def keyPressEvent(self, e):
+        t_tasto = time.perf_counter()
+        if self.modo_input in (LETTERA, VOCALE_INPUT) and self.motore.turno not in self.cpu:
+            # Lettere accentate ridotte alla lettera base; ESC cede il turno come il vecchio "Annulla"
+            testo = unicodedata.normalize("NFD", e.text().upper())[:1]
+            if e.key() == Qt.Key_Escape: self.inserisci_lettera("")
+            elif testo.isalpha(): self.inserisci_lettera(testo, t_tasto)
+            return
+        if self.modo_input == SOLUZIONE and self.motore.turno not in self.cpu:
+            if e.key() in (Qt.Key_Return, Qt.Key_Enter): self.conferma_soluzione(self.testo_soluzione)
+            elif e.key() == Qt.Key_Escape: self.conferma_soluzione(None)
+            elif e.key() == Qt.Key_Backspace: self.testo_soluzione = self.testo_soluzione[:-1]; self.mostra_soluzione()
+            elif e.text() and e.text().isprintable(): self.testo_soluzione += e.text().upper(); self.mostra_soluzione()
+            return
         if e.key() == Qt.Key_Space and self.btn_spin.isEnabled(): self.anim_ruota()
         elif e.key() == Qt.Key_Escape: self.close()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv); splash = SplashScreen(); sys.exit(app.exec_())
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # --traccia[=file.json] registra tempi di disegno e dei gestori; --overlay li mostra sopra il gioco
+    traccia = next((a.partition("=")[2] or get_data_path("gira_la_ruota_traccia.json") for a in sys.argv if a.split("=")[0] == "--traccia"), None)
+    if traccia or "--overlay" in sys.argv:
+        from traccia import ApplicazioneTracciata
+        app = ApplicazioneTracciata(sys.argv, traccia); app.traccia.avvolgi(GiraLaRuota)
+    else: app = QApplication(sys.argv)
+    splash = SplashScreen(); sys.exit(app.exec_())
@@ -0,0 +1,213 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from motore import Partita, PREMI_BASE, BANCAROTTA, JOLLY, PREMIO
+
+# --- SIMULATORE MONTE CARLO ---
+# Gioca milioni di round con il motore delle regole (nessuna interfaccia) su un pool di processi,
+# per bilanciare la composizione della ruota prima di portarla in serata.
+#   python simulatore.py --round 1000000 --strategie frequenze,casuale,prudente
+#   python simulatore.py --premi 100,300,500,1000,BANCAROTTA,PASSA,200,400,800,150,250,600 --json
+
+VOCALI = set("AEIOU")
+CONSONANTI = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ") - VOCALI
+FREQUENZE_IT = "EAIONLRTSCDUPMVGHFBQZ"   # ordine di frequenza delle lettere nell'italiano scritto
+GIRA, VOCALE, RISOLVI = "gira", "vocale", "risolvi"
+MAX_MOSSE = 400
+
+# --- STRATEGIE ---
+# Una strategia decide la mossa, sceglie la lettera e tenta la soluzione. Per aggiungerne una basta
+# una classe con gli stessi metodi, passata come "modulo:Classe" a --strategie.
+class Strategia:
+    soglia_risolvi = 0.75    # frazione di lettere scoperte oltre la quale prova a risolvere
+    voglia_vocale = 0.3      # probabilità di comprare una vocale quando può
+
+    def azione(self, partita, chiamate, rng):
+        if partita.frazione_scoperta() >= self.soglia_risolvi: return RISOLVI
+        # Nessuna consonante da chiamare (es. lettere accentate mancanti): resta solo tentare
+        if not self.candidati(partita, chiamate, False): return RISOLVI
+        vocali = VOCALI - chiamate - partita.lettere
+        if vocali and partita.puo_comprare_vocale() and rng.random() < self.voglia_vocale: return VOCALE
+        return GIRA
+
+    def candidati(self, partita, chiamate, vocale):
+        return sorted((VOCALI if vocale else CONSONANTI) - chiamate - partita.lettere)
+
+    def lettera(self, partita, chiamate, rng, vocale):
+        c = self.candidati(partita, chiamate, vocale)
+        return rng.choice(c) if c else None
+
+    def tentativo(self, partita, rng):
+        # Chi conosce più lettere indovina più spesso; a tabellone completo non si sbaglia
+        f = partita.frazione_scoperta()
+        return partita.soluzione if rng.random() < f * f else ""
+
+class Casuale(Strategia):
+    pass
+
+class Frequenze(Strategia):
+    soglia_risolvi = 0.65
+
+    def lettera(self, partita, chiamate, rng, vocale):
+        c = set(self.candidati(partita, chiamate, vocale))
+        return next((l for l in FREQUENZE_IT if l in c), None) or (min(c) if c else None)
+
+class Prudente(Frequenze):
+    # Compra vocali appena può e prova a risolvere presto, per non restare esposta alla BANCAROTTA
+    soglia_risolvi = 0.5
+    voglia_vocale = 0.8
+
+STRATEGIE = {"casuale": Casuale, "frequenze": Frequenze, "prudente": Prudente}
+
+def crea_strategia(nome):
+    if nome in STRATEGIE: return STRATEGIE[nome]()
+    modulo, _, classe = nome.partition(":")
+    return getattr(importlib.import_module(modulo), classe)()
+
+# --- SIMULAZIONE ---
+def gioca_round(partita, frase, strategie, rng, stat):
+    partita.nuovo_round(frase); chiamate = set()
+    for mossa in range(MAX_MOSSE):
+        t = partita.turno; s = strategie[t]
+        scelta = s.azione(partita, chiamate, rng)
+        if scelta == RISOLVI:
+            if partita.risolvi(s.tentativo(partita, rng)):
+                stat["mosse"][mossa + 1] += 1
+                return t
+            continue
+        if scelta == VOCALE and partita.compra_vocale():
+            let = s.lettera(partita, chiamate, rng, True); chiamate.add(let)
+            partita.chiama_lettera(let, vocale=True); continue
+        stat["spin"][0] += 1
+        portafoglio = partita.portafogli[t]
+        _, esito = partita.gira(rng)
+        if esito == BANCAROTTA:
+            stat["bancarotte_posto"][t] += 1; stat["perso_in_bancarotta"][0] += portafoglio
+        elif esito in (PREMIO, JOLLY):
+            if esito == JOLLY: stat["jolly"][0] += 1
+            let = s.lettera(partita, chiamate, rng, False); chiamate.add(let)
+            partita.chiama_lettera(let)
+    stat["mosse"][MAX_MOSSE] += 1
+    return None
+
+_FRASI = None
+
+def _inizializza_worker(frasi):
+    global _FRASI
+    _FRASI = frasi
+
+def simula_blocco(args):
+    seed, n_round, premi, nomi_strategie, round_per_partita = args
+    rng = random.Random(seed); strategie = [crea_strategia(n) for n in nomi_strategie]
+    partita = Partita(premi, giocatori=len(strategie))
+    stat = {k: Counter() for k in ("vittorie_posto", "vittorie_strategia", "vincita", "bancarotte_round",
+                                   "bancarotte_posto", "mosse", "spin", "jolly", "perso_in_bancarotta", "round")}
+    for i in range(n_round):
+        if i % round_per_partita == 0: partita.nuova_partita()
+        prima = sum(stat["bancarotte_posto"].values())
+        vincitore = gioca_round(partita, rng.choice(_FRASI), strategie, rng, stat)
+        stat["bancarotte_round"][sum(stat["bancarotte_posto"].values()) - prima] += 1
+        stat["round"][0] += 1
+        if vincitore is None: stat["vittorie_posto"]["nessuno"] += 1; continue
+        stat["vittorie_posto"][vincitore] += 1; stat["vittorie_strategia"][nomi_strategie[vincitore]] += 1
+        stat["vincita"][partita.portafogli[vincitore]] += 1
+        partita.prossimo_round()
+    return stat
+
+def simula(frasi, n_round, premi, nomi_strategie, processi=None, blocco=20_000, seed=0, round_per_partita=3):
+    compiti = []; restanti = n_round; i = 0
+    while restanti > 0:
+        n = min(blocco, restanti); compiti.append((seed * 1_000_003 + i, n, premi, nomi_strategie, round_per_partita))
+        restanti -= n; i += 1
+    totale = {}
+    with ProcessPoolExecutor(max_workers=processi, initializer=_inizializza_worker, initargs=(frasi,)) as pool:
+        for stat in pool.map(simula_blocco, compiti):
+            for k, c in stat.items(): totale.setdefault(k, Counter()).update(c)
+    return totale
+
+# --- REPORT ---
+def percentile(distribuzione, q):
+    tot = sum(distribuzione.values()); soglia = q * tot; acc = 0
+    for v in sorted(distribuzione):
+        acc += distribuzione[v]
+        if acc >= soglia: return v
+    return 0
+
+def raggruppa(distribuzione, massimo, n):
+    # {"0": .., "1": .., ..., "5+": ..} come frazioni del totale
+    r = {str(k): distribuzione[k] / n for k in range(massimo)}
+    r[f"{massimo}+"] = sum(c for k, c in distribuzione.items() if k >= massimo) / n
+    return r
+
+def riassunto(stat, nomi_strategie):
+    n = stat["round"][0]; vinti = n - stat["vittorie_posto"]["nessuno"]
+    vincita = stat["vincita"]
+    return {
+        "round": n,
+        "senza_vincitore": stat["vittorie_posto"]["nessuno"] / n,
+        "vittorie_posto": {f"{i}:{nome}": stat["vittorie_posto"][i] / n for i, nome in enumerate(nomi_strategie)},
+        "vittorie_strategia": {k: v / n for k, v in sorted(stat["vittorie_strategia"].items())},
+        "vincita": {"media": sum(v * c for v, c in vincita.items()) / max(vinti, 1),
+                    "p50": percentile(vincita, 0.5), "p90": percentile(vincita, 0.9),
+                    "p99": percentile(vincita, 0.99), "max": max(vincita, default=0),
+                    "zero": vincita[0] / max(vinti, 1)},
+        "bancarotte": {"per_round": sum(k * c for k, c in stat["bancarotte_round"].items()) / n,
+                       "distribuzione": raggruppa(stat["bancarotte_round"], 5, n),
+                       "per_posto": {f"{i}:{nome}": stat["bancarotte_posto"][i] / n for i, nome in enumerate(nomi_strategie)},
+                       "euro_persi_per_round": stat["perso_in_bancarotta"][0] / n},
+        "giri_per_round": stat["spin"][0] / n,
+        "jolly_per_round": stat["jolly"][0] / n,
+        "mosse_mediana": percentile(stat["mosse"], 0.5),
+    }
+
+def stampa(r, premi, secondi):
+    print(f"Ruota: {', '.join(map(str, premi))} (+ JOLLY)")
+    print(f"{r['round']:,} round in {secondi:.1f} s ({r['round'] / secondi:,.0f} round/s)\n")
+    print("Vittorie per posto:")
+    for k, v in r["vittorie_posto"].items(): print(f"  {k:<20}{v:>8.1%}")
+    print(f"  {'nessuno':<20}{r['senza_vincitore']:>8.1%}")
+    v = r["vincita"]
+    print(f"\nVincita del round (€): media {v['media']:.0f}  p50 {v['p50']}  p90 {v['p90']}  p99 {v['p99']}  max {v['max']}  zero {v['zero']:.1%}")
+    b = r["bancarotte"]
+    print(f"Bancarotte: {b['per_round']:.2f} per round, {b['euro_persi_per_round']:.0f} € persi per round")
+    print("  round con k bancarotte: " + "  ".join(f"{k}: {p:.1%}" for k, p in b["distribuzione"].items()))
+    print("  per posto: " + "  ".join(f"{k} {p:.2f}" for k, p in b["per_posto"].items()))
+    print(f"Giri per round {r['giri_per_round']:.1f}, JOLLY per round {r['jolly_per_round']:.2f}, mosse (mediana) {r['mosse_mediana']}")
+
+def carica_frasi(path):
+    if path.endswith((".sqlite", ".db")):
+        from archivio_frasi import PhraseStore
+        with PhraseStore(path) as store: dati = store.come_dict()
+    else:
+        with open(path, 'r', encoding='utf-8') as f: dati = json.load(f)
+    return [frase.upper() for frasi in dati.values() for frase in frasi]
+
+def leggi_premi(testo):
+    return [int(p) if p.strip().isdigit() else p.strip().upper() for p in testo.split(",")]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulatore Monte Carlo per Gira la Ruota")
+    ap.add_argument("--round", type=int, default=100_000)
+    ap.add_argument("--premi", type=leggi_premi, default=list(PREMI_BASE), help="spicchi separati da virgola (i due JOLLY si aggiungono da soli)")
+    ap.add_argument("--strategie", default="frequenze,casuale,prudente", help=f"una per posto: {', '.join(STRATEGIE)} o modulo:Classe")
+    ap.add_argument("--frasi", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "frasi.json"))
+    ap.add_argument("--processi", type=int, default=None)
+    ap.add_argument("--round-per-partita", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="stampa il riepilogo in JSON")
+    a = ap.parse_args(argv)
+    nomi = a.strategie.split(",")
+    t = time.perf_counter()
+    stat = simula(carica_frasi(a.frasi), a.round, a.premi, nomi, a.processi, seed=a.seed, round_per_partita=a.round_per_partita)
+    r = riassunto(stat, nomi)
+    if a.json: print(json.dumps(r, indent=2))
+    else: stampa(r, a.premi, time.perf_counter() - t)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import socket
+import threading
+from avvio import logger
+
+# --- SERVER PER GLI SCHERMI DEL PUBBLICO ---
+# Opzionale (ruota_fortuna.py --spettatori[=host:porta]): un server asyncio in un thread a parte,
+# accanto all'event loop di Qt, che spinge a browser e telefoni gli eventi della partita via
+# Server-Sent Events. Si inviano solo le differenze (lettere scoperte, portafogli, turno, ruota);
+# chi si collega riceve prima un'istantanea completa. Ogni spettatore ha un buffer limitato: se non
+# lo svuota abbastanza in fretta viene scollegato, senza mai rallentare il gioco o gli altri.
+
+PORTA_DEFAULT = 8765
+BUFFER_MAX = 256 * 1024    # byte in sospeso per spettatore prima di scollegarlo
+BUFFER_KERNEL = 64 * 1024  # buffer di invio del socket: il kernel non accumula megabyte per un telefono sparito
+TIMEOUT_SCRITTURA = 2.0    # secondi concessi per le risposte HTTP semplici
+PING_SECONDI = 15          # commento SSE periodico: tiene aperte le connessioni e scopre quelle morte
+
+# --- STATO E DIFFERENZE (senza Qt né rete) ---
+def stato_vuoto():
+    return {"nomi": [], "giocatori": [], "turno": None, "round": None, "celle": [], "premio": None, "risolto": None}
+
+def applica(stato, ev):
+    # Applica un evento delta allo stato completo: la usa il server per le istantanee e i client di prova
+    t = ev["t"]
+    if t == "stato": stato.clear(); stato.update({k: v for k, v in ev.items() if k != "t"})
+    elif t == "nomi": stato["nomi"] = ev["nomi"]; stato["giocatori"] = [{"round": 0, "tot": 0, "jolly": False} for _ in ev["nomi"]]
+    elif t == "round":
+        stato["round"] = {"n": ev["n"], "di": ev["di"], "cat": ev["cat"]}; stato["celle"] = [list(c) for c in ev["celle"]]
+        stato["risolto"] = None; stato["premio"] = None
+    elif t == "lettere":
+        pos = {(r, c): i for i, (r, c, _) in enumerate(stato["celle"])}
+        for r, c, ch in ev["celle"]: stato["celle"][pos[(r, c)]][2] = ch
+    elif t == "giocatore": stato["giocatori"][ev["i"]] = {"round": ev["round"], "tot": ev["tot"], "jolly": ev["jolly"]}
+    elif t == "turno": stato["turno"] = ev["i"]
+    elif t == "ruota": stato["premio"] = ev["premio"]
+    elif t == "risolto": stato["risolto"] = {"i": ev["i"], "frase": ev["frase"]}
+    return stato
+
+class Cronista:
+    # Confronta ciò che il gioco mostra con l'ultima versione pubblicata e pubblica solo ciò che cambia
+    def __init__(self, pubblica):
+        self.pubblica = pubblica
+        self.visibili = {}; self.giocatori = []; self.nomi = None; self.turno = None
+
+    def nuovo_round(self, numero, totale, categoria, vista):
+        self.visibili = {(r, c): ch for r, c, ch in vista if ch is not None}
+        self.pubblica({"t": "round", "n": numero, "di": totale, "cat": categoria, "celle": [[r, c, ch] for r, c, ch in vista]})
+
+    def tabellone(self, vista):
+        nuove = [[r, c, ch] for r, c, ch in vista if ch is not None and self.visibili.get((r, c)) != ch]
+        if nuove:
+            for r, c, ch in nuove: self.visibili[(r, c)] = ch
+            self.pubblica({"t": "lettere", "celle": nuove})
+
+    def giocatori_aggiornati(self, nomi, portafogli, totali, jolly, turno):
+        if nomi != self.nomi:
+            self.nomi = list(nomi); self.giocatori = [None] * len(nomi); self.pubblica({"t": "nomi", "nomi": self.nomi})
+        for i, valori in enumerate(zip(portafogli, totali, jolly)):
+            if valori != self.giocatori[i]:
+                self.giocatori[i] = valori
+                self.pubblica({"t": "giocatore", "i": i, "round": valori[0], "tot": valori[1], "jolly": valori[2]})
+        if turno != self.turno: self.turno = turno; self.pubblica({"t": "turno", "i": turno})
+
+    def ruota(self, premio):
+        self.pubblica({"t": "ruota", "premio": str(premio)})
+
+    def risolto(self, giocatore, frase, vista_completa):
+        self.tabellone(vista_completa)
+        self.pubblica({"t": "risolto", "i": giocatore, "frase": frase})
+
+# --- SERVER SSE ---
+class _Spettatore:
+    __slots__ = ("writer", "compito", "indirizzo")
+
+    def __init__(self, writer):
+        self.writer = writer; self.compito = asyncio.current_task(); self.indirizzo = writer.get_extra_info("peername")
+
+def codifica(ev):
+    # Un evento viene serializzato una volta sola e la stessa stringa di byte va a tutti gli spettatori
+    return b"data: " + json.dumps(ev, separators=(",", ":"), ensure_ascii=False).encode() + b"\n\n"
+
+class ServerSpettatori:
+    def __init__(self, host="0.0.0.0", porta=PORTA_DEFAULT, buffer_max=BUFFER_MAX, timeout_scrittura=TIMEOUT_SCRITTURA):
+        self.host, self.porta = host, porta
+        self.buffer_max, self.timeout_scrittura = buffer_max, timeout_scrittura
+        self.stato = stato_vuoto(); self.spettatori = set(); self.in_attesa = []
+        self.scollegati_lenti = 0; self.eventi = 0; self.invii = 0
+        self.loop = None; self.thread = None; self.server = None; self.pronto = threading.Event()
+
+    # --- AVVIO E ARRESTO (dal thread di Qt) ---
+    def avvia(self):
+        self.thread = threading.Thread(target=self._esegui, name="spettatori", daemon=True); self.thread.start()
+        self.pronto.wait(5)
+        return self
+
+    def _esegui(self):
+        self.loop = asyncio.new_event_loop(); asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self._gestisci, self.host, self.porta, backlog=1024))
+            self.porta = self.server.sockets[0].getsockname()[1]   # con porta=0 il sistema ne sceglie una libera
+            logger.info("spettatori: http://%s:%d/", self.host, self.porta)
+            self.ping = self.loop.create_task(self._ping())
+        except OSError as e:
+            logger.warning("spettatori: server non avviato (%s)", e); self.pronto.set(); return
+        self.pronto.set()
+        self.loop.run_forever()
+        compiti = asyncio.all_tasks(self.loop)
+        for t in compiti: t.cancel()
+        self.loop.run_until_complete(asyncio.gather(*compiti, return_exceptions=True)); self.loop.close()
+
+    def ferma(self):
+        if self.loop is None or not self.loop.is_running(): return
+        def chiudi():
+            self.server.close(); self.ping.cancel()
+            for s in list(self.spettatori): self._scollega(s)
+            self.loop.stop()
+        self.loop.call_soon_threadsafe(chiudi); self.thread.join(2)
+
+    # --- PUBBLICAZIONE (thread-safe, costo costante per il gioco) ---
+    def pubblica(self, ev):
+        if self.loop is None or not self.loop.is_running(): return
+        self.loop.call_soon_threadsafe(self._accoda, ev, codifica(ev))
+
+    def _accoda(self, ev, dati):
+        # Gli eventi arrivati nello stesso giro del loop partono insieme: una sola write per spettatore
+        if not self.in_attesa: self.loop.call_soon(self._invia)
+        self.in_attesa.append((ev, dati))
+
+    def _invia(self):
+        eventi, self.in_attesa = self.in_attesa, []
+        for ev, _ in eventi: applica(self.stato, ev)
+        self.eventi += len(eventi); self.invii += 1
+        self._scrivi(b"".join(dati for _, dati in eventi))
+
+    def _scrivi(self, blocco):
+        # Chi ha ancora in sospeso più di buffer_max byte non sta leggendo: viene scollegato
+        for s in list(self.spettatori):
+            if s.writer.transport.get_write_buffer_size() > self.buffer_max: self.scollegati_lenti += 1; self._scollega(s, "troppo lento")
+            else: s.writer.write(blocco)
+
+    def _scollega(self, s, motivo=None):
+        if s not in self.spettatori: return
+        self.spettatori.discard(s)
+        if motivo: logger.info("spettatori: scollegato %s (%s)", s.indirizzo, motivo)
+        if s.compito is not None and s.compito is not asyncio.current_task(): s.compito.cancel()
+        s.writer.transport.abort()
+
+    async def _ping(self):
+        while True:
+            await asyncio.sleep(PING_SECONDI); self._scrivi(b": ping\n\n")
+
+    # --- HTTP MINIMALE ---
+    async def _gestisci(self, reader, writer):
+        try:
+            richiesta = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            writer.close(); return
+        percorso = richiesta.split(b" ", 2)[1].split(b"?")[0] if richiesta.count(b" ") >= 2 else b"/"
+        if percorso == b"/eventi": await self._flusso(reader, writer); return
+        if percorso == b"/stato": corpo, tipo = json.dumps(self.stato, ensure_ascii=False).encode(), b"application/json"
+        elif percorso == b"/": corpo, tipo = PAGINA_HTML.encode(), b"text/html; charset=utf-8"
+        else: corpo, tipo = b"non trovato", b"text/plain"
+        stato = b"200 OK" if percorso in (b"/", b"/stato") else b"404 Not Found"
+        writer.write(b"HTTP/1.1 " + stato + b"\r\nContent-Type: " + tipo + b"\r\nContent-Length: " + str(len(corpo)).encode() +
+                     b"\r\nConnection: close\r\nAccess-Control-Allow-Origin: *\r\n\r\n" + corpo)
+        try: await asyncio.wait_for(writer.drain(), self.timeout_scrittura)
+        except (asyncio.TimeoutError, ConnectionError): pass
+        writer.close()
+
+    async def _flusso(self, reader, writer):
+        # L'istantanea contiene tutto ciò che è già stato inviato: gli eventi ancora in attesa arrivano dopo
+        sock = writer.get_extra_info("socket")
+        if sock is not None: sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, BUFFER_KERNEL)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\nAccess-Control-Allow-Origin: *\r\n\r\n" + codifica({"t": "stato", **self.stato}))
+        s = _Spettatore(writer); self.spettatori.add(s)
+        try:
+            while await reader.read(1024): pass   # il browser non manda altro: qui si scopre solo la chiusura
+        except (ConnectionError, asyncio.CancelledError): pass
+        self._scollega(s)
+
+# --- PAGINA PER IL PUBBLICO ---
+PAGINA_HTML = """<!DOCTYPE html>
+<html lang="it"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Gira la Ruota</title>
+<style>
+body { background: #002244; color: white; font-family: Arial, sans-serif; text-align: center; margin: 0; padding: 10px; }
+#cat { color: #FFD700; font-size: 6vw; font-weight: bold; margin: 8px; }
+#tab { display: grid; grid-template-columns: repeat(14, 1fr); gap: 0.6vw; max-width: 1100px; margin: auto; }
+.c { aspect-ratio: 55 / 75; border-radius: 0.6vw; font-weight: bold; font-size: 4vw; display: flex; align-items: center; justify-content: center; }
+.v { background: #003366; } .k { background: white; } .s { background: white; color: black; }
+#premio { font-size: 5vw; margin: 10px; border: 3px solid gold; background: black; display: inline-block; padding: 4px 20px; }
+#gio { display: flex; gap: 8px; justify-content: center; flex-wrap: wrap; }
+.g { background: #333; border: 2px solid gold; border-radius: 12px; padding: 8px 16px; font-size: 3.5vw; }
+.a { background: #0F0; color: black; }
+</style></head><body>
+<div id="info"></div><div id="cat"></div><div id="tab"></div><div id="premio"></div><div id="gio"></div>
+<script>
+let s = {nomi: [], giocatori: [], celle: []};
+function applica(e) {
+  if (e.t == "stato") { s = e; }
+  else if (e.t == "nomi") { s.nomi = e.nomi; s.giocatori = e.nomi.map(() => ({round: 0, tot: 0, jolly: false})); }
+  else if (e.t == "round") { s.round = {n: e.n, di: e.di, cat: e.cat}; s.celle = e.celle; s.risolto = null; s.premio = null; }
+  else if (e.t == "lettere") { for (const [r, c, ch] of e.celle) for (const x of s.celle) if (x[0] == r && x[1] == c) x[2] = ch; }
+  else if (e.t == "giocatore") { s.giocatori[e.i] = {round: e.round, tot: e.tot, jolly: e.jolly}; }
+  else if (e.t == "turno") { s.turno = e.i; }
+  else if (e.t == "ruota") { s.premio = e.premio; }
+  else if (e.t == "risolto") { s.risolto = {i: e.i, frase: e.frase}; }
+}
+// Nomi e lettere arrivano dal gioco: sempre come testo (textContent), mai come HTML
+function el(classe, testo) {
+  const d = document.createElement("div"); d.className = classe;
+  if (testo !== undefined) d.textContent = testo;
+  return d;
+}
+function disegna() {
+  document.getElementById("info").textContent = s.round ? `ROUND ${s.round.n} / ${s.round.di}` : "";
+  document.getElementById("cat").textContent = s.round ? s.round.cat : "";
+  const mappa = {}; for (const [r, c, ch] of s.celle) mappa[r * 14 + c] = ch;
+  const celle = [];
+  for (let i = 0; i < 56; i++) {
+    const ch = mappa[i];
+    celle.push(ch === undefined ? el("c v") : ch === null ? el("c k") : el("c s", ch));
+  }
+  document.getElementById("tab").replaceChildren(...celle);
+  document.getElementById("premio").textContent = s.risolto ? `🏆 ${s.nomi[s.risolto.i] || ""}: ${s.risolto.frase}` : (s.premio || "GIRA LA RUOTA!");
+  document.getElementById("gio").replaceChildren(...s.nomi.map((n, i) => {
+    const g = s.giocatori[i] || {round: 0, tot: 0};
+    const d = el(i == s.turno ? "g a" : "g");
+    for (const riga of [n + (g.jolly ? " 🍀" : ""), `Round: ${g.round}€`, `TOT: ${g.tot}€`]) d.append(el("", riga));
+    return d;
+  }));
+}
+let attesa = false;
+new EventSource("/eventi").onmessage = (m) => {
+  applica(JSON.parse(m.data));
+  if (!attesa) { attesa = true; requestAnimationFrame(() => { attesa = false; disegna(); }); }
+};
+</script></body></html>
+"""
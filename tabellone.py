@@ -0,0 +1,98 @@
+import time
+from collections import deque
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen, QPixmap
+from griglia import RIGHE, COLONNE, vista_tabellone
+from avvio import logger
+
+# --- TABELLONE DISEGNATO ---
+# Un unico widget al posto dei 56 QLabel: le tessere (vuota, coperta, ogni lettera scoperta) sono
+# pixmap generate una volta per dimensione di cella e riusate. Ogni cella ha uno stato; quando
+# cambia, solo il suo rettangolo viene marcato sporco e ridisegnato.
+
+VUOTA, COPERTA = "", None   # stati di cella; qualsiasi altro valore è il carattere scoperto
+RAPPORTO_CELLA = 75 / 55    # altezza / larghezza delle vecchie celle QLabel
+SPAZIATURA = 0.08           # frazione della larghezza cella usata come spazio tra le celle
+
+class Tabellone(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stato = [[VUOTA] * COLONNE for _ in range(RIGHE)]
+        self.cache_tessere = {}; self.geometria = None
+        self.inizio_misura = None; self.latenze = deque(maxlen=200)   # tasto -> lettera disegnata, in ms
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumSize(COLONNE * 24, int(RIGHE * 24 * RAPPORTO_CELLA))
+
+    def sizeHint(self):
+        return QSize(COLONNE * 60, int(RIGHE * 60 * RAPPORTO_CELLA))
+
+    # --- STATO ---
+    def aggiorna(self, frase, lettere_indovinate):
+        nuovo = [[VUOTA] * COLONNE for _ in range(RIGHE)]
+        for r, c, char in vista_tabellone(frase, lettere_indovinate):
+            nuovo[r][c] = COPERTA if char is None else char
+        # Maschera delle celle sporche: vengono invalidate solo quelle che cambiano
+        for r in range(RIGHE):
+            for c in range(COLONNE):
+                if nuovo[r][c] != self.stato[r][c]:
+                    self.stato[r][c] = nuovo[r][c]; self.update(self.rettangolo_cella(r, c))
+
+    def misura_prossimo_disegno(self, inizio):
+        # inizio: perf_counter() del tasto; la latenza si chiude quando il disegno è finito
+        self.inizio_misura = inizio
+
+    # --- GEOMETRIA E CACHE ---
+    def calcola_geometria(self):
+        # Celle il più grandi possibile mantenendo le proporzioni originali, centrate nel widget
+        passo_w = self.width() / COLONNE
+        passo_h = self.height() / RIGHE
+        passo = min(passo_w, passo_h / RAPPORTO_CELLA)
+        lato = passo * (1 - SPAZIATURA)
+        ox = (self.width() - passo * COLONNE) / 2; oy = (self.height() - passo * RAPPORTO_CELLA * RIGHE) / 2
+        self.geometria = (ox, oy, passo, int(lato), int(lato * RAPPORTO_CELLA))
+        self.cache_tessere = {}
+
+    def rettangolo_cella(self, r, c):
+        if self.geometria is None: self.calcola_geometria()
+        ox, oy, passo, w, h = self.geometria
+        return QRect(int(ox + c * passo), int(oy + r * passo * RAPPORTO_CELLA), w, h)
+
+    def tessera(self, valore):
+        pix = self.cache_tessere.get(valore)
+        if pix is not None: return pix
+        _, _, _, w, h = self.geometria
+        pix = QPixmap(w, h); pix.fill(Qt.transparent)
+        p = QPainter(pix); p.setRenderHint(QPainter.Antialiasing)
+        bordo = max(1, round(w / 27))
+        if valore == VUOTA:
+            p.setPen(Qt.NoPen); p.setBrush(QColor("#003366"))
+        else:
+            p.setPen(QPen(QColor("#444"), bordo)); p.setBrush(QColor("white"))
+        p.drawRoundedRect(QRectF(bordo / 2, bordo / 2, w - bordo, h - bordo), w / 11, w / 11)
+        if valore not in (VUOTA, COPERTA):
+            font = QFont("Arial"); font.setBold(True); font.setPixelSize(int(h * 0.47))
+            p.setFont(font); p.setPen(QColor("black"))
+            p.drawText(QRect(0, 0, w, h), Qt.AlignCenter, valore)
+        p.end()
+        self.cache_tessere[valore] = pix
+        return pix
+
+    # --- EVENTI ---
+    def resizeEvent(self, event):
+        self.calcola_geometria()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if self.geometria is None: self.calcola_geometria()
+        if self.geometria[3] <= 0 or self.geometria[4] <= 0: return
+        painter = QPainter(self)
+        area = event.region()
+        for r in range(RIGHE):
+            for c in range(COLONNE):
+                rect = self.rettangolo_cella(r, c)
+                if area.intersects(rect): painter.drawPixmap(rect.topLeft(), self.tessera(self.stato[r][c]))
+        painter.end()
+        if self.inizio_misura is not None:
+            ms = (time.perf_counter() - self.inizio_misura) * 1000; self.inizio_misura = None
+            self.latenze.append(ms); logger.info("tasto -> tabellone: %.1f ms", ms)
@@ -0,0 +1,108 @@
+import functools
+import json
+import statistics
+import time
+from collections import deque
+from PyQt5.QtCore import Qt, QEvent, QTimer
+from PyQt5.QtWidgets import QApplication, QLabel
+from avvio import TIMELINE, logger
+
+# --- TRACCIA DELLE PRESTAZIONI ---
+# Opzionale (ruota_fortuna.py --overlay e/o --traccia[=file.json]). Ogni evento Qt passa da notify():
+# si misura quanto impiega il suo gestore (disegno, timer, tasti, mouse). I gestori del gioco elencati
+# in GESTORI vengono avvolti a livello di classe, così compaiono con il loro nome. La traccia si salva
+# nel formato "Trace Event" di Chrome (chrome://tracing, ui.perfetto.dev) con un riepilogo per nome;
+# l'overlay mostra sopra il gioco fps, tempi di frame e gestori più lenti dell'ultimo secondo.
+
+GESTORI = ["nuovo_round", "agg_tabellone", "agg_giocatori", "flash", "inserisci_lettera", "conferma_soluzione",
+           "aggiorna_timer", "aggiorna_animazione_coriandoli", "paintEvent", "mossa_cpu"]
+NOMI_EVENTI = {QEvent.Paint: "paint", QEvent.UpdateRequest: "frame", QEvent.Timer: "timer", QEvent.KeyPress: "tasto",
+               QEvent.MouseButtonPress: "click", QEvent.MouseButtonRelease: "rilascio", QEvent.Resize: "resize",
+               QEvent.MetaCall: "slot"}
+SOGLIA_TRACCIA_MS = 0.05   # eventi più brevi restano nelle statistiche ma non nel file di traccia
+EVENTI_MAX = 200_000
+DURATE_PER_NOME = 5_000
+
+def statistiche(ms):
+    # Stesso riepilogo per la traccia in gioco e per benchmark/suite_prestazioni.py
+    v = sorted(ms)
+    return {"n": len(v), "mediana_ms": round(statistics.median(v), 3),
+            "p95_ms": round(v[min(int(len(v) * 0.95), len(v) - 1)], 3), "max_ms": round(v[-1], 3)}
+
+class Traccia:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.eventi = deque(maxlen=EVENTI_MAX)     # (nome, inizio, fine) per il file di traccia
+        self.durate = {}                           # nome -> deque di ms, per il riepilogo
+        self.recenti = deque(maxlen=2_000)         # (fine, nome, ms) per l'overlay
+        self.frame = deque(maxlen=600)             # (fine, ms) dei frame completi delle finestre
+
+    def registra(self, nome, inizio, fine):
+        ms = (fine - inizio) * 1000
+        d = self.durate.get(nome)
+        if d is None: d = self.durate[nome] = deque(maxlen=DURATE_PER_NOME)
+        d.append(ms); self.recenti.append((fine, nome, ms))
+        if ms >= SOGLIA_TRACCIA_MS: self.eventi.append((nome, inizio, fine))
+
+    def avvolgi(self, classe, nomi=GESTORI):
+        # Prima di creare le istanze: le connessioni a segnali e i metodi virtuali di Qt vedono il metodo avvolto
+        for n in nomi:
+            originale = getattr(classe, n, None)
+            if originale is None or hasattr(originale, "__wrapped__"): continue
+            setattr(classe, n, self._cronometro(f"{classe.__name__}.{n}", originale))
+
+    def _cronometro(self, nome, f):
+        @functools.wraps(f)
+        def avvolto(*args, **kwargs):
+            t = time.perf_counter()
+            try: return f(*args, **kwargs)
+            finally: self.registra(nome, t, time.perf_counter())
+        return avvolto
+
+    def riepilogo(self):
+        return {nome: statistiche(d) for nome, d in sorted(self.durate.items())}
+
+    def salva(self, path):
+        eventi = [{"name": n, "ph": "X", "pid": 1, "tid": 1, "ts": round((i - self.t0) * 1e6, 1), "dur": round((f - i) * 1e6, 1)}
+                  for n, i, f in self.eventi]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": eventi, "riepilogo": self.riepilogo(), "avvio": TIMELINE.come_dict()}, f)
+        logger.info("traccia: %d eventi salvati in %s", len(eventi), path)
+
+class ApplicazioneTracciata(QApplication):
+    # Costa qualche microsecondo per evento: si usa solo quando la traccia o l'overlay sono richiesti
+    def __init__(self, argv, percorso=None):
+        super().__init__(argv)
+        self.traccia = Traccia()
+        if percorso: self.aboutToQuit.connect(lambda: self.traccia.salva(percorso))
+
+    def notify(self, ricevente, evento):
+        tipo = evento.type(); t = time.perf_counter()   # l'evento può non esistere più dopo la consegna
+        risultato = super().notify(ricevente, evento)
+        nome = NOMI_EVENTI.get(tipo)
+        if nome:
+            fine = time.perf_counter(); self.traccia.registra(f"{nome}:{type(ricevente).__name__}", t, fine)
+            if tipo == QEvent.UpdateRequest and ricevente.isWidgetType() and ricevente.isWindow(): self.traccia.frame.append((fine, (fine - t) * 1000))
+        return risultato
+
+class OverlayPrestazioni(QLabel):
+    def __init__(self, traccia, finestra):
+        super().__init__(finestra)
+        self.traccia = traccia; self.finestra = finestra
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet("color: #0F0; background: rgba(0,0,0,170); font-family: monospace; font-size: 12px; padding: 4px;")
+        self.timer = QTimer(self); self.timer.timeout.connect(self.aggiorna); self.timer.start(500)
+        self.aggiorna(); self.show()
+
+    def aggiorna(self):
+        ora = time.perf_counter()
+        frame = sorted(ms for t, ms in self.traccia.frame if ora - t < 1)
+        righe = [f"{len(frame)} frame/s" + (f"  frame mediana {statistics.median(frame):.1f} ms  max {frame[-1]:.1f} ms" if frame else "")]
+        lenti = {}
+        for t, nome, ms in self.traccia.recenti:
+            if ora - t < 1 and ms > lenti.get(nome, 0): lenti[nome] = ms
+        for nome, ms in sorted(lenti.items(), key=lambda x: -x[1])[:3]: righe.append(f"{ms:6.1f} ms  {nome}")
+        latenze = getattr(getattr(self.finestra, "tabellone", None), "latenze", None)
+        if latenze: righe.append(f"tasto -> tabellone {latenze[-1]:.1f} ms")
+        self.setText("\n".join(righe)); self.adjustSize()
+        self.move(8, self.finestra.height() - self.height() - 8); self.raise_()